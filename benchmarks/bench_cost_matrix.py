@@ -0,0 +1,112 @@
+"""Cost-matrix build times: vectorized haversine, road-graph distances, disk cache.
+
+For each origins x destinations size, times the vectorized great-circle
+matrix against a pure-Python loop (timed on a sample of rows and scaled
+up), the shortest-path matrix over a synthetic grid road network, and a
+second build served from the disk cache.
+
+    python benchmarks/bench_cost_matrix.py
+    python benchmarks/bench_cost_matrix.py --sizes 5000x2000 --grid 300 --no-road
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy.sparse.csgraph  # noqa: F401  loaded lazily by RoadGraph; keep it out of the timings
+import scipy.spatial  # noqa: F401
+
+from cara_logistics.distances import EARTH_RADIUS_MILES, CostMatrixBuilder, RateModel, haversine_miles, pair_haversine_miles
+from cara_logistics.roads import RoadGraph
+
+US = ((25.0, 49.0), (-124.0, -67.0))  # lat, lon ranges of the lower 48
+
+
+def points(n, rng):
+    (lat0, lat1), (lon0, lon1) = US
+    return np.column_stack([rng.uniform(lat0, lat1, n), rng.uniform(lon0, lon1, n)])
+
+
+def grid_graph(side, rng):
+    """side x side jittered lattice over the US with 4-neighbour roads ~1.1-1.4x straight-line."""
+    (lat0, lat1), (lon0, lon1) = US
+    lat, lon = np.meshgrid(np.linspace(lat0, lat1, side), np.linspace(lon0, lon1, side), indexing="ij")
+    coords = np.column_stack([lat.ravel(), lon.ravel()]) + rng.normal(0, 0.02, (side * side, 2))
+    ids = np.arange(side * side).reshape(side, side)
+    tail = np.r_[ids[:, :-1].ravel(), ids[:-1, :].ravel()]
+    head = np.r_[ids[:, 1:].ravel(), ids[1:, :].ravel()]
+    miles = pair_haversine_miles(coords[tail], coords[head]) * rng.uniform(1.1, 1.4, len(tail))
+    return RoadGraph(np.arange(side * side), coords, tail, head, miles)
+
+
+def python_haversine(origins, destinations):
+    out = []
+    for lat1, lon1 in origins:
+        row = []
+        for lat2, lon2 in destinations:
+            p1, p2 = math.radians(lat1), math.radians(lat2)
+            a = (math.sin((p2 - p1) / 2) ** 2
+                 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+            row.append(2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a)))
+        out.append(row)
+    return out
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["50x20", "500x200", "5000x2000"],
+                        help="origins x destinations")
+    parser.add_argument("--grid", type=int, default=150, help="road lattice side (nodes = side^2)")
+    parser.add_argument("--loop-rows", type=int, default=100, help="rows timed for the Python loop")
+    parser.add_argument("--no-road", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    rates = RateModel(0.37, fixed_per_ton=250.0)
+    graph = None
+    if not args.no_road:
+        graph, build_s = timed(grid_graph, args.grid, rng)
+        print(f"road graph: {graph.n_nodes:,} nodes, {len(graph.tail):,} edges ({build_s:.2f} s to generate)\n")
+
+    print(f"{'size':>10} {'pairs':>11} {'python s':>9} {'numpy s':>8} {'speedup':>8} "
+          f"{'road s':>7} {'road/gc':>8} {'cached s':>9}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for size in args.sizes:
+            n, m = map(int, size.lower().split("x"))
+            origins, destinations = points(n, rng), points(m, rng)
+
+            rows = min(n, args.loop_rows)
+            _, loop_s = timed(python_haversine, origins[:rows], destinations)
+            loop_s *= n / rows
+            great_circle, numpy_s = timed(haversine_miles, origins, destinations)
+
+            road_s = ratio = cached_s = float("nan")
+            if graph is not None:
+                builder = CostMatrixBuilder(rates, graph, cache_dir=cache_dir)
+                _, road_s = timed(builder.cost, origins, destinations)
+                road = builder.miles(origins, destinations)
+                ratio = float(np.median(road / great_circle))
+            else:
+                builder = CostMatrixBuilder(rates, cache_dir=cache_dir)
+                builder.cost(origins, destinations)
+            # a fresh builder has nothing in memory, so this times the disk cache
+            _, cached_s = timed(CostMatrixBuilder(rates, graph, cache_dir=cache_dir).cost, origins, destinations)
+
+            print(f"{size:>10} {n * m:>11,} {loop_s:>9.2f} {numpy_s:>8.3f} {loop_s / numpy_s:>7.0f}x "
+                  f"{road_s:>7.2f} {ratio:>8.2f} {cached_s:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Decomposition engine against monolithic solves on large networks.
+
+For each size it solves the full model with CBC (and optionally the
+native network simplex), then with the decomposition engine in-process
+and with a pool of pricing workers, and reports rounds, the final
+master size, the bound gap and the largest dual difference to CBC.
+
+    python benchmarks/bench_decomposition.py
+    python benchmarks/bench_decomposition.py --sizes 1000x1000 2000x1000 --workers 8 --costs distance
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from cara_logistics import build_transport_model, random_instance, solve
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["300x300", "1000x500"], help="regions x RDCs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--costs", default="distance", choices=["uniform", "lognormal", "distance"])
+    parser.add_argument("--native", action="store_true", help="also solve the full model with network simplex")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>11} {'lanes':>9} {'engine':>22} {'seconds':>8} {'status':>8} {'objective':>14} "
+          f"{'rounds':>6} {'master':>8} {'gap':>9} {'max dual diff':>13}")
+    for size in args.sizes:
+        n_supply, n_demand = map(int, size.lower().split("x"))
+        model = build_transport_model(*random_instance(n_supply, n_demand, seed=args.seed, costs=args.costs))
+        runs = [("cbc", "cbc", {})]
+        if args.native:
+            runs.append(("network_simplex", "network_simplex", {}))
+        runs += [
+            ("decomposition x1", "decomposition", {"workers": 1}),
+            (f"decomposition x{args.workers}", "decomposition", {"workers": args.workers}),
+        ]
+        reference = None
+        for label, solver, options in runs:
+            start = time.perf_counter()
+            solution = solve(model, solver, **options)
+            elapsed = time.perf_counter() - start
+            reference = solution if reference is None else reference
+            stats = solution.stats
+            gap = "-" if stats.get("gap") is None else f"{stats['gap']:.1e}"
+            print(f"{size:>11} {model.n_lanes:>9,} {label:>22} {elapsed:>8.2f} {solution.status:>8} "
+                  f"{solution.objective:>14,.0f} {stats.get('iterations') or '-':>6} "
+                  f"{stats.get('master_lanes', '-'):>8} {gap:>9} "
+                  f"{np.abs(solution.duals - reference.duals).max():>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Facility-location solve times across candidate-site counts.
+
+Each size draws regions, candidate RDC sites and markets across the US,
+prices inbound lanes and outbound deliveries by distance, and solves the
+open/close MIP with the strong and the weak (aggregated capacity only)
+formulation under a time limit. Reports the root LP gap (how far the LP
+relaxation is below the best plan), the final MIP gap and the solve time,
+so planners can see how large a study stays interactive.
+
+    python benchmarks/bench_facility.py
+    python benchmarks/bench_facility.py --sites 10 50 100 --markets-per-site 4 --time-limit 120 --no-weak
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pulp  # noqa: F401  loaded lazily by the model; keep it out of the build times
+import scipy.sparse  # noqa: F401
+
+from cara_logistics import TransportModel
+from cara_logistics.distances import RateModel, haversine_miles
+from cara_logistics.facility import FacilityModel, solve_facility
+from cara_logistics.synthetic import LAT_RANGE, LON_RANGE
+
+
+def instance(n_regions, n_sites, n_markets, seed, reach_miles):
+    rng = np.random.default_rng(seed)
+
+    def locate(n):
+        return np.column_stack([rng.uniform(*LAT_RANGE, n), rng.uniform(*LON_RANGE, n)])
+
+    regions, sites, markets = locate(n_regions), locate(n_sites), locate(n_markets)
+    demand = rng.uniform(20, 120, n_markets)
+    supply = rng.uniform(0.5, 1.5, n_regions)
+    supply *= 1.2 * demand.sum() / supply.sum()
+
+    inbound_cost = RateModel(0.12, fixed_per_ton=40.0).cost(haversine_miles(regions, sites))
+    inbound = TransportModel(
+        [f"Region {i}" for i in range(n_regions)], [f"Site {s}" for s in range(n_sites)], supply, np.zeros(n_sites),
+        np.repeat(np.arange(n_regions), n_sites), np.tile(np.arange(n_sites), n_regions), inbound_cost.ravel(),
+    )
+    miles = haversine_miles(sites, markets)
+    outbound = RateModel(0.45, fixed_per_ton=10.0).cost(miles)
+    # sites only deliver within reach, but every market keeps its three nearest
+    nearest = np.argsort(miles, axis=0)[:3]
+    allowed = miles <= reach_miles
+    allowed[nearest, np.arange(n_markets)] = True
+    outbound[~allowed] = np.inf
+    capacity = rng.uniform(2.0, 6.0, n_sites) * demand.sum() / n_sites
+    fixed = rng.uniform(0.5, 1.5, n_sites) * 2.0 * demand.sum() * 45.0 / np.sqrt(n_sites)
+    return FacilityModel(inbound, [f"Market {m}" for m in range(n_markets)], demand, outbound, fixed, capacity)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sites", type=int, nargs="+", default=[10, 25, 50, 100])
+    parser.add_argument("--markets-per-site", type=int, default=3)
+    parser.add_argument("--regions", type=int, default=20)
+    parser.add_argument("--reach", type=float, default=800.0, help="longest delivery, miles")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="seconds per solve")
+    parser.add_argument("--no-weak", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    forms = [True] if args.no_weak else [True, False]
+    print(f"{'sites':>6} {'markets':>8} {'vars':>7} {'form':>6} {'rows':>7} {'build s':>8} {'solve s':>8} "
+          f"{'status':>9} {'root gap':>9} {'MIP gap':>8} {'open':>5} {'objective':>14}")
+    for n_sites in args.sites:
+        model = instance(args.regions, n_sites, n_sites * args.markets_per_site, args.seed, args.reach)
+        for strong in forms:
+            solution = solve_facility(model, strong=strong, time_limit=args.time_limit)
+            stats = solution.stats
+            root_gap = mip_gap = float("nan")
+            if solution.objective is not None:
+                if stats["root_bound"] is not None:
+                    root_gap = (solution.objective - stats["root_bound"]) / solution.objective
+                if stats["gap"] is not None:
+                    mip_gap = stats["gap"]
+            objective = float("nan") if solution.objective is None else solution.objective
+            print(f"{n_sites:>6} {model.n_markets:>8} {model.n_variables:>7} {'strong' if strong else 'weak':>6} "
+                  f"{stats['constraints']:>7} {stats['build_seconds']:>8.2f} {stats['solver_seconds']:>8.2f} "
+                  f"{solution.status:>9} {root_gap:>9.2%} {mip_gap:>8.2%} {int(solution.open.sum()):>5} "
+                  f"{objective:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cost of lane capacities and minimum loads compared with the open model.
+
+Variants per size:
+  open           no lane limits (plain transportation LP)
+  cap_bounds     capacities as variable bounds (what to_pulp does)
+  cap_rows       the same capacities as one extra row per lane, for contrast
+  min_load       capacities plus minimum loads on a share of lanes (MIP)
+
+    python benchmarks/bench_lane_bounds.py
+    python benchmarks/bench_lane_bounds.py --sizes 50 200 --min-load-share 0.1 --time-limit 60
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy.sparse  # noqa: F401  loaded lazily by the model; keep it out of the first build time
+from pulp import LpAffineExpression, LpConstraint, LpConstraintLE
+
+from cara_logistics import build_transport_model, random_instance, to_pulp
+from cara_logistics.solvers import pulp_solution, solve_network_simplex
+
+
+def lane_limits(model, seed, min_load_share):
+    """Capacities of 20-60% of the destination's demand; minimum loads at half capacity."""
+    rng = np.random.default_rng([seed, 2])
+    capacity = np.ceil(model.demand[model.lane_demand] * rng.uniform(0.2, 0.6, model.n_lanes))
+    min_load = np.where(rng.random(model.n_lanes) < min_load_share, np.floor(capacity / 2), 0.0)
+    return capacity, min_load
+
+
+def capacity_rows(model, capacity):
+    problem, x = to_pulp(model)
+    for k, cap in enumerate(capacity.tolist()):
+        problem.addConstraint(LpConstraint(LpAffineExpression([(x[k], 1)]), LpConstraintLE, f"Cap_{k}", cap))
+    return problem, x
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--min-load-share", type=float, default=0.3, help="share of lanes with a minimum load")
+    parser.add_argument("--time-limit", type=float, default=120, help="CBC time limit per MIP, seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>9} {'variant':>11} {'solver':>16} {'rows':>7} {'cols':>7} {'build s':>8} "
+          f"{'solve s':>8} {'nodes':>6} {'status':>10} {'objective':>14}")
+    for n in args.sizes:
+        base = build_transport_model(*random_instance(n, n, seed=args.seed, slack=1.2))
+        capacity, min_load = lane_limits(base, args.seed, args.min_load_share)
+        capped = base.with_values(capacity=capacity)
+        variants = [
+            ("open", base, lambda m: to_pulp(m)),
+            ("cap_bounds", capped, lambda m: to_pulp(m)),
+            ("cap_rows", base, lambda m: capacity_rows(m, capacity)),
+            ("min_load", base.with_values(capacity=capacity, min_load=min_load), lambda m: to_pulp(m)),
+        ]
+        for variant, model, build in variants:
+            start = time.perf_counter()
+            problem, x = build(model)
+            built = time.perf_counter() - start
+            start = time.perf_counter()
+            options = {"timeLimit": args.time_limit} if model.has_min_loads else {}
+            solution = pulp_solution(model, problem, x, **options)
+            solved = time.perf_counter() - start
+            nodes = "-" if solution.stats.get("nodes") is None else solution.stats["nodes"]
+            print(f"{n:>4}x{n:<4} {variant:>11} {'cbc':>16} {len(problem.constraints):>7} {problem.numVariables():>7} "
+                  f"{built:>8.3f} {solved:>8.3f} {nodes:>6} {solution.status:>10} {solution.objective:>14,.0f}")
+
+            if variant in ("open", "cap_bounds"):
+                start = time.perf_counter()
+                solution = solve_network_simplex(model)
+                solved = time.perf_counter() - start
+                print(f"{n:>4}x{n:<4} {variant:>11} {'network_simplex':>16} {'':>7} {'':>7} {'':>8} "
+                      f"{solved:>8.3f} {'-':>6} {solution.status:>10} {solution.objective:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
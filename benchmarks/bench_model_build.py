@@ -0,0 +1,55 @@
+"""Time LP construction: the original per-route loop vs. the array model builder.
+
+    python benchmarks/bench_model_build.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulp import LpProblem, LpMinimize, LpVariable, lpSum
+
+from cara_logistics import build_transport_model, to_pulp, random_instance
+
+SIZES = [(10, 10), (100, 50), (500, 100), (2000, 300)]
+LEGACY_MAX_LANES = 50_000
+
+
+def legacy_build(supply, demand, costs):
+    model = LpProblem("Minimize Transportation Cost", LpMinimize)
+    routes = [(s, d) for s in supply for d in demand]
+    x = LpVariable.dicts("route", routes, lowBound=0, cat='Continuous')
+    model += lpSum([x[(s, d)] * costs.loc[s, d] for (s, d) in routes])
+    for s in supply:
+        model += lpSum([x[(s, d)] for d in demand]) <= supply[s], f"Supply_{s}"
+    for d in demand:
+        model += lpSum([x[(s, d)] for s in supply]) >= demand[d], f"Demand_{d}"
+    return model
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'size':>12} {'lanes':>9} {'legacy (s)':>11} {'arrays (s)':>11} {'to_pulp (s)':>12}")
+    for n_supply, n_demand in SIZES:
+        supply, demand, costs = random_instance(n_supply, n_demand)
+        lanes = n_supply * n_demand
+        legacy = "skipped"
+        if lanes <= LEGACY_MAX_LANES:
+            legacy = f"{timed(legacy_build, supply.to_dict(), demand.to_dict(), costs):.3f}"
+
+        start = time.perf_counter()
+        model = build_transport_model(supply, demand, costs)
+        model.matrix
+        arrays = time.perf_counter() - start
+        pulp_time = timed(to_pulp, model)
+        print(f"{n_supply:>5}x{n_demand:<6} {lanes:>9} {legacy:>11} {arrays:>11.3f} {pulp_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Build and solve times of the 52-week plan with RDC inventory.
+
+Reports, per size, how long the vectorized builders take (time-expanded
+network arrays, LP matrix, PuLP problem) and the solve time of the full
+horizon with each engine, plus a rolling-horizon run.
+
+    python benchmarks/bench_multiperiod.py
+    python benchmarks/bench_multiperiod.py --weeks 52 --sizes 40x25 --window 8 --step 4 --no-cbc
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pulp  # noqa: F401  loaded lazily by the model; keep it out of the build times
+import scipy.sparse  # noqa: F401
+
+from cara_logistics import build_transport_model, random_instance
+from cara_logistics.multiperiod import MultiPeriodModel, seasonal_profile, solve_multiperiod, solve_rolling
+
+
+def season(base, weeks, seed):
+    rng = np.random.default_rng([seed, 3])
+    supply = seasonal_profile(base.supply, weeks, amplitude=0.3, peak_week=weeks // 3)
+    demand = base.demand * rng.uniform(0.8, 1.0, (weeks, base.n_demand))
+    cost = base.cost * rng.uniform(0.9, 1.1, (weeks, base.n_lanes))
+    return MultiPeriodModel(base, supply, demand, cost, holding_cost=2.0, storage=base.demand)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--sizes", nargs="+", default=["10x10", "40x25"], help="regions x RDCs (lanes = product)")
+    parser.add_argument("--window", type=int, default=8, help="rolling-horizon window, weeks")
+    parser.add_argument("--step", type=int, default=4, help="weeks committed per rolling solve")
+    parser.add_argument("--no-cbc", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>7} {'lanes':>6} {'vars':>8} {'network s':>10} {'matrix s':>9} {'pulp s':>7}  "
+          f"{'solver':>24} {'solve s':>8} {'status':>8} {'objective':>14}")
+    for size in args.sizes:
+        n_supply, n_demand = map(int, size.lower().split("x"))
+        base = build_transport_model(*random_instance(n_supply, n_demand, seed=args.seed, slack=1.3))
+        model = season(base, args.weeks, args.seed)
+        _, network_s = timed(model.network)
+        _, matrix_s = timed(lambda: model.matrix)
+        _, pulp_s = timed(model.to_pulp)
+        head = (f"{size:>7} {base.n_lanes:>6} {model.n_variables:>8} {network_s:>10.3f} {matrix_s:>9.3f} "
+                f"{pulp_s:>7.3f}  ")
+
+        runs = [("network_simplex", lambda: solve_multiperiod(model, "network_simplex"))]
+        if not args.no_cbc:
+            runs.append(("cbc", lambda: solve_multiperiod(model, "cbc")))
+        runs.append((f"rolling {args.window}/{args.step} native",
+                     lambda: solve_rolling(model, args.window, args.step, "network_simplex")))
+        for label, run in runs:
+            solution, solve_s = timed(run)
+            print(f"{head}{label:>24} {solve_s:>8.2f} {solution.status:>8} {solution.objective:>14,.0f}")
+            head = " " * len(head)
+
+
+if __name__ == "__main__":
+    main()
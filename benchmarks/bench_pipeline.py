@@ -0,0 +1,171 @@
+"""Time every stage behind "Run Optimization" on synthetic networks.
+
+Stages: model_build (arrays), lp_build (PuLP problem / network simplex
+setup), solve, extract (flows, shipment matrix, flow table),
+shadow_prices, and the sankey / altair / pydeck chart builders including
+their JSON serialisation. Each stage's median over --repeat runs is
+written to a JSON report so results can be compared across versions.
+
+    python benchmarks/bench_pipeline.py --output report.json
+    python benchmarks/bench_pipeline.py --sizes 10x10 500x100 --costs distance --solvers network_simplex
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# the package imports these on first use; load them up front so import time
+# stays out of the stage timings (bench_startup.py measures it instead)
+import altair  # noqa: F401
+import plotly.graph_objects as go
+import pydeck  # noqa: F401
+import scipy.sparse  # noqa: F401
+from pulp import PULP_CBC_CMD
+
+from cara_logistics import NetworkSimplex, build_transport_model, random_network, to_pulp
+from cara_logistics.charts import bundle_routes, flow_bar_chart, route_deck, route_frame, sankey_data
+from cara_logistics.solvers import extract_pulp_solution, network_solution, transport_network
+from cara_logistics.synthetic import COST_DISTRIBUTIONS
+
+PACKAGES = ["numpy", "pandas", "scipy", "pulp", "plotly", "altair", "pydeck", "streamlit"]
+MAP_AGGREGATE_ABOVE = 500
+SANKEY_LINKS = 100
+
+
+class Timer:
+    def __init__(self):
+        self.timings = {}
+
+    def __call__(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.timings[stage] = time.perf_counter() - start
+        return result
+
+
+def run_once(network, solver):
+    timer = Timer()
+    model = timer("model_build", build_transport_model, network.supply, network.demand, network.costs)
+
+    if solver == "cbc":
+        problem, x = timer("lp_build", to_pulp, model)
+        timer("solve", problem.solve, PULP_CBC_CMD(msg=False))
+    else:
+        engine = timer("lp_build", NetworkSimplex, *transport_network(model))
+        timer("solve", engine.solve)
+
+    def extract_views():
+        if solver == "cbc":
+            solution = extract_pulp_solution(model, problem, x)
+        else:
+            solution = network_solution(model, engine)
+        solution.shipments
+        solution.flow_table
+        return solution
+
+    solution = timer("extract", extract_views)
+    timer("shadow_prices", solution.shadow_prices)
+
+    flows = solution.flow_table
+    timer("sankey", lambda: go.Figure(data=[sankey_data(flows, top_n=SANKEY_LINKS)]).to_json())
+    timer("altair", lambda: flow_bar_chart(flows).to_json())
+
+    def pydeck_json():
+        routes = route_frame(flows, network.supply_coords, network.demand_coords)
+        aggregate = len(routes) > MAP_AGGREGATE_ABOVE
+        if aggregate:
+            routes = bundle_routes(routes)
+        return route_deck(routes, arcs=aggregate).to_json()
+
+    timer("pydeck", pydeck_json)
+    return solution, timer.timings
+
+
+def environment():
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = version(name)
+        except PackageNotFoundError:
+            versions[name] = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def parse_size(text):
+    n_supply, _, n_demand = text.lower().partition("x")
+    return int(n_supply), int(n_demand)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=[(10, 10), (100, 50), (300, 100)],
+                        help="SUPPLYxDEMAND node counts, e.g. 300x100")
+    parser.add_argument("--costs", nargs="+", choices=COST_DISTRIBUTIONS, default=["uniform", "distance"])
+    parser.add_argument("--slack", type=float, nargs="+", default=[1.0, 1.2],
+                        help="total supply / total demand; 1.0 is balanced")
+    parser.add_argument("--solvers", nargs="+", choices=["cbc", "network_simplex"], default=["cbc", "network_simplex"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for n_supply, n_demand in args.sizes:
+        for costs in args.costs:
+            for slack in args.slack:
+                network = random_network(n_supply, n_demand, seed=args.seed, slack=slack, costs=costs)
+                for solver in args.solvers:
+                    runs = [run_once(network, solver) for _ in range(args.repeat)]
+                    solution = runs[-1][0]
+                    timings = {
+                        stage: statistics.median(t[stage] for _, t in runs) for stage in runs[0][1]
+                    }
+                    results.append({
+                        "n_supply": n_supply,
+                        "n_demand": n_demand,
+                        "costs": costs,
+                        "slack": slack,
+                        "balanced": slack == 1.0,
+                        "seed": args.seed,
+                        "solver": solver,
+                        "lanes": solution.model.n_lanes,
+                        "nonzero_lanes": len(solution.nonzero),
+                        "status": solution.status,
+                        "objective": solution.objective,
+                        "seconds": timings,
+                    })
+                    stages = " ".join(f"{k}={v * 1000:.1f}ms" for k, v in timings.items())
+                    print(f"{n_supply}x{n_demand} {costs} slack={slack} {solver}: {stages}", file=sys.stderr)
+
+    report = json.dumps({"environment": environment(), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Offline road-network engine: GraphML load, parallel Dijkstra tables, memory-mapped reuse.
+
+Builds a jittered lattice road network over the US, saves it as
+OSMnx-style GraphML and reloads it, then for each origins x destinations
+size times the node-to-node shortest-path table with one process and
+with --workers processes, and reopening the stored table for a second
+cost build.
+
+    python benchmarks/bench_road_network.py
+    python benchmarks/bench_road_network.py --grid 400 --sizes 2000x500 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy.sparse.csgraph  # noqa: F401  loaded lazily by RoadGraph; keep it out of the timings
+import scipy.spatial  # noqa: F401
+
+from cara_logistics.distances import CostMatrixBuilder, RateModel
+from cara_logistics.roads import METERS_PER_MILE, DistanceTables, RoadGraph
+
+from bench_cost_matrix import grid_graph, points
+
+
+def write_graphml(graph, path):
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                '<key id="d0" for="node" attr.name="y"/><key id="d1" for="node" attr.name="x"/>\n'
+                '<key id="d2" for="edge" attr.name="length"/><key id="d3" for="edge" attr.name="speed_kph"/>\n'
+                '<graph edgedefault="directed">\n')
+        for i, (lat, lon) in enumerate(graph.coords.tolist()):
+            f.write(f'<node id="{i}"><data key="d0">{lat}</data><data key="d1">{lon}</data></node>\n')
+        speeds = np.random.default_rng(1).choice([50, 80, 110], len(graph.tail))
+        for tail, head, miles, kph in zip(graph.tail.tolist(), graph.head.tolist(), graph.miles.tolist(), speeds.tolist()):
+            meters = miles * METERS_PER_MILE
+            for a, b in ((tail, head), (head, tail)):
+                f.write(f'<edge source="{a}" target="{b}"><data key="d2">{meters}</data><data key="d3">{kph}</data></edge>\n')
+        f.write("</graph>\n</graphml>\n")
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid", type=int, default=200, help="road lattice side (nodes = side^2)")
+    parser.add_argument("--sizes", nargs="+", default=["100x50", "1000x200"], help="origins x destinations")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roads.graphml")
+        write_graphml(grid_graph(args.grid, rng), path)
+        graph, load_s = timed(RoadGraph.from_graphml, path)
+        print(f"graphml: {graph.n_nodes:,} nodes, {len(graph.tail):,} directed edges, "
+              f"{os.path.getsize(path) / 1e6:.0f} MB, loaded in {load_s:.2f} s\n")
+
+        print(f"{'size':>10} {'sources':>8} {'1 proc s':>9} {f'{args.workers} proc s':>9} {'speedup':>8} "
+              f"{'mmap MB':>8} {'reuse s':>8} {'minutes s':>10}")
+        rates = RateModel(0.37, fixed_per_ton=250.0)
+        for size in args.sizes:
+            n, m = map(int, size.lower().split("x"))
+            origins, destinations = points(n, rng), points(m, rng)
+            sources = np.unique(graph.snap(origins)[0])
+            targets = np.unique(graph.snap(destinations)[0])
+            _, serial_s = timed(graph.shortest_paths, sources, targets, workers=1)
+            _, parallel_s = timed(graph.shortest_paths, sources, targets, workers=args.workers)
+
+            cache_dir = os.path.join(tmp, f"cache-{size}")
+            CostMatrixBuilder(rates, graph, cache_dir=cache_dir).cost(origins, destinations)
+            # nudged points miss the coordinate cache but snap to the stored table's nodes
+            builder = CostMatrixBuilder(rates, graph, cache_dir=cache_dir)
+            _, reuse_s = timed(builder.cost, origins + 1e-6, destinations)
+            _, minutes_s = timed(builder.minutes, origins, destinations)
+            tables = DistanceTables(os.path.join(cache_dir, "roads")).stats()
+            print(f"{size:>10} {len(sources):>8} {serial_s:>9.2f} {parallel_s:>9.2f} {serial_s / parallel_s:>7.1f}x "
+                  f"{tables['bytes'] / 1e6:>8.1f} {reuse_s:>8.3f} {minutes_s:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
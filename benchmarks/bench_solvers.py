@@ -0,0 +1,34 @@
+"""Compare the CBC (PuLP) backend with the native network simplex.
+
+    python benchmarks/bench_solvers.py
+    python benchmarks/bench_solvers.py --sizes 10 100
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cara_logistics import SOLVERS, build_transport_model, random_instance, solve
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--solvers", nargs="+", default=list(SOLVERS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>11} {'solver':>16} {'status':>10} {'objective':>14} {'seconds':>9}")
+    for n in args.sizes:
+        model = build_transport_model(*random_instance(n, n, seed=args.seed))
+        for name in args.solvers:
+            start = time.perf_counter()
+            solution = solve(model, name)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>5}x{n:<5} {name:>16} {solution.status:>10} {solution.objective:>14,.0f} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
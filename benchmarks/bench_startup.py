@@ -0,0 +1,110 @@
+"""Cold-start time of the Streamlit app, measured in fresh interpreters.
+
+Each sample starts a new Python process (like a freshly scaled-up worker
+whose server has already imported streamlit), runs the app script once
+through streamlit's AppTest and records the time until the editors are
+rendered ("first paint"), then clicks Run Optimization and records the
+time until the first full result is shown, rerunning the script while a
+background solve job is still going. A sample whose solve ends without a
+plan (an error, a failed or cancelled job) aborts the benchmark. It also lists which heavy modules were
+loaded by first paint. --eager preloads them before the script runs, which
+approximates the old top-of-file imports for comparison.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "cara_logistics_app.py")
+HEAVY = ["plotly.graph_objects", "altair", "pydeck", "pulp", "scipy.sparse"]
+
+CHILD = """
+import importlib, json, sys, time, warnings
+warnings.filterwarnings("ignore")
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+app, eager, heavy = sys.argv[1], sys.argv[2] == "1", sys.argv[3].split(",")
+start = time.perf_counter()
+if eager:
+    for name in heavy:
+        importlib.import_module(name)
+at = AppTest.from_file(app, default_timeout=300)
+at.run()
+first_paint = time.perf_counter() - start
+loaded = [name for name in heavy if name in sys.modules]
+[button for button in at.button if button.label == "Run Optimization"][0].click()
+start = time.perf_counter()
+at.run()
+# large or MIP solves only submit a background job; rerun until its plan is shown. The app drops
+# solve_job once it has handled the finished job, so a missing plan then means the solve failed
+while ("last_plan" not in at.session_state and "solve_job" in at.session_state
+       and not at.exception and not at.error and time.perf_counter() - start < 300):
+    time.sleep(0.05)
+    at.run()
+first_solve = time.perf_counter() - start
+if "last_plan" not in at.session_state:
+    shown = [str(e.value) for e in [*at.exception, *at.error, *at.warning]]
+    if "solve_job" in at.session_state and not shown:
+        shown = ["no plan after 300 s"]
+    sys.exit("first solve showed no plan: " + ("; ".join(shown) or "the app stopped without a message"))
+print(json.dumps({"first_paint": first_paint, "first_solve": first_solve, "loaded_at_first_paint": loaded,
+                  "errors": [str(e.value) for e in at.exception]}))
+"""
+
+
+def sample(eager):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    child = subprocess.run(
+        [sys.executable, "-c", CHILD, APP, "1" if eager else "0", ",".join(HEAVY)],
+        capture_output=True, text=True, cwd=ROOT, env=env,
+    )
+    if child.returncode:
+        # a run without a plan has no first-solve time worth reporting
+        lines = child.stderr.strip().splitlines()
+        raise SystemExit(f"startup sample failed: {lines[-1] if lines else f'exit code {child.returncode}'}")
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5, help="fresh processes per mode")
+    parser.add_argument("--eager", action="store_true", help="also measure with heavy modules preloaded")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for eager in ([False, True] if args.eager else [False]):
+        runs = [sample(eager) for _ in range(args.repeat)]
+        errors = sorted({e for run in runs for e in run["errors"]})
+        result = {
+            "mode": "eager" if eager else "lazy",
+            "first_paint_ms": statistics.median(r["first_paint"] for r in runs) * 1000,
+            "first_solve_ms": statistics.median(r["first_solve"] for r in runs) * 1000,
+            "loaded_at_first_paint": runs[-1]["loaded_at_first_paint"],
+            "errors": errors,
+        }
+        results.append(result)
+        print(
+            f"{result['mode']}: first paint {result['first_paint_ms']:.0f} ms, "
+            f"first solve {result['first_solve_ms']:.0f} ms, "
+            f"loaded: {', '.join(result['loaded_at_first_paint']) or 'none'}",
+            file=sys.stderr,
+        )
+
+    report = json.dumps({"python": sys.version.split()[0], "repeat": args.repeat, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Multi-echelon (groves -> packing houses -> cross-docks -> RDCs) min-cost flow at scale.
+
+Each size draws the four echelons across the US and connects every node
+to its nearest few nodes in the next echelon (plus some packing house ->
+RDC direct arcs), priced by distance. Reports the time to build the
+split graph, the bulk incidence matrix and the PuLP model, the solve
+time of each engine, and the Sankey / map preparation.
+
+    python benchmarks/bench_transshipment.py
+    python benchmarks/bench_transshipment.py --sizes 2000,200,50,1000 --fanout 8 --no-cbc
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pulp  # noqa: F401  loaded lazily by the model; keep it out of the build times
+import scipy.sparse  # noqa: F401
+
+from cara_logistics.charts import bundle_routes, network_sankey_data, route_frame
+from cara_logistics.distances import RateModel, haversine_miles
+from cara_logistics.synthetic import LAT_RANGE, LON_RANGE
+from cara_logistics.transshipment import TransshipmentModel, solve_transshipment
+
+ECHELONS = ("grove", "packing house", "cross-dock", "rdc")
+
+
+def instance(counts, fanout, seed):
+    rng = np.random.default_rng(seed)
+    n_groves, n_packing, n_docks, n_rdcs = counts
+    coords = [np.column_stack([rng.uniform(*LAT_RANGE, n), rng.uniform(*LON_RANGE, n)]) for n in counts]
+    offsets = np.cumsum([0, *counts])
+    rates = RateModel(0.15, fixed_per_ton=5.0)
+
+    tails, heads, costs = [], [], []
+
+    def connect(a, b, k):
+        # each node's k nearest in echelon b, and every b node's nearest feeder in a
+        miles = haversine_miles(coords[a], coords[b])
+        nearest = np.argsort(miles, axis=1)[:, :k]
+        rows = np.r_[np.repeat(np.arange(len(miles)), nearest.shape[1]), miles.argmin(axis=0)]
+        cols = np.r_[nearest.ravel(), np.arange(miles.shape[1])]
+        pairs = np.unique(rows * miles.shape[1] + cols)
+        rows, cols = np.divmod(pairs, miles.shape[1])
+        tails.append(offsets[a] + rows)
+        heads.append(offsets[b] + cols)
+        costs.append(rates.cost(miles[rows, cols]))
+
+    connect(0, 1, fanout)
+    connect(1, 2, fanout)
+    connect(2, 3, max(fanout, n_rdcs // 4))
+    connect(1, 3, max(1, fanout // 2))  # some packing houses ship straight to RDCs
+
+    demand = np.zeros(offsets[-1])
+    demand[offsets[3]:] = rng.uniform(50, 200, n_rdcs)
+    supply = np.zeros(offsets[-1])
+    supply[:n_groves] = rng.uniform(0.5, 1.5, n_groves)
+    supply[:n_groves] *= 1.15 * demand.sum() / supply[:n_groves].sum()
+    throughput = np.full(offsets[-1], np.inf)
+    throughput[offsets[1]:offsets[2]] = 1.6 * demand.sum() / n_packing * rng.uniform(0.8, 1.2, n_packing)
+    handling = np.zeros(offsets[-1])
+    handling[offsets[1]:offsets[3]] = rng.uniform(5, 25, n_packing + n_docks)
+    return TransshipmentModel(
+        [f"{kind} {i}" for kind, n in zip(ECHELONS, counts) for i in range(n)],
+        supply, demand, np.concatenate(tails), np.concatenate(heads), np.concatenate(costs),
+        throughput=throughput, handling=handling,
+        kinds=[kind for kind, n in zip(ECHELONS, counts) for _ in range(n)], coords=np.concatenate(coords),
+    )
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["200,40,10,100", "1000,150,30,500", "3000,400,60,1500"],
+                        help="groves,packing houses,cross-docks,RDCs")
+    parser.add_argument("--fanout", type=int, default=6, help="arcs from each node into the next echelon")
+    parser.add_argument("--no-cbc", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>7} {'arcs':>7} {'network s':>10} {'matrix s':>9} {'pulp s':>7}  {'solver':>15} {'solve s':>8} "
+          f"{'status':>8} {'objective':>14} {'sankey s':>9} {'map s':>6}")
+    for size in args.sizes:
+        counts = [int(n) for n in size.split(",")]
+        model = instance(counts, args.fanout, args.seed)
+        _, network_s = timed(model.network)
+        _, matrix_s = timed(lambda: model.matrix)
+        _, pulp_s = timed(model.to_pulp)
+        head = f"{model.n_nodes:>7} {model.n_arcs:>7} {network_s:>10.3f} {matrix_s:>9.3f} {pulp_s:>7.2f}  "
+        for solver in ["network_simplex"] + ([] if args.no_cbc else ["cbc"]):
+            solution, solve_s = timed(solve_transshipment, model, solver)
+            flows = solution.flow_table
+            _, sankey_s = timed(network_sankey_data, flows, model.labels, model.kinds, top_n=100)
+            _, map_s = timed(lambda: bundle_routes(route_frame(flows, model.coords, model.coords)))
+            print(f"{head}{solver:>15} {solve_s:>8.2f} {solution.status:>8} {solution.objective:>14,.0f} "
+                  f"{sankey_s:>9.3f} {map_s:>6.3f}")
+            head = " " * len(head)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from .model import TransportModel, build_transport_model, build_from_lanes, build_from_tables, input_problems, to_pulp
+from .synthetic import random_instance, random_network
+from .network_simplex import NetworkSimplex
+from .solvers import SOLVERS, TransportSolution, solve, solve_transport
+from .session import SolverSession
+from .cache import SolutionCache, scenario_key
+from .tracing import Tracer
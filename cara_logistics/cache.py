@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def scenario_key(model, solver, **options):
+    """Stable content hash of a model's supply, demand and lane arrays plus solver options."""
+    h = hashlib.sha256()
+    for labels in (model.supply_labels, model.demand_labels):
+        h.update(json.dumps([str(label) for label in labels]).encode())
+    arrays = (
+        model.supply, model.demand, model.lane_supply, model.lane_demand,
+        model.cost, model.capacity, model.min_load,
+    )
+    for array in arrays:
+        h.update(str(array.shape).encode())
+        h.update(np.ascontiguousarray(array).tobytes())
+    h.update(json.dumps({"solver": solver, **options}, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class SolutionCache:
+    """Bounded LRU of solved plans, optionally backed by one pickle per key in `path`.
+
+    Safe to share between Streamlit sessions; entries must be treated as
+    read-only by callers.
+    """
+
+    def __init__(self, maxsize=128, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            solution = self._entries.get(key)
+            if solution is not None:
+                self._entries.move_to_end(key)
+            elif self.path:
+                solution = self._load(key)
+                if solution is not None:
+                    self._insert(key, solution)
+            if solution is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return solution
+
+    def put(self, key, solution):
+        with self._lock:
+            self._insert(key, solution)
+            if self.path:
+                tmp = self._file(key) + ".tmp"
+                with open(tmp, "wb") as f:
+                    pickle.dump(solution, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._file(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "maxsize": self.maxsize,
+            "path": self.path,
+        }
+
+    def _insert(self, key, solution):
+        self._entries[key] = solution
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def _load(self, key):
+        try:
+            with open(self._file(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
@@ -0,0 +1,262 @@
+import numpy as np
+import pandas as pd
+
+# altair and pydeck are imported inside the functions that build their
+# objects; together they are most of the app's import time
+ROUTE_COLOR = [0, 100, 255]
+
+
+def _compact(index, labels):
+    """Renumber the node ids that occur in `index` to 0..k-1; `labels` is per entry."""
+    _, first, codes = np.unique(index, return_index=True, return_inverse=True)
+    return codes, labels[first]
+
+
+def _group_codes(labels, groups):
+    grouped = pd.Series(labels).map(groups).fillna(pd.Series(labels)).to_numpy(dtype=object)
+    codes, _ = pd.factorize(grouped)
+    return codes, grouped
+
+
+def sankey_data(flows, top_n=None, origin_groups=None, destination_groups=None,
+                other_labels=("Other origins", "Other destinations")):
+    """Plotly Sankey trace (as a dict) from a nonzero flow table.
+
+    `flows` is TransportSolution.flow_table: its from_idx/to_idx columns are
+    the node index arrays, so no label lookups happen per link. Optional
+    `*_groups` mappings roll nodes up (e.g. RDC -> state) before drawing.
+    With `top_n`, only the heaviest links are kept and the remaining volume
+    is routed to an "other destinations" node, so totals still add up.
+    """
+    tons = flows["Tons"].to_numpy(dtype=float)
+    from_labels = flows["From"].to_numpy(dtype=object)
+    to_labels = flows["To"].to_numpy(dtype=object)
+    if origin_groups:
+        origin, from_labels = _group_codes(from_labels, origin_groups)
+    else:
+        origin = flows["from_idx"].to_numpy()
+    if destination_groups:
+        destination, to_labels = _group_codes(to_labels, destination_groups)
+    else:
+        destination = flows["to_idx"].to_numpy()
+    origin, origin_labels = _compact(origin, from_labels)
+    destination, destination_labels = _compact(destination, to_labels)
+
+    # merge links that grouping made parallel
+    n_destinations = len(destination_labels)
+    pairs, link = np.unique(origin * n_destinations + destination, return_inverse=True)
+    tons = np.bincount(link, weights=tons, minlength=len(pairs))
+    origin, destination = np.divmod(pairs, n_destinations)
+
+    if top_n is not None and len(tons) > top_n:
+        order = np.argsort(-tons, kind="stable")
+        keep, rest = order[:top_n], order[top_n:]
+        # pruned volume stays attached to its origin if that origin is still
+        # drawn, otherwise it is pooled under a single "other origins" node
+        n_origins = len(origin_labels)
+        drawn = np.zeros(n_origins, dtype=bool)
+        drawn[origin[keep]] = True
+        rest_origin = np.where(drawn[origin[rest]], origin[rest], n_origins)
+        other = np.bincount(rest_origin, weights=tons[rest], minlength=n_origins + 1)
+        has_other = np.flatnonzero(other > 0)
+        origin = np.concatenate([origin[keep], has_other])
+        destination = np.concatenate([destination[keep], np.full(len(has_other), n_destinations)])
+        tons = np.concatenate([tons[keep], other[has_other]])
+        origin, origin_labels = _compact(origin, np.append(origin_labels, other_labels[0])[origin])
+        destination, destination_labels = _compact(
+            destination, np.append(destination_labels, other_labels[1])[destination]
+        )
+
+    link_labels = (
+        pd.Series(origin_labels[origin], dtype=object) + " → "
+        + pd.Series(destination_labels[destination], dtype=object)
+    )
+    return dict(
+        type='sankey',
+        node=dict(
+            pad=15,
+            thickness=20,
+            line=dict(color="black", width=0.5),
+            label=list(origin_labels) + list(destination_labels),
+        ),
+        link=dict(
+            source=origin,
+            target=len(origin_labels) + destination,
+            value=tons,
+            label=link_labels.to_numpy(),
+        ),
+    )
+
+
+def network_sankey_data(flows, labels, kinds=None, top_n=None):
+    """Plotly Sankey trace for a multi-echelon flow table (TransshipmentSolution.flow_table).
+
+    Unlike sankey_data, from_idx/to_idx index one shared node list, so a
+    packing house is a single node with links in and out. With `top_n`,
+    nodes that are on none of the heaviest links are merged into one
+    "Other <kind>" node per kind (`kinds` aligned with `labels`), which
+    keeps every echelon's volume in the picture.
+    """
+    tons = flows["Tons"].to_numpy(dtype=float)
+    tail = flows["from_idx"].to_numpy()
+    head = flows["to_idx"].to_numpy()
+    labels = np.asarray(labels, dtype=object)
+    if top_n is not None and len(tons) > top_n:
+        keep = np.argsort(-tons, kind="stable")[:top_n]
+        shown = np.zeros(len(labels), dtype=bool)
+        shown[tail[keep]] = shown[head[keep]] = True
+        kinds = np.full(len(labels), "nodes", dtype=object) if kinds is None else np.asarray(kinds, dtype=object)
+        names = np.where(shown, labels, "Other " + kinds.astype(str))
+        codes, labels = pd.factorize(names)
+        tail, head = codes[tail], codes[head]
+        labels = np.asarray(labels, dtype=object)
+        inside = tail != head  # links between two merged nodes of one kind
+        tail, head, tons = tail[inside], head[inside], tons[inside]
+
+    nodes, compact = np.unique(np.concatenate([tail, head]), return_inverse=True)
+    tail, head = compact[:len(tail)], compact[len(tail):]
+    pairs, link = np.unique(tail * len(nodes) + head, return_inverse=True)
+    tons = np.bincount(link.ravel(), weights=tons, minlength=len(pairs))
+    tail, head = np.divmod(pairs, len(nodes))
+    node_labels = labels[nodes]
+    return dict(
+        type='sankey',
+        node=dict(
+            pad=15,
+            thickness=20,
+            line=dict(color="black", width=0.5),
+            label=list(node_labels),
+        ),
+        link=dict(
+            source=tail,
+            target=head,
+            value=tons,
+            label=(pd.Series(node_labels[tail], dtype=object) + " → " + pd.Series(node_labels[head], dtype=object)).to_numpy(),
+        ),
+    )
+
+
+def scale_widths(tons, min_width=2, max_width=10):
+    tons = np.asarray(tons, dtype=float)
+    if len(tons) == 0 or tons.max() <= tons.min():
+        return np.full(len(tons), float(min_width))
+    return min_width + (max_width - min_width) * (tons - tons.min()) / (tons.max() - tons.min())
+
+
+def route_frame(flows, supply_coords, demand_coords):
+    """One row per nonzero lane with endpoint coordinates.
+
+    `supply_coords`/`demand_coords` are (n, 2) lat/lon arrays aligned with
+    the model's node order, gathered once per node rather than per lane.
+    """
+    start = np.asarray(supply_coords, dtype=float)[flows["from_idx"].to_numpy()]
+    end = np.asarray(demand_coords, dtype=float)[flows["to_idx"].to_numpy()]
+    return pd.DataFrame({
+        "start_lat": start[:, 0],
+        "start_lon": start[:, 1],
+        "end_lat": end[:, 0],
+        "end_lon": end[:, 1],
+        "tons": flows["Tons"].to_numpy(dtype=float),
+        "tooltip": (
+            flows["From"] + " → " + flows["To"] + ": " + flows["Tons"].map("{:.1f}".format) + " tons"
+        ).to_numpy(),
+    })
+
+
+def _cells(lat, lon, cell_deg):
+    return np.floor(lat / cell_deg).astype(np.int64) * 100_000 + np.floor(lon / cell_deg).astype(np.int64)
+
+
+def bundle_routes(routes, cell_deg=2.0):
+    """Aggregate lanes whose endpoints share a lat/lon grid cell.
+
+    Bundled endpoints sit at the tons-weighted centroid of the lanes they
+    replace, so heavy corridors keep their position on the map.
+    """
+    origin = _cells(routes["start_lat"].to_numpy(), routes["start_lon"].to_numpy(), cell_deg)
+    destination = _cells(routes["end_lat"].to_numpy(), routes["end_lon"].to_numpy(), cell_deg)
+    _, first, bundle = np.unique(
+        np.stack([origin, destination], axis=1), axis=0, return_index=True, return_inverse=True,
+    )
+    bundle = bundle.ravel()
+    tons = routes["tons"].to_numpy()
+    total = np.bincount(bundle, weights=tons)
+
+    def centroid(column):
+        return np.bincount(bundle, weights=routes[column].to_numpy() * tons) / total
+
+    lanes = np.bincount(bundle)
+    return pd.DataFrame({
+        "start_lat": centroid("start_lat"),
+        "start_lon": centroid("start_lon"),
+        "end_lat": centroid("end_lat"),
+        "end_lon": centroid("end_lon"),
+        "tons": total,
+        "tooltip": [f"{n} lane(s): {t:,.1f} tons" for n, t in zip(lanes.tolist(), total.tolist())],
+    })
+
+
+def route_layers(routes, arcs=False, binary=False, precision=4):
+    """pydeck layers for a route frame (see route_frame / bundle_routes).
+
+    JSON mode sends only the columns the layers read, with rounded
+    coordinates, which is what st.pydeck_chart needs. `binary=True` builds
+    layers with pydeck's binary transport for notebook/HTML renderers that
+    support it; those layers carry no tooltip text.
+    """
+    import pydeck as pdk
+
+    widths = scale_widths(routes["tons"])
+    start = routes[["start_lon", "start_lat"]].to_numpy().round(precision)
+    end = routes[["end_lon", "end_lat"]].to_numpy().round(precision)
+    origins = np.unique(start, axis=0)
+    layer_type = "ArcLayer" if arcs else "LineLayer"
+    color = {"get_source_color": ROUTE_COLOR, "get_target_color": ROUTE_COLOR} if arcs else {"get_color": ROUTE_COLOR}
+
+    if binary:
+        route_data = pd.DataFrame({"source": list(start), "target": list(end), "width": widths})
+        route_layer = pdk.Layer(
+            layer_type, data=route_data, use_binary_transport=True,
+            get_source_position="source", get_target_position="target", get_width="width", **color,
+        )
+        origin_layer = pdk.Layer(
+            "ScatterplotLayer", data=pd.DataFrame({"position": list(origins)}), use_binary_transport=True,
+            get_position="position", get_radius=20000, get_fill_color=ROUTE_COLOR,
+        )
+        return [route_layer, origin_layer]
+
+    route_data = pd.DataFrame({
+        "source": start.tolist(),
+        "target": end.tolist(),
+        "width": widths.round(1),
+        "tooltip": routes["tooltip"].to_numpy(),
+    })
+    route_layer = pdk.Layer(
+        layer_type, data=route_data,
+        get_source_position="source", get_target_position="target", get_width="width",
+        pickable=True, auto_highlight=True, **color,
+    )
+    origin_layer = pdk.Layer(
+        "ScatterplotLayer", data=pd.DataFrame({"position": origins.tolist()}),
+        get_position="position", get_radius=20000, get_fill_color=ROUTE_COLOR,
+    )
+    return [route_layer, origin_layer]
+
+
+def route_deck(routes, arcs=False):
+    import pydeck as pdk
+
+    tooltip = {"html": "<b>{tooltip}</b>", "style": {"backgroundColor": "steelblue", "color": "white"}}
+    view_state = pdk.ViewState(latitude=37, longitude=-95, zoom=3.5, pitch=0)
+    return pdk.Deck(layers=route_layers(routes, arcs=arcs), initial_view_state=view_state, tooltip=tooltip)
+
+
+def flow_bar_chart(flows):
+    import altair as alt
+
+    return alt.Chart(flows.drop(columns=["from_idx", "to_idx"], errors="ignore")).mark_bar().encode(
+        x=alt.X('Tons:Q', title='Shipment Volume (Tons)'),
+        y=alt.Y('From:N', title='From Region'),
+        color='To:N',
+        tooltip=['From', 'To', 'Tons', 'Cost per Ton', 'Total Cost']
+    ).properties(width=800, height=300)
@@ -0,0 +1,157 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .scenarios import RDC, REGION, SCENARIO, TONS, iter_scenarios, read_table, write_table
+from .distances import CostMatrixBuilder, RateModel
+from .reference import DATA_DIR, KIND, LATITUDE, LONGITUDE, NAME
+from .roads import load_road_graph
+from .model import build_from_lanes
+from .solvers import SOLVERS, solve
+
+
+def solve_scenario(task):
+    """Process-pool worker: solve one scenario and return (summary row, nonzero plan)."""
+    scenario, supply, demand, lanes, solver = task
+    start = time.perf_counter()
+    try:
+        solution = solve(build_from_lanes(supply, demand, lanes), solver)
+    except ValueError as exc:
+        summary = {SCENARIO: scenario, "Status": "Error", "Objective": np.nan, "Message": str(exc)}
+        return dict(summary, Seconds=time.perf_counter() - start), None
+
+    flows = solution.flow_table
+    plan = pd.DataFrame({SCENARIO: scenario, REGION: flows["From"], RDC: flows["To"], TONS: flows["Tons"]})
+    summary = {SCENARIO: scenario, "Status": solution.status, "Objective": solution.objective, "Message": ""}
+    return dict(summary, Seconds=time.perf_counter() - start), plan
+
+
+def run_batch(tasks, workers):
+    if workers == 1:
+        return [solve_scenario(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(solve_scenario, tasks, chunksize=chunksize))
+
+
+def batch_command(args):
+    try:
+        scenarios = iter_scenarios(read_table(args.supply), read_table(args.demand), read_table(args.costs))
+        tasks = [(name, s, d, c, args.solver) for name, s, d, c in scenarios]
+    except (OSError, ValueError) as exc:
+        sys.exit(f"error: {exc}")
+    if not tasks:
+        sys.exit(f"error: {args.supply} has no supply rows, so there are no scenarios to solve")
+
+    start = time.perf_counter()
+    results = run_batch(tasks, args.workers)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(args.out, exist_ok=True)
+    summaries = pd.DataFrame([summary for summary, _ in results])
+    plans = [plan for _, plan in results if plan is not None]
+    shipments = pd.concat(plans, ignore_index=True) if plans else pd.DataFrame(columns=[SCENARIO, REGION, RDC, TONS])
+    write_table(summaries, os.path.join(args.out, f"objectives.{args.format}"))
+    write_table(shipments, os.path.join(args.out, f"shipments.{args.format}"))
+
+    failed = int((summaries["Status"] != "Optimal").sum())
+    print(
+        f"Solved {len(tasks)} scenarios in {elapsed:.2f} s "
+        f"({len(tasks) / elapsed:,.1f} scenarios/sec, {args.workers} workers, solver={args.solver})"
+    )
+    if failed:
+        print(f"{failed} scenario(s) not optimal; see objectives.{args.format}")
+    return 0
+
+
+def costs_command(args):
+    try:
+        locations = read_table(args.locations or os.path.join(DATA_DIR, "locations.csv"))
+        missing = [c for c in (NAME, KIND, LATITUDE, LONGITUDE) if c not in locations.columns]
+        if missing:
+            raise ValueError(f"Locations table is missing column(s): {', '.join(missing)}")
+        rates = RateModel(args.rate, args.fixed, args.minimum, args.circuity)
+        graph = load_road_graph(args.road) if args.road else None
+    except (OSError, ValueError) as exc:
+        sys.exit(f"error: {exc}")
+
+    regions = locations[locations[KIND] == "region"]
+    rdcs = locations[locations[KIND] == "rdc"]
+    builder = CostMatrixBuilder(rates, graph, cache_dir=args.cache, workers=args.workers)
+    start = time.perf_counter()
+    lanes = builder.lanes(
+        regions[NAME], regions[[LATITUDE, LONGITUDE]].to_numpy(dtype=float),
+        rdcs[NAME], rdcs[[LATITUDE, LONGITUDE]].to_numpy(dtype=float),
+        max_miles=args.max_miles,
+    )
+    elapsed = time.perf_counter() - start
+    write_table(lanes, args.out)
+    cached = " (from cache)" if builder.hits and not builder.misses else ""
+    print(
+        f"Wrote {len(lanes):,} of {len(regions) * len(rdcs):,} lanes to {args.out} in {elapsed:.2f} s{cached} "
+        f"({'road graph' if graph is not None else 'great-circle'} miles)"
+    )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m cara_logistics",
+        description="Cara Logistics transportation optimizer (headless).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch",
+        help="solve many scenarios from long-format supply/demand/cost files",
+        description=(
+            "Solve every scenario found in long-format CSV/Parquet tables. Files may carry "
+            f"a '{SCENARIO}' column; supply needs '{REGION}', 'Supply (tons)', demand needs "
+            f"'{RDC}', 'Demand (tons)' and costs need '{REGION}', '{RDC}', 'Cost (USD per ton)' "
+            "with an optional 'Capacity (tons)'. Region/RDC pairs without a cost row are not serviceable."
+        ),
+    )
+    batch.add_argument("--supply", required=True, help="supply table (.csv or .parquet)")
+    batch.add_argument("--demand", required=True, help="demand table (.csv or .parquet)")
+    batch.add_argument("--costs", required=True, help="lane cost table (.csv or .parquet)")
+    batch.add_argument("--out", required=True, help="output directory for objectives and shipments")
+    batch.add_argument("--format", choices=["csv", "parquet"], default="csv", help="output format (default: %(default)s)")
+    batch.add_argument("--solver", choices=sorted(SOLVERS), default="network_simplex", help="default: %(default)s")
+    batch.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    batch.set_defaults(func=batch_command)
+
+    costs = commands.add_parser(
+        "costs",
+        help="generate a lane cost table from location coordinates and a $/ton-mile rate",
+        description=(
+            f"Write a long-format '{REGION}', '{RDC}', 'Cost (USD per ton)' table for every region x RDC "
+            "pair, priced as max(minimum, fixed + rate x miles x circuity). Miles are great-circle "
+            "unless --road points at a folder with nodes and edges files."
+        ),
+    )
+    costs.add_argument("--locations", help=f"{NAME}, {KIND} (region/rdc), {LATITUDE}, {LONGITUDE} table (default: bundled)")
+    costs.add_argument("--rate", type=float, required=True, help="USD per ton-mile")
+    costs.add_argument("--fixed", type=float, default=0.0, help="USD per ton added to every lane")
+    costs.add_argument("--minimum", type=float, default=0.0, help="minimum USD per ton")
+    costs.add_argument("--circuity", type=float, default=1.0, help="road miles per straight-line mile (default: %(default)s)")
+    costs.add_argument(
+        "--road",
+        help="OSMnx .graphml file, or folder with nodes.csv/.parquet (Node, Latitude, Longitude) and edges "
+             "(From, To, Miles, optional Minutes / Speed (mph) / Oneway)",
+    )
+    costs.add_argument("--workers", type=int, help="processes for road shortest paths (default: one per CPU for large builds)")
+    costs.add_argument("--max-miles", type=float, help="leave out lanes longer than this")
+    costs.add_argument("--cache", help="directory for cached distance and cost matrices and memory-mapped road tables")
+    costs.add_argument("--out", required=True, help="output lane table (.csv or .parquet)")
+    costs.set_defaults(func=costs_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,187 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .model import TransportModel
+
+UNMET = "(unmet demand)"
+PARALLEL_MIN_LANES = 200_000  # below this, pricing in-process beats shipping work to a pool
+
+# pricing workers receive the lane arrays once, through the pool initializer,
+# and afterwards only the current duals
+_lanes = None
+
+
+def _init_worker(lane_supply, lane_demand, cost, capacity, supply):
+    global _lanes
+    _lanes = (lane_supply, lane_demand, cost, capacity, supply)
+
+
+def price_chunk(start, stop, supply_duals, demand_duals, in_master, limit, tol, lanes=None):
+    """Price lanes start..stop-1 (whole regions) against the master's duals.
+
+    Returns (lagrangian, lanes, reduced_costs): this chunk's part of the
+    Lagrangian bound with the demand rows relaxed at `demand_duals`, and up
+    to `limit` lanes outside the master (`in_master` flags this chunk's
+    lanes) whose full reduced cost is below -tol, most negative first.
+    Relaxing demand leaves one continuous knapsack per region: fill lanes
+    with negative cost - demand dual, cheapest first, up to lane capacity
+    and the region's supply.
+    """
+    lane_supply, lane_demand, cost, capacity, supply = lanes or _lanes
+    region = lane_supply[start:stop]
+    lagrange_cost = cost[start:stop] - demand_duals[lane_demand[start:stop]]
+
+    order = np.lexsort((lagrange_cost, region))
+    region, lagrange_cost = region[order], lagrange_cost[order]
+    room = np.where(lagrange_cost < 0, capacity[start:stop][order], 0.0)
+    filled = np.cumsum(room)
+    first = np.flatnonzero(np.r_[True, region[1:] != region[:-1]])
+    before = filled - room - np.repeat(filled[first] - room[first], np.diff(np.r_[first, len(region)]))
+    take = np.clip(supply[region] - before, 0.0, room)
+    lagrangian = float(take @ lagrange_cost)
+
+    reduced = lagrange_cost - supply_duals[region]
+    # master lanes at capacity keep a negative reduced cost; they are already in
+    entering = np.flatnonzero((reduced < -tol) & ~in_master[order])
+    entering = entering[np.argsort(reduced[entering], kind="stable")[:limit]]
+    return lagrangian, start + order[entering], reduced[entering]
+
+
+def _chunks(lane_supply, n_chunks):
+    """Contiguous lane ranges that never split a region (lanes sorted by region)."""
+    n = len(lane_supply)
+    cuts = np.searchsorted(lane_supply, lane_supply[np.linspace(0, n, n_chunks + 1, dtype=np.int64)[1:-1]])
+    bounds = np.unique(np.r_[0, cuts, n])
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def initial_lanes(model, per_node=5):
+    """The `per_node` cheapest lanes into every RDC and out of every region."""
+    keep = np.zeros(model.n_lanes, dtype=bool)
+    for group in (model.lane_demand, model.lane_supply):
+        order = np.lexsort((model.cost, group))
+        grouped = group[order]
+        first = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        rank = np.arange(len(order)) - np.repeat(first, np.diff(np.r_[first, len(order)]))
+        keep[order[rank < per_node]] = True
+    return np.flatnonzero(keep)
+
+
+def solve_decomposition(model, master="network_simplex", workers=None, max_iterations=100, gap=1e-6,
+                        per_node=5, batch=None, tol=1e-7, progress=None):
+    """Solve a large LP by lane pricing with a Lagrangian bound on the demand rows.
+
+    A restricted master problem holds only a working set of lanes (the
+    cheapest few per node to start with) plus an expensive "unmet demand"
+    region that keeps it feasible. Each round, its duals price every other
+    lane in parallel chunks of whole regions; the same pass evaluates the
+    Lagrangian relaxation of the demand rows at the master's demand duals,
+    which is a lower bound on the full optimum. Lanes with negative reduced
+    cost join the master and the loop repeats until none are left (the
+    master's flows and duals are then optimal for the full model) or the
+    relative gap between the master objective and the best bound is below
+    `gap`.
+
+    `workers` processes price the lanes (default: one per CPU for models
+    with at least PARALLEL_MIN_LANES lanes, else in-process). Returns a
+    TransportSolution over the full model whose stats add bound, gap,
+    rounds, master_lanes and a per-round history; `progress`, if given, is
+    called with each round's history entry as it completes.
+    """
+    from .solvers import TransportSolution, solve
+
+    if model.has_min_loads:
+        raise ValueError("Minimum lane loads make the model a MIP; use the cbc solver")
+    start_time = time.perf_counter()
+    n_supply, n_demand = model.n_supply, model.n_demand
+    if workers is None:
+        workers = os.cpu_count() if model.n_lanes >= PARALLEL_MIN_LANES else 1
+    batch = batch or max(1000, 2 * (n_supply + n_demand))
+
+    # workers see lanes grouped by region; `by_region` maps back to model order
+    by_region = np.argsort(model.lane_supply, kind="stable")
+    lanes = (
+        model.lane_supply[by_region], model.lane_demand[by_region], model.cost[by_region],
+        np.minimum(model.capacity[by_region], model.supply[model.lane_supply[by_region]]), model.supply,
+    )
+    chunks = _chunks(lanes[0], max(1, workers) * 4)
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=lanes) if workers > 1 else None
+
+    big = (float(np.abs(model.cost).max(initial=0.0)) + 1.0) * (n_supply + n_demand + 1)
+    unmet_supply = np.append(model.supply, model.demand.sum())
+    unmet_lane_demand = np.arange(n_demand)
+    in_master = np.zeros(model.n_lanes, dtype=bool)
+    in_master[initial_lanes(model, per_node)] = True
+    bound, history = -np.inf, []
+    try:
+        for rounds in range(1, max_iterations + 1):
+            working = np.flatnonzero(in_master)
+            restricted = TransportModel(
+                model.supply_labels + [UNMET], model.demand_labels, unmet_supply, model.demand,
+                np.r_[model.lane_supply[working], np.full(n_demand, n_supply)],
+                np.r_[model.lane_demand[working], unmet_lane_demand],
+                np.r_[model.cost[working], np.full(n_demand, big)],
+                np.r_[model.capacity[working], np.full(n_demand, np.inf)],
+            )
+            result = solve(restricted, master)
+            if result.status != "Optimal":
+                break
+            supply_duals = result.duals[:n_supply]
+            demand_duals = result.duals[n_supply + 1:]
+
+            flagged = in_master[by_region]
+            work = [(a, b, supply_duals, demand_duals, flagged[a:b], batch, tol) for a, b in chunks]
+            if pool is None:
+                priced = [price_chunk(*args, lanes=lanes) for args in work]
+            else:
+                priced = list(pool.map(price_chunk, *zip(*work)))
+            bound = max(bound, float(demand_duals @ model.demand) + sum(p[0] for p in priced))
+            entering = np.concatenate([p[1] for p in priced])
+            reduced = np.concatenate([p[2] for p in priced])
+            entering = by_region[entering[np.argsort(reduced, kind="stable")[:batch]]]
+
+            objective = result.objective
+            rel_gap = (objective - bound) / max(1.0, abs(objective))
+            history.append({
+                "round": rounds, "master_lanes": len(working), "objective": objective, "bound": bound,
+                "gap": rel_gap, "entering": len(entering), "seconds": time.perf_counter() - start_time,
+            })
+            if progress is not None:
+                progress(history[-1])
+            if not len(entering) or rel_gap <= gap:
+                break
+            in_master[entering] = True
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    flows = np.zeros(model.n_lanes)
+    status = result.status
+    if status == "Optimal":
+        flows[working] = result.flows[:len(working)]
+        if result.flows[len(working):].sum() > 1e-9 * max(1.0, model.demand.sum()):
+            status = "Infeasible"
+        elif history[-1]["entering"] and history[-1]["gap"] > gap:
+            status = "Not Solved"  # ran out of rounds
+        duals = np.concatenate([supply_duals, demand_duals])
+    else:
+        duals = np.zeros(n_supply + n_demand)
+    return TransportSolution(
+        model, flows, float(flows @ model.cost), status, duals, "decomposition",
+        stats={
+            "variables": model.n_lanes,
+            "constraints": n_supply + n_demand,
+            "iterations": rounds,
+            "nodes": None,
+            "master": master,
+            "workers": workers,
+            "master_lanes": int(in_master.sum()),
+            "bound": bound,
+            "gap": history[-1]["gap"] if history else None,
+            "history": history,
+            "elapsed": time.perf_counter() - start_time,
+        },
+    )
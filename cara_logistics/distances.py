@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .scenarios import COST, RDC, REGION
+
+EARTH_RADIUS_MILES = 3958.8
+LATITUDE = "Latitude"
+LONGITUDE = "Longitude"
+BLOCK_CELLS = 4_000_000  # origin x destination pairs per haversine block, bounds temporaries
+
+
+def haversine_miles(origins, destinations):
+    """Great-circle miles between every origin and destination, as an (n, m) array.
+
+    Both arguments are (k, 2) lat/lon arrays in degrees. Rows are computed
+    in blocks so the temporaries stay bounded for very large matrices.
+    """
+    origins = np.radians(np.asarray(origins, dtype=float).reshape(-1, 2))
+    destinations = np.radians(np.asarray(destinations, dtype=float).reshape(-1, 2))
+    lat2, lon2 = destinations[:, 0], destinations[:, 1]
+    cos_lat2 = np.cos(lat2)
+    out = np.empty((len(origins), len(destinations)))
+    step = max(1, BLOCK_CELLS // max(1, len(destinations)))
+    for start in range(0, len(origins), step):
+        lat1 = origins[start:start + step, 0:1]
+        lon1 = origins[start:start + step, 1:2]
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * cos_lat2 * np.sin((lon2 - lon1) / 2) ** 2
+        out[start:start + step] = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return out
+
+
+def pair_haversine_miles(a, b):
+    """Great-circle miles between a[k] and b[k] for each row k."""
+    a, b = np.radians(np.asarray(a, dtype=float)), np.radians(np.asarray(b, dtype=float))
+    h = np.sin((b[:, 0] - a[:, 0]) / 2) ** 2 + np.cos(a[:, 0]) * np.cos(b[:, 0]) * np.sin((b[:, 1] - a[:, 1]) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+class RateModel:
+    """USD per ton for a lane of a given length.
+
+    cost = max(minimum_per_ton, fixed_per_ton + per_ton_mile * miles * circuity)
+
+    `circuity` scales straight-line miles up to typical road miles when no
+    road graph is used (about 1.2 for US highways); leave it at 1.0 with
+    road distances.
+    """
+
+    def __init__(self, per_ton_mile, fixed_per_ton=0.0, minimum_per_ton=0.0, circuity=1.0):
+        if per_ton_mile < 0 or fixed_per_ton < 0 or minimum_per_ton < 0 or circuity <= 0:
+            raise ValueError("Rates must be non-negative and circuity positive")
+        self.per_ton_mile = float(per_ton_mile)
+        self.fixed_per_ton = float(fixed_per_ton)
+        self.minimum_per_ton = float(minimum_per_ton)
+        self.circuity = float(circuity)
+
+    def params(self):
+        return {
+            "per_ton_mile": self.per_ton_mile,
+            "fixed_per_ton": self.fixed_per_ton,
+            "minimum_per_ton": self.minimum_per_ton,
+            "circuity": self.circuity,
+        }
+
+    def cost(self, miles):
+        # unreachable lanes (inf miles) stay inf
+        return np.maximum(self.minimum_per_ton, self.fixed_per_ton + self.per_ton_mile * self.circuity * miles)
+
+
+class CostMatrixBuilder:
+    """Origin x destination cost matrices from coordinates, a RateModel and optional road graph.
+
+    Distance matrices are cached keyed on the coordinates and the graph,
+    and cost matrices additionally on the rates, so changing a rate
+    reuses the (expensive) road distances. The last `maxsize` matrices
+    are kept in memory and, with `cache_dir`, every matrix on disk;
+    returned matrices are shared and must be treated as read-only.
+    With a road graph, the node-to-node shortest-path tables behind them
+    are kept memory-mapped under cache_dir/roads (see DistanceTables), so
+    new points that snap to known nodes skip Dijkstra too; `workers`
+    bounds the processes that build them.
+    """
+
+    def __init__(self, rates, graph=None, cache_dir=None, workers=None, maxsize=32):
+        self.rates = rates
+        self.graph = graph
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._graph_key = graph.fingerprint() if graph is not None else "haversine"
+        self.tables = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            if graph is not None:
+                from .roads import DistanceTables
+
+                self.tables = DistanceTables(os.path.join(cache_dir, "roads"))
+
+    def miles(self, origins, destinations):
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        destinations = np.asarray(destinations, dtype=float).reshape(-1, 2)
+        key = self._key("miles", origins, destinations)
+        return self._cached(key, lambda: (
+            self.graph.distances(origins, destinations, "miles", self.workers, self.tables) if self.graph is not None
+            else haversine_miles(origins, destinations)
+        ))
+
+    def minutes(self, origins, destinations):
+        """(n, m) fastest road travel minutes; needs a road graph."""
+        if self.graph is None:
+            raise ValueError("Travel times need a road graph")
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        destinations = np.asarray(destinations, dtype=float).reshape(-1, 2)
+        key = self._key("minutes", origins, destinations)
+        return self._cached(key, lambda: self.graph.distances(origins, destinations, "minutes", self.workers, self.tables))
+
+    def cost(self, origins, destinations):
+        """(n, m) USD per ton; inf where the road graph has no path."""
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        destinations = np.asarray(destinations, dtype=float).reshape(-1, 2)
+        key = self._key("cost", origins, destinations, self.rates.params())
+        return self._cached(key, lambda: self.rates.cost(self.miles(origins, destinations)))
+
+    def table(self, supply_labels, supply_coords, demand_labels, demand_coords):
+        """Region x RDC cost DataFrame, shaped like ReferenceData.default_costs."""
+        return pd.DataFrame(self.cost(supply_coords, demand_coords), index=list(supply_labels), columns=list(demand_labels),
+                            copy=True)
+
+    def lanes(self, supply_labels, supply_coords, demand_labels, demand_coords, max_miles=None):
+        """Long-format Region / RDC / Cost table of reachable lanes (optionally within `max_miles`)."""
+        cost = self.cost(supply_coords, demand_coords)
+        keep = np.isfinite(cost)
+        if max_miles is not None:
+            keep &= self.miles(supply_coords, demand_coords) <= max_miles
+        rows, cols = np.nonzero(keep)
+        return pd.DataFrame({
+            REGION: np.asarray(supply_labels, dtype=object)[rows],
+            RDC: np.asarray(demand_labels, dtype=object)[cols],
+            COST: cost[rows, cols],
+        })
+
+    def stats(self):
+        stats = {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "path": self.cache_dir}
+        if self.tables is not None:
+            stats["road_tables"] = self.tables.stats()
+        return stats
+
+    def _key(self, kind, origins, destinations, params=None):
+        h = hashlib.sha256(kind.encode())
+        for array in (origins, destinations):
+            h.update(str(array.shape).encode())
+            h.update(np.ascontiguousarray(array).tobytes())
+        h.update(self._graph_key.encode())
+        h.update(json.dumps(params or {}, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _cached(self, key, compute):
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return matrix
+        path = os.path.join(self.cache_dir, f"{key}.npy") if self.cache_dir else None
+        if path:
+            try:
+                matrix = np.load(path)
+            except (OSError, ValueError):
+                pass
+        hit = matrix is not None
+        if not hit:
+            matrix = compute()
+            if path:
+                # a unique name, so concurrent builders never write into each other's file
+                fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".npy")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        np.save(f, matrix)
+                    os.replace(tmp, path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._insert(key, matrix)
+        return matrix
+
+    def _insert(self, key, matrix):
+        self._entries[key] = matrix
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,262 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .model import pulp_from_arrays
+from .scenarios import RDC
+from .solvers import TransportSolution, cbc_result
+
+MARKET = "Market"
+OPTIMAL_GAP = 1e-6  # relative gap CBC can leave behind on a proven optimum
+
+
+class FacilityModel:
+    """Capacitated facility location: which candidate RDC sites to open.
+
+    `inbound` (a TransportModel) holds the regions, their supply and the
+    lanes into the candidate sites, which are its demand nodes (its demand
+    values are ignored). Open sites serve the markets' `market_demand`
+    over `outbound_cost`, a (sites, markets) USD-per-ton array where inf
+    marks pairs a site can't serve. Opening site s costs `fixed_cost[s]`
+    and lets it handle up to `site_capacity[s]` tons (inf for no limit).
+    `status` forces sites open (1) or closed (0); NaN leaves the choice
+    to the solver.
+
+    Variables are the inbound lane flows, then the allowed outbound
+    site-market flows, then one open/close binary per site. Rows: supply
+    per region, flow balance per site, demand per market, capacity per
+    site. The strong formulation adds, for every outbound pair,
+    flow <= min(demand, capacity) * open, and one cover row requiring
+    enough open capacity for all demand; both are implied by the integer
+    model but tighten its LP relaxation, which is what branch and bound
+    prunes with.
+    """
+
+    def __init__(self, inbound, market_labels, market_demand, outbound_cost, fixed_cost, site_capacity=np.inf,
+                 status=None):
+        if inbound.has_min_loads:
+            raise ValueError("Minimum lane loads are not supported in facility location")
+        self.inbound = inbound
+        self.market_labels = list(market_labels)
+        self.market_demand = np.array(market_demand, dtype=float)
+        n_sites = inbound.n_demand
+        self.outbound_cost = np.array(outbound_cost, dtype=float).reshape(n_sites, len(self.market_labels))
+        self.fixed_cost = np.array(np.broadcast_to(fixed_cost, (n_sites,)), dtype=float)
+        self.site_capacity = np.array(np.broadcast_to(site_capacity, (n_sites,)), dtype=float)
+        self.status = np.full(n_sites, np.nan) if status is None else np.array(
+            np.broadcast_to(status, (n_sites,)), dtype=float)
+        self.out_site, self.out_market = np.nonzero(np.isfinite(self.outbound_cost))
+        unserved = np.setdiff1d(np.arange(self.n_markets), self.out_market)
+        if len(unserved):
+            names = ", ".join(str(self.market_labels[m]) for m in unserved[:5])
+            raise ValueError(f"No candidate site can serve market(s) {names}")
+
+    @property
+    def site_labels(self):
+        return self.inbound.demand_labels
+
+    @property
+    def n_sites(self):
+        return self.inbound.n_demand
+
+    @property
+    def n_markets(self):
+        return len(self.market_labels)
+
+    @property
+    def n_outbound(self):
+        return len(self.out_site)
+
+    @property
+    def n_variables(self):
+        return self.inbound.n_lanes + self.n_outbound + self.n_sites
+
+    @property
+    def effective_capacity(self):
+        # an uncapped site never needs to handle more than all demand
+        return np.minimum(self.site_capacity, self.market_demand.sum())
+
+    def matrix(self, strong=True):
+        """CSR rows: supply, site balance, market demand, site capacity, then (strong) links and cover."""
+        import scipy.sparse as sp
+
+        inbound = self.inbound
+        S, N, M, K, P = inbound.n_supply, self.n_sites, self.n_markets, inbound.n_lanes, self.n_outbound
+        x = np.arange(K)
+        y = K + np.arange(P)
+        z = K + P + np.arange(N)
+        capacity = self.effective_capacity
+        balance0, demand0, capacity0 = S, S + N, S + N + M
+        rows = [inbound.lane_supply, balance0 + inbound.lane_demand, balance0 + self.out_site,
+                demand0 + self.out_market, capacity0 + self.out_site, capacity0 + np.arange(N)]
+        cols = [x, x, y, y, y, z]
+        data = [np.ones(K), np.ones(K), -np.ones(P), np.ones(P), np.ones(P), -capacity]
+        n_rows = capacity0 + N
+        if strong:
+            rows += [n_rows + np.arange(P), n_rows + np.arange(P), np.full(N, n_rows + P)]
+            cols += [y, z[self.out_site], z]
+            data += [np.ones(P), -np.minimum(self.market_demand[self.out_market], capacity[self.out_site]), capacity]
+            n_rows += P + 1
+        return sp.csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n_rows, self.n_variables))
+
+    def to_pulp(self, strong=True, relax=False, name="Choose_RDCs"):
+        """(problem, variables); the open/close variables are binary unless `relax`."""
+        from pulp import LpConstraintEQ, LpConstraintGE, LpConstraintLE, LpInteger
+
+        inbound = self.inbound
+        S, N, M, P = inbound.n_supply, self.n_sites, self.n_markets, self.n_outbound
+        senses = [LpConstraintLE] * S + [LpConstraintEQ] * N + [LpConstraintGE] * M + [LpConstraintLE] * N
+        rhs = [inbound.supply, np.zeros(N), self.market_demand, np.zeros(N)]
+        row_names = ([f"Supply_{i}" for i in range(S)] + [f"Balance_{s}" for s in range(N)]
+                     + [f"Demand_{m}" for m in range(M)] + [f"Capacity_{s}" for s in range(N)])
+        if strong:
+            senses += [LpConstraintLE] * P + [LpConstraintGE]
+            rhs += [np.zeros(P), [self.market_demand.sum()]]
+            row_names += [f"Link_{s}_{m}" for s, m in zip(self.out_site.tolist(), self.out_market.tolist())] + ["Cover"]
+        columns = [f"in_{i}_{s}" for i, s in zip(inbound.lane_supply.tolist(), inbound.lane_demand.tolist())]
+        columns += [f"out_{s}_{m}" for s, m in zip(self.out_site.tolist(), self.out_market.tolist())]
+        columns += [f"open_{s}" for s in range(N)]
+        problem, variables = pulp_from_arrays(
+            name,
+            np.concatenate([inbound.cost, self.outbound_cost[self.out_site, self.out_market], self.fixed_cost]),
+            np.concatenate([inbound.capacity, np.full(P, np.inf), np.ones(N)]),
+            self.matrix(strong), senses, np.concatenate(rhs), row_names, columns,
+        )
+        for v, forced in zip(variables[-N:], self.status.tolist()):
+            if not relax:
+                v.cat = LpInteger
+            if not np.isnan(forced):
+                v.lowBound = v.upBound = forced
+        return problem, variables
+
+
+class FacilitySolution:
+    def __init__(self, model, inbound_flows, outbound_flows, open_sites, status, objective, stats=None):
+        self.model = model
+        self.inbound_flows = np.asarray(inbound_flows, dtype=float)    # per inbound lane
+        self.outbound_flows = np.asarray(outbound_flows, dtype=float)  # per allowed site-market pair
+        self.open = np.asarray(open_sites, dtype=bool)
+        self.status = status
+        self.objective = objective
+        self.stats = stats or {}
+
+    @property
+    def bound(self):
+        return self.stats.get("bound")
+
+    @property
+    def gap(self):
+        return self.stats.get("gap")
+
+    @property
+    def fixed_cost(self):
+        return float(self.model.fixed_cost[self.open].sum())
+
+    @property
+    def inbound_cost(self):
+        return float(self.inbound_flows @ self.model.inbound.cost)
+
+    @property
+    def outbound_cost(self):
+        model = self.model
+        return float(self.outbound_flows @ model.outbound_cost[model.out_site, model.out_market])
+
+    @property
+    def throughput(self):
+        return np.bincount(self.model.out_site, self.outbound_flows, minlength=self.model.n_sites)
+
+    def inbound_solution(self):
+        """Region -> site flows as a TransportSolution (site demand = throughput) for the charts."""
+        inbound = self.model.inbound.with_values(demand=self.throughput)
+        flows = self.inbound_flows
+        return TransportSolution(inbound, flows, float(flows @ inbound.cost), self.status,
+                                 np.zeros(inbound.n_supply + inbound.n_demand), self.stats.get("solver", "cbc"))
+
+    def site_table(self):
+        model = self.model
+        throughput = self.throughput
+        capacity = model.site_capacity
+        utilization = np.full(model.n_sites, np.nan)
+        capped = np.isfinite(capacity) & (capacity > 0)
+        utilization[capped] = throughput[capped] / capacity[capped]
+        return pd.DataFrame({
+            RDC: model.site_labels,
+            "Open": self.open,
+            "Throughput (tons)": throughput,
+            "Capacity (tons)": capacity,
+            "Utilization": utilization,
+            "Fixed cost": np.where(self.open, model.fixed_cost, 0.0),
+        })
+
+    def assignments(self):
+        """Nonzero site -> market flows."""
+        model = self.model
+        nz = np.flatnonzero(self.outbound_flows > 1e-9)
+        pair_cost = model.outbound_cost[model.out_site[nz], model.out_market[nz]]
+        return pd.DataFrame({
+            RDC: np.asarray(model.site_labels, dtype=object)[model.out_site[nz]],
+            MARKET: np.asarray(model.market_labels, dtype=object)[model.out_market[nz]],
+            "Tons": self.outbound_flows[nz],
+            "Cost per Ton": pair_cost,
+            "Total Cost": self.outbound_flows[nz] * pair_cost,
+        })
+
+
+def solve_facility(model, strong=True, time_limit=None, gap=None, threads=None, msg=False, relax=False, **options):
+    """Solve a FacilityModel with CBC and report how close the answer is to proven optimal.
+
+    `time_limit` (seconds) and `gap` (relative MIP gap, e.g. 0.01) stop
+    branch and bound early with the best plan found so far. The status is
+    "Optimal" only when the remaining gap is (about) zero; a plan stopped
+    short of that is "Feasible", even though CBC calls a stop on `gap`
+    optimal. Stats carry the best bound, the gap, the root LP bound and
+    CBC's stop reason. `relax` solves the LP relaxation instead
+    (open variables between 0 and 1), a quick lower bound.
+    """
+    from pulp import PULP_CBC_CMD, LpStatus
+
+    start = time.perf_counter()
+    problem, variables = model.to_pulp(strong, relax)
+    build = time.perf_counter() - start
+    K, P = model.inbound.n_lanes, model.n_outbound
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = options.setdefault("logPath", os.path.join(tmp, "cbc.log"))
+        problem.solve(PULP_CBC_CMD(msg=msg, timeLimit=time_limit, gapRel=gap, threads=threads, **options))
+        try:
+            with open(log_path) as f:
+                result = cbc_result(f.read())
+        except OSError:
+            result = {}
+    values = np.fromiter((v.varValue or 0.0 for v in variables), dtype=float, count=len(variables))
+    if problem.sol_status == 1 and (relax or result.get("gap", 0.0) <= OPTIMAL_GAP):
+        status = "Optimal"
+    elif problem.sol_status in (1, 2):
+        status = "Feasible"  # stopped on the time or gap limit with a plan in hand
+    else:
+        status = LpStatus[problem.status]
+    objective = problem.objective.value() if status in ("Optimal", "Feasible") else None
+    if status == "Optimal" and not relax:
+        result.setdefault("bound", objective)
+        result.setdefault("gap", 0.0)
+    return FacilitySolution(
+        model, values[:K], values[K:K + P], values[K + P:] > 0.5, status, objective,
+        {
+            "solver": "cbc",
+            "formulation": "strong" if strong else "weak",
+            "relaxed": relax,
+            "bound": result.get("bound"),
+            "gap": result.get("gap"),
+            "root_bound": result.get("root_bound"),
+            "stopped": result.get("result"),
+            "variables": model.n_variables,
+            "binaries": 0 if relax else int(np.isnan(model.status).sum()),
+            "constraints": len(problem.constraints),
+            "build_seconds": build,
+            "solver_seconds": problem.solutionTime,
+            "elapsed": time.perf_counter() - start,
+        },
+    )
@@ -0,0 +1,258 @@
+import os
+
+import numpy as np
+
+from .model import TransportModel
+from .scenarios import CAPACITY, COST, DEMAND, MIN_LOAD, RDC, REGION, SUPPLY
+
+LATITUDE = "Latitude"
+LONGITUDE = "Longitude"
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+EXAMPLES = 5
+MAX_PROBLEMS = 20
+
+# pyarrow is only needed for imports, so each function loads it on first use
+
+
+class ImportedNetwork:
+    def __init__(self, model, supply_coords=None, demand_coords=None, rows=None):
+        self.model = model
+        self.supply_coords = supply_coords
+        self.demand_coords = demand_coords
+        self.rows = rows or {}
+
+
+def _examples(values):
+    values = list(values)
+    more = f" and {len(values) - EXAMPLES} more" if len(values) > EXAMPLES else ""
+    return ", ".join(map(str, values[:EXAMPLES])) + more
+
+
+def iter_batches(source, labels, numbers, optional=(), batch_rows=65536, optional_labels=()):
+    """Yield Arrow record batches holding `labels` (as strings) and `numbers` (as float64).
+
+    `source` is a path or a named binary file object (e.g. a Streamlit
+    upload); the extension picks CSV, Parquet or Arrow IPC/Feather. Files are
+    read batch by batch, never materialised as a whole. `optional` numeric
+    and `optional_labels` string columns are included only when the file
+    has them.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    name = getattr(source, "name", source)
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported file type {ext!r} for {name}; expected one of {sorted(FORMATS)}")
+    columns = list(labels) + list(numbers)
+
+    if FORMATS[ext] == "csv":
+        types = {c: pa.string() for c in list(labels) + list(optional_labels)}
+        types.update({c: pa.float64() for c in list(numbers) + list(optional)})
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=max(batch_rows * 64, 1 << 20)),
+            convert_options=pa_csv.ConvertOptions(column_types=types),
+        )
+        schema, batches = reader.schema, reader
+    elif FORMATS[ext] == "parquet":
+        parquet = pq.ParquetFile(source)
+        schema = parquet.schema_arrow
+        batches = parquet.iter_batches(
+            batch_size=batch_rows,
+            columns=[c for c in columns + list(optional_labels) + list(optional) if c in schema.names],
+        )
+    else:
+        try:
+            reader = ipc.open_file(source)
+            schema = reader.schema
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            reader = ipc.open_stream(source)
+            schema, batches = reader.schema, reader
+
+    missing = [c for c in columns if c not in schema.names]
+    if missing:
+        raise ValueError(f"{name} is missing column(s): {', '.join(missing)}")
+    labels = list(labels) + [c for c in optional_labels if c in schema.names]
+    numbers = list(numbers) + [c for c in optional if c in schema.names]
+    for batch in batches:
+        yield pa.RecordBatch.from_arrays(
+            [pc.cast(batch.column(c), pa.string()) for c in labels]
+            + [pc.cast(batch.column(c), pa.float64()) for c in numbers],
+            names=labels + numbers,
+        )
+
+
+def _read_nodes(source, label, amount, kind, problems, batch_rows):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    names, values, positions = [], [], []
+    rows = 0
+    for batch in iter_batches(source, [label], [amount], [LATITUDE, LONGITUDE], batch_rows):
+        blank = batch.column(label).null_count
+        if blank:
+            problems.append(f"{kind}: {blank} row(s) without a {label} name in rows {rows + 1:,}-{rows + batch.num_rows:,}")
+        amounts = batch.column(amount)
+        if amounts.null_count:
+            missing = pc.filter(batch.column(label), pc.is_null(amounts))
+            problems.append(f"{kind}: missing {amount} for {_examples(missing.to_pylist())}")
+        negative = pc.fill_null(pc.less(amounts, 0), False)
+        if pc.any(negative).as_py():
+            problems.append(f"{kind}: negative {amount} for {_examples(pc.filter(batch.column(label), negative).to_pylist())}")
+        names.append(batch.column(label))
+        values.append(amounts.to_numpy(zero_copy_only=False))
+        if LATITUDE in batch.schema.names and LONGITUDE in batch.schema.names:
+            positions.append(np.column_stack([
+                batch.column(LATITUDE).to_numpy(zero_copy_only=False),
+                batch.column(LONGITUDE).to_numpy(zero_copy_only=False),
+            ]))
+        rows += batch.num_rows
+
+    names = pa.chunked_array(names, type=pa.string()).combine_chunks() if names else pa.array([], pa.string())
+    counts = pc.value_counts(names.drop_null())
+    dupes = pc.filter(counts.field("values"), pc.greater(counts.field("counts"), 1))
+    if len(dupes):
+        problems.append(f"{kind}: duplicate {label}(s) {_examples(dupes.to_pylist())}")
+    positions = np.concatenate(positions) if positions and len(positions) == len(values) else None
+    values = np.concatenate(values) if values else np.zeros(0)
+    return names, values, positions, rows
+
+
+def _read_lanes(source, supply_names, demand_names, problems, batch_rows):
+    """Lane arrays plus (rows read, whether every row was checked).
+
+    Node names are resolved only against node files that could be read
+    (`*_names` is None otherwise); unresolved ends are coded -1.
+    """
+    import pyarrow.compute as pc
+
+    lane_supply, lane_demand, cost, capacity, min_load = [], [], [], [], []
+    lane_rows = 0
+    complete = True
+    for batch in iter_batches(source, [REGION, RDC], [COST], [CAPACITY, MIN_LOAD], batch_rows):
+        where = f"rows {lane_rows + 1:,}-{lane_rows + batch.num_rows:,}"
+        ends = []
+        for kind, names, column in (("region", supply_names, REGION), ("RDC", demand_names, RDC)):
+            if names is None:
+                ends.append(np.full(batch.num_rows, -1))
+                continue
+            codes = pc.index_in(batch.column(column), value_set=names)
+            if codes.null_count:
+                unknown = pc.unique(pc.filter(batch.column(column), pc.is_null(codes)))
+                problems.append(f"Lanes: unknown {kind}(s) {_examples(unknown.to_pylist())} in {where}")
+            ends.append(pc.fill_null(codes, -1).to_numpy(zero_copy_only=False))
+        costs = batch.column(COST)
+        if costs.null_count:
+            problems.append(f"Lanes: {costs.null_count} lane(s) without a cost in {where}")
+        negative = pc.fill_null(pc.less(costs, 0), False)
+        if pc.any(negative).as_py():
+            problems.append(f"Lanes: {pc.sum(negative).as_py()} negative cost(s) in {where}")
+        if CAPACITY in batch.schema.names:
+            caps = batch.column(CAPACITY)
+            negative = pc.fill_null(pc.less(caps, 0), False)
+            if pc.any(negative).as_py():
+                problems.append(f"Lanes: {pc.sum(negative).as_py()} negative capacit(ies) in {where}")
+            capacity.append(pc.fill_null(caps, np.inf).to_numpy(zero_copy_only=False))
+        if MIN_LOAD in batch.schema.names:
+            loads = batch.column(MIN_LOAD)
+            negative = pc.fill_null(pc.less(loads, 0), False)
+            if pc.any(negative).as_py():
+                problems.append(f"Lanes: {pc.sum(negative).as_py()} negative minimum load(s) in {where}")
+            min_load.append(pc.fill_null(loads, 0.0).to_numpy(zero_copy_only=False))
+        lane_supply.append(ends[0])
+        lane_demand.append(ends[1])
+        cost.append(costs.to_numpy(zero_copy_only=False))
+        lane_rows += batch.num_rows
+        if len(problems) >= MAX_PROBLEMS:
+            problems.append(f"Stopped checking lanes after {lane_rows:,} rows")
+            complete = False
+            break
+
+    lane_supply = np.concatenate(lane_supply).astype(np.int64) if lane_supply else np.zeros(0, dtype=np.int64)
+    lane_demand = np.concatenate(lane_demand).astype(np.int64) if lane_demand else np.zeros(0, dtype=np.int64)
+    cost = np.concatenate(cost) if cost else np.zeros(0)
+    capacity = np.concatenate(capacity) if capacity else np.full(len(cost), np.inf)
+    min_load = np.concatenate(min_load) if min_load else np.zeros(len(cost))
+    return lane_supply, lane_demand, cost, capacity, min_load, lane_rows, complete
+
+
+def import_network(supply_source, demand_source, lane_source, batch_rows=65536):
+    """Stream supply, demand and long-format lane-cost files into a TransportModel.
+
+    Supply needs Region / Supply (tons), demand RDC / Demand (tons), lanes
+    Region / RDC / Cost (USD per ton) plus optional Capacity (tons) and
+    Minimum load (tons);
+    supply and demand may add Latitude / Longitude for the map. Only listed
+    lanes become variables. Every batch is checked as it is read (blank or
+    unknown nodes, negative or missing values, duplicates) and node names
+    are resolved to indices inside Arrow, so rows never become Python
+    objects. All three files are checked even when one has problems, so
+    every failure is reported at once. Returns (ImportedNetwork or None,
+    problems).
+    """
+    problems = []
+    supply_names = demand_names = lanes = None
+    try:
+        supply_names, supply, supply_coords, supply_rows = _read_nodes(
+            supply_source, REGION, SUPPLY, "Supply", problems, batch_rows,
+        )
+    except (OSError, ValueError) as exc:  # includes pyarrow parse errors (bad numbers, ragged rows)
+        problems.append(str(exc))
+    try:
+        demand_names, demand, demand_coords, demand_rows = _read_nodes(
+            demand_source, RDC, DEMAND, "Demand", problems, batch_rows,
+        )
+    except (OSError, ValueError) as exc:
+        problems.append(str(exc))
+    try:
+        lanes = _read_lanes(lane_source, supply_names, demand_names, problems, batch_rows)
+    except (OSError, ValueError) as exc:
+        problems.append(str(exc))
+    if lanes is None or supply_names is None or demand_names is None:
+        return None, problems
+
+    lane_supply, lane_demand, cost, capacity, min_load, lane_rows, complete = lanes
+    supply_labels, demand_labels = supply_names.to_pylist(), demand_names.to_pylist()
+    n_supply, n_demand = len(supply_labels), len(demand_labels)
+    known = (lane_supply >= 0) & (lane_demand >= 0)
+    key = np.where(known, lane_supply * n_demand + lane_demand, -1)
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    repeated = np.flatnonzero((key[1:] == key[:-1]) & (key[1:] >= 0))
+    if len(repeated):
+        pairs = [f"{supply_labels[k // n_demand]} → {demand_labels[k % n_demand]}" for k in key[repeated[:EXAMPLES]].tolist()]
+        problems.append(f"Lanes: {len(repeated)} duplicate lane(s), e.g. {_examples(pairs)}")
+    if complete:
+        # lanes are sparse: absent pairs just aren't serviceable, but an RDC
+        # that can't receive its demand makes the model infeasible up front
+        inbound = np.bincount(lane_demand[known], weights=capacity[known], minlength=n_demand)
+        short = np.flatnonzero(inbound < demand)
+        if len(short):
+            names = [demand_labels[j] for j in short[:EXAMPLES].tolist()]
+            problems.append(
+                f"Lanes: {len(short)} RDC(s) cannot receive their demand (no lanes or too little lane capacity), "
+                f"e.g. {_examples(names)}"
+            )
+    if problems:
+        return None, problems
+
+    model = TransportModel(
+        supply_labels, demand_labels, supply, demand,
+        lane_supply[order], lane_demand[order], cost[order], capacity[order], min_load[order],
+    )
+    rows = {"supply": supply_rows, "demand": demand_rows, "lanes": lane_rows}
+    return ImportedNetwork(model, supply_coords, demand_coords, rows), []
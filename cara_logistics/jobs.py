@@ -0,0 +1,287 @@
+import atexit
+import collections
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from .solvers import cbc_progress, solve
+
+FINISHED = ("done", "failed", "cancelled")
+WAIT_SAMPLES = 500  # recent queue waits kept for the metrics
+
+
+class SolveJob:
+    """One solve in the runner's queue or running in its own process.
+
+    `status` is "queued", "running", then "done" (result set), "failed"
+    (error set) or "cancelled". `progress` holds whatever the solver
+    reports while it runs: incumbent, bound, gap and nodes from the CBC
+    log, or the latest round of the decomposition engine. `owners` are the
+    sessions waiting on it; identical requests share one job.
+    """
+
+    def __init__(self, job_id, model, solver, options, key, owner):
+        self.id = job_id
+        self.model = model
+        self.solver = solver
+        self.options = options
+        self.key = key
+        self.owners = {owner}
+        self.status = "queued"
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def wait(self):
+        return (self.started or self.finished or time.time()) - self.submitted
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+def _work(model, solver, options, messages, log_path):
+    if hasattr(os, "setsid"):
+        os.setsid()  # own process group, so cancelling also stops the CBC child
+    if solver == "cbc":
+        options.setdefault("logPath", log_path)
+    elif solver == "decomposition":
+        options.setdefault("progress", lambda entry: messages.put(("progress", entry)))
+    try:
+        messages.put(("done", solve(model, solver, **options)))
+    except Exception as exc:
+        messages.put(("failed", f"{type(exc).__name__}: {exc}"))
+
+
+class JobRunner:
+    """Solve service: runs solves in background processes, at most `max_workers` at once.
+
+    submit() returns a SolveJob immediately. Jobs wait in one queue per
+    owner (e.g. a Streamlit session) and free workers take the next job
+    round-robin across owners, so one busy client can't starve the rest.
+    Submitting a problem identical to one already queued or running
+    (same scenario_key) joins that job instead of solving it twice.
+    poll(job) advances the whole service (collects finished processes,
+    starts queued jobs) and refreshes `job`; cancel(job, owner) drops the
+    owner's interest and kills the process once nobody is waiting on it.
+    Share one runner between sessions (it is thread-safe); stats() reports
+    queue depth, wait times and throughput.
+    """
+
+    def __init__(self, max_workers=None, context=None):
+        self.max_workers = max_workers or os.cpu_count()
+        self._mp = multiprocessing.get_context(context)
+        self._dir = tempfile.mkdtemp(prefix="cara-jobs-")
+        self._lock = threading.RLock()
+        self._queues = collections.OrderedDict()  # owner -> deque of queued jobs, in round-robin order
+        self._running = {}  # job id -> (process, message queue, log path)
+        self._inflight = {}  # dedup key -> queued or running job
+        self._waits = collections.deque(maxlen=WAIT_SAMPLES)
+        self._counts = collections.Counter()
+        self._peak_queue = 0
+        self.jobs = {}  # queued and running jobs by id; finished ones live on with their owners
+        # solver processes aren't daemons (the decomposition engine starts its own
+        # pool), so stop them before multiprocessing waits for them at exit
+        atexit.register(self.shutdown)
+
+    def submit(self, model, solver="network_simplex", owner=None, key=None, **options):
+        """Queue a solve for `owner`; identical in-flight problems (by `key`) are shared.
+
+        `key` defaults to scenario_key(model, solver) when no solver options
+        are given; with options, pass a key that covers them or none
+        (no de-duplication).
+        """
+        if key is None and not options:
+            from .cache import scenario_key
+
+            key = scenario_key(model, solver)
+        with self._lock:
+            self._counts["submitted"] += 1
+            job = self._inflight.get(key) if key is not None else None
+            if job is not None:
+                job.owners.add(owner)
+                self._counts["deduplicated"] += 1
+                return job
+            job = SolveJob(uuid.uuid4().hex[:12], model, solver, options, key, owner)
+            self.jobs[job.id] = job
+            if key is not None:
+                self._inflight[key] = job
+            self._queues.setdefault(owner, collections.deque()).append(job)
+            self._peak_queue = max(self._peak_queue, self.queued)
+            self._pump()
+            return job
+
+    def poll(self, job):
+        with self._lock:
+            self._pump()
+            if job.status == "running" and job.solver == "cbc":
+                log_path = self._running[job.id][2]
+                if os.path.exists(log_path):
+                    with open(log_path) as f:
+                        job.progress = cbc_progress(f.read())
+            return job
+
+    def position(self, job):
+        """1-based place `job` would start at if no new owners arrived; 0 once started."""
+        with self._lock:
+            if job.status != "queued":
+                return 0
+            depth = {owner: list(jobs) for owner, jobs in self._queues.items()}
+            place = 0
+            while depth:
+                for owner in list(depth):
+                    place += 1
+                    if depth[owner].pop(0) is job:
+                        return place
+                    if not depth[owner]:
+                        del depth[owner]
+            return place
+
+    def cancel(self, job, owner=None):
+        """Stop waiting on `job` for `owner` (all owners if None); kill it once nobody waits."""
+        with self._lock:
+            if owner is None:
+                job.owners.clear()
+            else:
+                job.owners.discard(owner)
+            if job.owners or job.done:
+                return job
+            if job.status == "queued":
+                for jobs in self._queues.values():
+                    if job in jobs:
+                        jobs.remove(job)
+                self._drop_empty_queues()
+                job.status = "cancelled"
+                job.finished = time.time()
+                self._release(job)
+            else:
+                process = self._running[job.id][0]
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except (AttributeError, OSError):  # no process groups here, or setsid hasn't run yet
+                    process.kill()
+                self._finish(job, "cancelled")
+            self._pump()
+            return job
+
+    def wait(self, job, timeout=None, interval=0.05):
+        deadline = None if timeout is None else time.time() + timeout
+        while not self.poll(job).done and (deadline is None or time.time() < deadline):
+            time.sleep(interval)
+        return job
+
+    @property
+    def queued(self):
+        return sum(len(jobs) for jobs in self._queues.values())
+
+    def stats(self):
+        with self._lock:
+            self._pump()
+            waits = np.asarray(self._waits, dtype=float)
+            return {
+                "workers": self.max_workers,
+                "running": len(self._running),
+                "queued": self.queued,
+                "peak_queued": self._peak_queue,
+                "owners_waiting": len(self._queues),
+                "submitted": self._counts["submitted"],
+                "deduplicated": self._counts["deduplicated"],
+                "done": self._counts["done"],
+                "failed": self._counts["failed"],
+                "cancelled": self._counts["cancelled"],
+                "wait_mean": float(waits.mean()) if len(waits) else None,
+                "wait_p95": float(np.percentile(waits, 95)) if len(waits) else None,
+                "wait_max": float(waits.max()) if len(waits) else None,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            for jobs in self._queues.values():
+                for job in jobs:
+                    job.status, job.finished = "cancelled", time.time()
+                    self._release(job)
+            self._queues.clear()
+            for job_id in list(self._running):
+                self.cancel(self.jobs[job_id])
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _pump(self):
+        # collect finished processes, then fill free workers round-robin
+        for job_id in list(self._running):
+            self._collect(self.jobs[job_id])
+        while len(self._running) < self.max_workers and self._queues:
+            owner, jobs = next(iter(self._queues.items()))
+            self._queues.move_to_end(owner)
+            self._start(jobs.popleft())
+            self._drop_empty_queues()
+
+    def _start(self, job):
+        messages = self._mp.Queue()
+        log_path = os.path.join(self._dir, f"{job.id}.log")
+        process = self._mp.Process(
+            target=_work, args=(job.model, job.solver, job.options, messages, log_path), name=f"solve-{job.id}",
+        )
+        process.start()
+        job.status = "running"
+        job.started = time.time()
+        self._waits.append(job.wait)
+        self._running[job.id] = (process, messages, log_path)
+
+    def _collect(self, job):
+        process, messages, _ = self._running[job.id]
+        try:
+            while True:
+                kind, payload = messages.get_nowait()
+                if kind == "progress":
+                    job.progress = dict(payload)
+                elif kind == "done":
+                    job.result = payload
+                    self._finish(job, "done")
+                    return
+                else:
+                    job.error = payload
+                    self._finish(job, "failed")
+                    return
+        except queue.Empty:
+            pass
+        if not process.is_alive() and messages.empty():
+            job.error = f"Solver process exited with code {process.exitcode}"
+            self._finish(job, "failed")
+
+    def _finish(self, job, status):
+        process, messages, log_path = self._running.pop(job.id)
+        job.status = status
+        job.finished = time.time()
+        process.join(timeout=1)
+        messages.close()
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        self._release(job)
+
+    def _release(self, job):
+        self._counts[job.status] += 1
+        self.jobs.pop(job.id, None)
+        if job.key is not None and self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+
+    def _drop_empty_queues(self):
+        for owner in [owner for owner, jobs in self._queues.items() if not jobs]:
+            del self._queues[owner]
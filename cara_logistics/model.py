@@ -0,0 +1,243 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from .scenarios import CAPACITY, COST, MIN_LOAD, RDC, REGION
+
+# scipy.sparse and pulp are imported where they are used so that importing
+# the package (and with it the Streamlit app's first paint) stays cheap
+
+
+class TransportModel:
+    """Transportation LP held as arrays: one column per lane, one row per node.
+
+    Rows are the supply nodes followed by the demand nodes, so the coefficient
+    matrix has exactly two nonzeros per lane column. Lanes need not cover
+    every supply x demand pair; `capacity` bounds each lane's flow (np.inf,
+    the default, leaves it open). A positive `min_load` makes a lane
+    semi-continuous: it carries either nothing or at least that much.
+    """
+
+    def __init__(self, supply_labels, demand_labels, supply, demand, lane_supply, lane_demand, cost,
+                 capacity=None, min_load=None):
+        self.supply_labels = list(supply_labels)
+        self.demand_labels = list(demand_labels)
+        # copies: callers keep editing the frames these arrays came from
+        self.supply = np.array(supply, dtype=float)
+        self.demand = np.array(demand, dtype=float)
+        self.lane_supply = np.asarray(lane_supply, dtype=np.int64)
+        self.lane_demand = np.asarray(lane_demand, dtype=np.int64)
+        self.cost = np.array(cost, dtype=float)
+        if capacity is None:
+            self.capacity = np.full(len(self.cost), np.inf)
+        else:
+            self.capacity = np.array(np.broadcast_to(capacity, self.cost.shape), dtype=float)
+        if min_load is None:
+            self.min_load = np.zeros(len(self.cost))
+        else:
+            self.min_load = np.array(np.broadcast_to(min_load, self.cost.shape), dtype=float)
+        self._matrix = None
+
+    def with_values(self, supply=None, demand=None, cost=None, capacity=None, min_load=None):
+        """Same lanes and labels with new supply, demand, cost, capacity and/or minimum-load arrays."""
+        model = TransportModel(
+            self.supply_labels, self.demand_labels,
+            self.supply if supply is None else supply,
+            self.demand if demand is None else demand,
+            self.lane_supply, self.lane_demand,
+            self.cost if cost is None else cost,
+            self.capacity if capacity is None else capacity,
+            self.min_load if min_load is None else min_load,
+        )
+        model._matrix = self._matrix
+        return model
+
+    @property
+    def n_supply(self):
+        return len(self.supply_labels)
+
+    @property
+    def n_demand(self):
+        return len(self.demand_labels)
+
+    @property
+    def n_lanes(self):
+        return len(self.cost)
+
+    @property
+    def capacitated(self):
+        return bool(np.isfinite(self.capacity).any())
+
+    @property
+    def has_min_loads(self):
+        return bool((self.min_load > 0).any())
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            import scipy.sparse as sp
+
+            lanes = np.arange(self.n_lanes)
+            rows = np.concatenate([self.lane_supply, self.n_supply + self.lane_demand])
+            cols = np.concatenate([lanes, lanes])
+            self._matrix = sp.csr_matrix(
+                (np.ones(2 * self.n_lanes), (rows, cols)),
+                shape=(self.n_supply + self.n_demand, self.n_lanes),
+            )
+        return self._matrix
+
+    @property
+    def rhs(self):
+        return np.concatenate([self.supply, self.demand])
+
+    @property
+    def row_names(self):
+        return [f"Supply_{s}" for s in self.supply_labels] + [f"Demand_{d}" for d in self.demand_labels]
+
+    @property
+    def routes(self):
+        s, d = self.supply_labels, self.demand_labels
+        return [(s[i], d[j]) for i, j in zip(self.lane_supply.tolist(), self.lane_demand.tolist())]
+
+
+def input_problems(supply, demand, costs):
+    """Readable reasons why supply/demand mappings and a cost frame can't be modelled."""
+    problems = []
+    for name, values in (("Supply", supply), ("Demand", demand)):
+        values = pd.Series(values)
+        if values.index.duplicated().any():
+            problems.append(f"{name} has duplicate node names")
+        numeric = pd.to_numeric(values, errors="coerce")
+        if numeric.isna().any():
+            problems.append(f"{name} is missing or non-numeric for {', '.join(map(str, values.index[numeric.isna()]))}")
+        elif (numeric < 0).any():
+            problems.append(f"{name} is negative for {', '.join(map(str, values.index[numeric < 0]))}")
+    cost = costs.reindex(index=pd.Series(supply).index, columns=pd.Series(demand).index)
+    cost = cost.apply(pd.to_numeric, errors="coerce")
+    if cost.isna().to_numpy().any():
+        problems.append("Missing transportation cost for one or more routes")
+    elif (cost.to_numpy() < 0).any():
+        problems.append("Transportation costs must not be negative")
+    return problems
+
+
+def build_transport_model(supply, demand, costs):
+    """Build a dense model from supply/demand mappings and a region x RDC cost frame."""
+    supply = pd.Series(supply, dtype=float)
+    demand = pd.Series(demand, dtype=float)
+    cost = costs.reindex(index=supply.index, columns=demand.index).to_numpy(dtype=float)
+    if np.isnan(cost).any():
+        raise ValueError("Missing transportation cost for one or more routes")
+
+    n_supply, n_demand = cost.shape
+    lane_supply = np.repeat(np.arange(n_supply), n_demand)
+    lane_demand = np.tile(np.arange(n_demand), n_supply)
+    return TransportModel(
+        supply.index, demand.index, supply.to_numpy(), demand.to_numpy(),
+        lane_supply, lane_demand, cost.ravel(),
+    )
+
+
+def build_from_lanes(supply, demand, lanes):
+    """Build a sparse model with one variable per row of a long-format lane table.
+
+    `lanes` has Region, RDC and Cost (USD per ton) columns and optionally
+    Capacity (tons), where blanks mean uncapacitated, and Minimum load
+    (tons). Pairs without a row are simply not serviceable.
+    """
+    supply = pd.Series(supply, dtype=float)
+    demand = pd.Series(demand, dtype=float)
+    lane_supply = supply.index.get_indexer(lanes[REGION])
+    lane_demand = demand.index.get_indexer(lanes[RDC])
+    unknown = (lane_supply < 0) | (lane_demand < 0)
+    if unknown.any():
+        bad = lanes.loc[unknown, [REGION, RDC]].astype(str).agg(" → ".join, axis=1)
+        raise ValueError(f"Lanes reference unknown regions or RDCs: {', '.join(bad[:5])}")
+    cost = lanes[COST].to_numpy(dtype=float)
+    if np.isnan(cost).any():
+        raise ValueError("Missing transportation cost for one or more lanes")
+    capacity = None
+    if CAPACITY in lanes.columns:
+        capacity = np.nan_to_num(lanes[CAPACITY].to_numpy(dtype=float), nan=np.inf)
+    min_load = None
+    if MIN_LOAD in lanes.columns:
+        min_load = np.nan_to_num(lanes[MIN_LOAD].to_numpy(dtype=float), nan=0.0)
+        if (min_load < 0).any():
+            raise ValueError("Minimum loads must not be negative")
+
+    order = np.lexsort((lane_demand, lane_supply))
+    key = lane_supply[order] * len(demand) + lane_demand[order]
+    if (key[1:] == key[:-1]).any():
+        raise ValueError("Duplicate lanes in the lane table")
+    return TransportModel(
+        supply.index, demand.index, supply.to_numpy(), demand.to_numpy(),
+        lane_supply[order], lane_demand[order], cost[order],
+        None if capacity is None else capacity[order],
+        None if min_load is None else min_load[order],
+    )
+
+
+def build_from_tables(supply_df, demand_df, costs):
+    supply = supply_df.set_index("Region")["Supply (tons)"]
+    demand = demand_df.set_index("RDC")["Demand (tons)"]
+    return build_transport_model(supply, demand, costs)
+
+
+def pulp_from_arrays(name, cost, upper, matrix, senses, rhs, row_names, column_names):
+    """PuLP problem for min cost @ x s.t. matrix @ x (sense) rhs, 0 <= x <= upper.
+
+    `matrix` is CSR; `senses` holds PuLP's LpConstraintLE/GE/EQ codes per
+    row and `upper` may contain np.inf. Returns (problem, variables).
+    """
+    from pulp import LpProblem, LpMinimize, LpVariable, LpAffineExpression, LpConstraint
+
+    problem = LpProblem(name, LpMinimize)
+    # PuLP >= 3.3 deprecates constructing LpVariable directly
+    new_variable = getattr(problem, "add_variable", LpVariable)
+    x = [
+        new_variable(col, 0, None if math.isinf(up) else up)
+        for col, up in zip(column_names, np.asarray(upper, dtype=float).tolist())
+    ]
+    problem.setObjective(LpAffineExpression(zip(x, np.asarray(cost, dtype=float).tolist())))
+
+    indptr = matrix.indptr
+    indices = matrix.indices.tolist()
+    data = matrix.data.tolist()
+    for r, (row_name, sense, b) in enumerate(zip(row_names, senses, np.asarray(rhs, dtype=float).tolist())):
+        lo, hi = indptr[r], indptr[r + 1]
+        expr = LpAffineExpression(zip([x[k] for k in indices[lo:hi]], data[lo:hi]))
+        problem.addConstraint(LpConstraint(expr, int(sense), row_name, b))
+    return problem, x
+
+
+def to_pulp(model, name="Minimize_Transportation_Cost"):
+    """Hand the array model to PuLP in one pass over the CSR rows.
+
+    Capacities are plain variable bounds. Each minimum-load lane adds a
+    binary and two rows after the supply/demand rows,
+    x >= min_load * y and x <= upper * y, where upper is the lane capacity
+    capped at the origin's supply to keep the relaxation tight.
+    """
+    from pulp import LpAffineExpression, LpBinary, LpConstraint, LpConstraintGE, LpConstraintLE, LpVariable
+
+    problem, x = pulp_from_arrays(
+        name, model.cost, model.capacity, model.matrix,
+        [LpConstraintLE] * model.n_supply + [LpConstraintGE] * model.n_demand,
+        model.rhs, model.row_names,
+        [f"route_{i}_{j}" for i, j in zip(model.lane_supply.tolist(), model.lane_demand.tolist())],
+    )
+
+    new_variable = getattr(problem, "add_variable", LpVariable)
+    upper = np.minimum(model.capacity, model.supply[model.lane_supply])
+    for k in np.flatnonzero(model.min_load > 0).tolist():
+        i, j = int(model.lane_supply[k]), int(model.lane_demand[k])
+        low, high = float(model.min_load[k]), float(upper[k])
+        if low > high:
+            # the minimum can never be met, so the lane stays empty
+            x[k].upBound = 0
+            continue
+        y = new_variable(f"use_{i}_{j}", cat=LpBinary)
+        problem.addConstraint(LpConstraint(LpAffineExpression([(x[k], 1), (y, -low)]), LpConstraintGE, f"MinLoad_{i}_{j}", 0))
+        problem.addConstraint(LpConstraint(LpAffineExpression([(x[k], 1), (y, -high)]), LpConstraintLE, f"Open_{i}_{j}", 0))
+    return problem, x
@@ -0,0 +1,345 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from .model import pulp_from_arrays
+from .network_simplex import NetworkSimplex
+from .scenarios import DEMAND, RDC, REGION, SUPPLY
+from .solvers import TransportSolution
+
+WEEK = "Week"
+
+
+def _per_week(values, n_periods, n, name):
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = np.broadcast_to(values, (n_periods, n))
+    if values.shape != (n_periods, n):
+        raise ValueError(f"{name} must have shape ({n_periods}, {n}), got {values.shape}")
+    return np.array(values)
+
+
+class MultiPeriodModel:
+    """Weekly transportation plan with inventory carried between weeks at the RDCs.
+
+    `base` (a TransportModel) supplies the labels, lanes and lane
+    capacities. `supply` and `demand` are (weeks, nodes) arrays and `cost`
+    is (weeks, lanes) or one cost per lane for every week. Each RDC holds
+    stock at `holding_cost` per ton-week up to `storage` tons and starts
+    with `initial_inventory`. Supply a region doesn't ship in its week is
+    lost (fresh fruit). Week t of the plan is calendar week
+    `first_week + t`.
+
+    Variables are the lane flows of every week followed by each RDC's
+    end-of-week inventory. The same arrays describe a time-expanded
+    min-cost-flow network (network()) and an LP (matrix, rhs).
+    """
+
+    def __init__(self, base, supply, demand, cost=None, holding_cost=0.0, storage=np.inf,
+                 initial_inventory=0.0, first_week=0):
+        if base.has_min_loads:
+            raise ValueError("Minimum lane loads are not supported in multi-period plans")
+        self.base = base
+        self.supply = _per_week(supply, len(supply), base.n_supply, "supply")
+        self.n_periods = len(self.supply)
+        self.demand = _per_week(demand, self.n_periods, base.n_demand, "demand")
+        self.cost = _per_week(base.cost if cost is None else cost, self.n_periods, base.n_lanes, "cost")
+        self.holding_cost = np.array(np.broadcast_to(holding_cost, (base.n_demand,)), dtype=float)
+        self.storage = np.array(np.broadcast_to(storage, (base.n_demand,)), dtype=float)
+        self.initial_inventory = np.array(np.broadcast_to(initial_inventory, (base.n_demand,)), dtype=float)
+        self.first_week = first_week
+
+    @property
+    def n_supply(self):
+        return self.base.n_supply
+
+    @property
+    def n_demand(self):
+        return self.base.n_demand
+
+    @property
+    def n_lanes(self):
+        return self.base.n_lanes
+
+    @property
+    def n_variables(self):
+        return self.n_periods * (self.n_lanes + self.n_demand)
+
+    @property
+    def weeks(self):
+        return np.arange(self.first_week, self.first_week + self.n_periods)
+
+    def window(self, start, stop=None, initial_inventory=None):
+        """Weeks start..stop-1 as their own model, opening with `initial_inventory`."""
+        stop = self.n_periods if stop is None else stop
+        return MultiPeriodModel(
+            self.base, self.supply[start:stop], self.demand[start:stop], self.cost[start:stop],
+            self.holding_cost, self.storage,
+            self.initial_inventory if initial_inventory is None else initial_inventory,
+            self.first_week + start,
+        )
+
+    def network(self):
+        """Time-expanded min-cost-flow arrays (n_nodes, tail, head, cost, capacity, supply).
+
+        Nodes: every (week, region), every (week, RDC), then one sink. Arcs:
+        lanes per week, inventory from each RDC to itself a week later (the
+        last week's stock ends at the sink), then unused-supply slack arcs.
+        """
+        T, S, D, K = self.n_periods, self.n_supply, self.n_demand, self.n_lanes
+        base = self.base
+        rdc0 = T * S
+        sink = rdc0 + T * D
+        week = np.repeat(np.arange(T), K)
+        lane = np.tile(np.arange(K), T)
+        week_d = np.repeat(np.arange(T), D)
+        rdc = np.tile(np.arange(D), T)
+        inv_tail = rdc0 + week_d * D + rdc
+        inv_head = np.where(week_d < T - 1, inv_tail + D, sink)
+
+        tail = np.concatenate([week * S + base.lane_supply[lane], inv_tail, np.arange(T * S)])
+        head = np.concatenate([rdc0 + week * D + base.lane_demand[lane], inv_head, np.full(T * S, sink)])
+        cost = np.concatenate([self.cost.ravel(), np.tile(self.holding_cost, T), np.zeros(T * S)])
+        capacity = np.concatenate([np.tile(base.capacity, T), np.tile(self.storage, T), np.full(T * S, np.inf)])
+        balance = -self.demand.copy()
+        balance[0] += self.initial_inventory
+        supply = np.concatenate([self.supply.ravel(), balance.ravel(), [0.0]])
+        supply[-1] = -supply[:-1].sum()
+        return sink + 1, tail, head, cost, capacity, supply
+
+    @property
+    def matrix(self):
+        """CSR rows: supply per (week, region), then inventory balance per (week, RDC)."""
+        import scipy.sparse as sp
+
+        T, S, D, K = self.n_periods, self.n_supply, self.n_demand, self.n_lanes
+        base = self.base
+        week = np.repeat(np.arange(T), K)
+        lane = np.tile(np.arange(K), T)
+        week_d = np.repeat(np.arange(T), D)
+        rdc = np.tile(np.arange(D), T)
+        x_cols = np.arange(T * K)
+        inv_cols = T * K + np.arange(T * D)
+        carried = week_d < T - 1
+        rows = np.concatenate([
+            week * S + base.lane_supply[lane],           # x counts against its region's supply
+            T * S + week * D + base.lane_demand[lane],   # ... and arrives at its RDC
+            T * S + week_d * D + rdc,                    # stock leaves this week's balance
+            T * S + (week_d[carried] + 1) * D + rdc[carried],  # ... and opens next week's
+        ])
+        cols = np.concatenate([x_cols, x_cols, inv_cols, inv_cols[carried]])
+        data = np.concatenate([np.ones(2 * T * K), -np.ones(T * D), np.ones(int(carried.sum()))])
+        return sp.csr_matrix((data, (rows, cols)), shape=(T * (S + D), self.n_variables))
+
+    @property
+    def rhs(self):
+        balance = self.demand.copy()
+        balance[0] -= self.initial_inventory
+        return np.concatenate([self.supply.ravel(), balance.ravel()])
+
+    def to_pulp(self, name="Minimize_Season_Cost"):
+        from pulp import LpConstraintEQ, LpConstraintLE
+
+        T, S, D = self.n_periods, self.n_supply, self.n_demand
+        base = self.base
+        weeks = self.weeks.tolist()
+        lanes = [f"{i}_{j}" for i, j in zip(base.lane_supply.tolist(), base.lane_demand.tolist())]
+        columns = [f"ship_w{w}_{lane}" for w in weeks for lane in lanes]
+        columns += [f"stock_w{w}_{j}" for w in weeks for j in range(D)]
+        row_names = [f"Supply_w{w}_{i}" for w in weeks for i in range(S)]
+        row_names += [f"Balance_w{w}_{j}" for w in weeks for j in range(D)]
+        return pulp_from_arrays(
+            name,
+            np.concatenate([self.cost.ravel(), np.tile(self.holding_cost, T)]),
+            np.concatenate([np.tile(base.capacity, T), np.tile(self.storage, T)]),
+            self.matrix,
+            [LpConstraintLE] * (T * S) + [LpConstraintEQ] * (T * D),
+            self.rhs, row_names, columns,
+        )
+
+
+class MultiPeriodSolution:
+    def __init__(self, model, shipments, inventory, status, supply_duals, demand_duals, solver, stats=None):
+        self.model = model
+        self.shipments = np.asarray(shipments, dtype=float)     # (weeks, lanes)
+        self.inventory = np.asarray(inventory, dtype=float)     # (weeks, RDCs), end of week
+        self.status = status
+        self.supply_duals = np.asarray(supply_duals, dtype=float)
+        self.demand_duals = np.asarray(demand_duals, dtype=float)
+        self.solver = solver
+        self.stats = stats or {}
+
+    @property
+    def transport_cost(self):
+        return float((self.shipments * self.model.cost).sum())
+
+    @property
+    def holding_cost(self):
+        return float((self.inventory * self.model.holding_cost).sum())
+
+    @property
+    def objective(self):
+        return self.transport_cost + self.holding_cost
+
+    def week(self, t):
+        """Week t (0-based within the plan) as a single-period TransportSolution for the charts."""
+        model = self.model
+        week_model = model.base.with_values(supply=model.supply[t], demand=model.demand[t], cost=model.cost[t])
+        flows = self.shipments[t]
+        return TransportSolution(
+            week_model, flows, float(flows @ model.cost[t]), self.status,
+            np.concatenate([self.supply_duals[t], self.demand_duals[t]]), self.solver,
+        )
+
+    def summary(self):
+        model = self.model
+        return pd.DataFrame({
+            WEEK: model.weeks,
+            "Shipped (tons)": self.shipments.sum(axis=1),
+            "Demand (tons)": model.demand.sum(axis=1),
+            "Transport cost": (self.shipments * model.cost).sum(axis=1),
+            "Holding cost": self.inventory @ model.holding_cost,
+            "Inventory (tons)": self.inventory.sum(axis=1),
+        })
+
+    def inventory_table(self):
+        """Long-format end-of-week stock per RDC."""
+        model = self.model
+        return pd.DataFrame({
+            WEEK: np.repeat(model.weeks, model.n_demand),
+            RDC: np.tile(np.asarray(model.base.demand_labels, dtype=object), model.n_periods),
+            "Inventory (tons)": self.inventory.ravel(),
+        })
+
+
+def _solve_network_simplex(model, **options):
+    T, S, D, K = model.n_periods, model.n_supply, model.n_demand, model.n_lanes
+    engine = NetworkSimplex(*model.network(), **options)
+    status = engine.solve()
+    flows = engine.flows
+    pi = engine.potentials - engine.potentials[-1]
+    return MultiPeriodSolution(
+        model, flows[:T * K].reshape(T, K), flows[T * K:T * (K + D)].reshape(T, D), status,
+        pi[:T * S].reshape(T, S), -pi[T * S:-1].reshape(T, D), "network_simplex",
+        {"iterations": engine.iterations},
+    )
+
+
+def _solve_cbc(model, msg=False, **options):
+    from pulp import PULP_CBC_CMD, LpStatus
+
+    T, S, D, K = model.n_periods, model.n_supply, model.n_demand, model.n_lanes
+    problem, x = model.to_pulp()
+    problem.solve(PULP_CBC_CMD(msg=msg, **options))
+    values = np.fromiter((v.varValue or 0.0 for v in x), dtype=float, count=len(x))
+    duals = np.fromiter((c.pi or 0.0 for c in problem.constraints.values()), dtype=float)
+    return MultiPeriodSolution(
+        model, values[:T * K].reshape(T, K), values[T * K:].reshape(T, D), LpStatus[problem.status],
+        duals[:T * S].reshape(T, S), duals[T * S:].reshape(T, D), "cbc",
+    )
+
+
+MULTIPERIOD_SOLVERS = {
+    "cbc": _solve_cbc,
+    "network_simplex": _solve_network_simplex,
+}
+
+
+def solve_multiperiod(model, solver="network_simplex", **options):
+    try:
+        backend = MULTIPERIOD_SOLVERS[solver]
+    except KeyError:
+        raise ValueError(f"Unknown solver {solver!r}; expected one of {sorted(MULTIPERIOD_SOLVERS)}") from None
+    start = time.perf_counter()
+    solution = backend(model, **options)
+    solution.stats.update(
+        elapsed=time.perf_counter() - start, weeks=model.n_periods, variables=model.n_variables,
+        constraints=model.n_periods * (model.n_supply + model.n_demand),
+    )
+    return solution
+
+
+def solve_rolling(model, window, step=1, solver="network_simplex", **options):
+    """Rolling-horizon plan: solve `window` weeks, keep the first `step`, move on.
+
+    Each window opens with the stock the kept weeks left behind. Its end
+    stock is not constrained, but nothing after the window needs it, so
+    it only builds up when holding it is free; later windows see the
+    latest state but the plan is myopic beyond `window` weeks. Stops at
+    the first window that isn't optimal.
+    """
+    T, D, K = model.n_periods, model.n_demand, model.n_lanes
+    shipments = np.zeros((T, K))
+    inventory = np.zeros((T, D))
+    supply_duals = np.zeros((T, model.n_supply))
+    demand_duals = np.zeros((T, D))
+    start, stock, status, solves = 0, model.initial_inventory, "Optimal", 0
+    began = time.perf_counter()
+    while start < T:
+        part = solve_multiperiod(model.window(start, min(start + window, T), stock), solver, **options)
+        solves += 1
+        if part.status != "Optimal":
+            status = part.status
+            break
+        keep = slice(start, min(start + step, T))
+        n = keep.stop - keep.start
+        shipments[keep], inventory[keep] = part.shipments[:n], part.inventory[:n]
+        supply_duals[keep], demand_duals[keep] = part.supply_duals[:n], part.demand_duals[:n]
+        stock = part.inventory[n - 1]
+        start = keep.stop
+    return MultiPeriodSolution(
+        model, shipments, inventory, status, supply_duals, demand_duals, solver,
+        {"elapsed": time.perf_counter() - began, "windows": solves, "window": window, "step": step,
+         "weeks": T, "variables": model.n_variables},
+    )
+
+
+def replan(solution, from_week, model=None, solver="network_simplex", **options):
+    """Keep weeks before `from_week` (plan-relative) and re-solve only the rest.
+
+    The remaining weeks open with the stock the kept weeks leave behind.
+    Pass an updated `model` (e.g. new demand forecasts) to re-plan against
+    it; its earlier weeks are ignored.
+    """
+    model = solution.model if model is None else model
+    stock = solution.inventory[from_week - 1] if from_week > 0 else model.initial_inventory
+    rest = solve_multiperiod(model.window(from_week, None, stock), solver, **options)
+    keep = slice(0, from_week)
+    return MultiPeriodSolution(
+        model,
+        np.concatenate([solution.shipments[keep], rest.shipments]),
+        np.concatenate([solution.inventory[keep], rest.inventory]),
+        rest.status,
+        np.concatenate([solution.supply_duals[keep], rest.supply_duals]),
+        np.concatenate([solution.demand_duals[keep], rest.demand_duals]),
+        solver,
+        dict(rest.stats, replanned_from=from_week),
+    )
+
+
+def seasonal_profile(values, n_weeks, amplitude=0.0, peak_week=0):
+    """(n_weeks, n) array: `values` scaled by 1 + amplitude * cos(2π (week - peak) / 52)."""
+    factor = 1.0 + amplitude * np.cos(2 * np.pi * (np.arange(n_weeks) - peak_week) / 52.0)
+    return np.outer(np.clip(factor, 0.0, None), np.asarray(values, dtype=float))
+
+
+def weekly_arrays(table, labels, label_column, value_column):
+    """Pivot a long Week / node / value table to a (weeks, nodes) array in `labels` order."""
+    wide = table.pivot_table(index=WEEK, columns=label_column, values=value_column, aggfunc="sum")
+    missing = [label for label in labels if label not in wide.columns]
+    if missing:
+        raise ValueError(f"No weekly {value_column} for {', '.join(map(str, missing[:5]))}")
+    return wide.index.to_numpy(), wide.reindex(columns=labels).fillna(0.0).to_numpy()
+
+
+def from_weekly_tables(base, supply, demand, **options):
+    """Build from long-format Week/Region/Supply (tons) and Week/RDC/Demand (tons) tables."""
+    supply_weeks, supply_arr = weekly_arrays(supply, base.supply_labels, REGION, SUPPLY)
+    demand_weeks, demand_arr = weekly_arrays(demand, base.demand_labels, RDC, DEMAND)
+    if not np.array_equal(supply_weeks, demand_weeks):
+        raise ValueError("Supply and demand tables cover different weeks")
+    if len(supply_weeks) and not np.array_equal(supply_weeks, np.arange(supply_weeks[0], supply_weeks[0] + len(supply_weeks))):
+        raise ValueError("Weeks must be consecutive")
+    first_week = int(supply_weeks[0]) if len(supply_weeks) else 0
+    return MultiPeriodModel(base, supply_arr, demand_arr, first_week=first_week, **options)
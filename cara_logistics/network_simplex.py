@@ -0,0 +1,296 @@
+import math
+
+import numpy as np
+
+STATE_UPPER = -1
+STATE_TREE = 0
+STATE_LOWER = 1
+
+DIR_UP = 1     # tree arc points from the node to its parent
+DIR_DOWN = -1  # tree arc points from the parent to the node
+
+
+class NetworkSimplex:
+    """Primal network simplex for min-cost flow on NumPy arc arrays.
+
+    Nodes are 0..n_nodes-1 with net supply `supply` (outflow - inflow).
+    Arcs run tail -> head with a per-unit cost and an upper capacity
+    (np.inf for uncapacitated). The spanning tree starts from artificial
+    arcs to an extra root node, which makes it strongly feasible, and
+    entering arcs are chosen by vectorised block pricing.
+
+    Potentials follow the LP dual of the conservation rows, so the reduced
+    cost of arc (i, j) is cost - pi[i] + pi[j].
+    """
+
+    def __init__(self, n_nodes, tail, head, cost, capacity, supply, block_size=None):
+        tail = np.asarray(tail, dtype=np.int64)
+        head = np.asarray(head, dtype=np.int64)
+        cost = np.asarray(cost, dtype=float)
+        capacity = np.broadcast_to(np.asarray(capacity, dtype=float), cost.shape)
+        supply = np.asarray(supply, dtype=float)
+
+        self.n_nodes = n_nodes
+        self.n_arcs = len(cost)
+        self.root = n_nodes
+        nodes = np.arange(n_nodes)
+
+        self.max_cost = float(np.abs(cost).max()) if self.n_arcs else 0.0
+        self.art_cost = (self.max_cost + 1.0) * (n_nodes + 1)
+        self.eps = 1e-9 * max(1.0, self.max_cost)
+        self.flow_eps = 1e-9 * max(1.0, float(np.abs(supply).sum()))
+
+        # artificial arc n_arcs + i joins node i and the root
+        out = supply >= 0
+        self.tail = np.concatenate([tail, np.where(out, nodes, self.root)])
+        self.head = np.concatenate([head, np.where(out, self.root, nodes)])
+        self.cost = np.concatenate([cost, np.where(out, 0.0, self.art_cost)])
+        self.cap = np.concatenate([capacity, np.full(n_nodes, np.inf)]).tolist()
+        self.flow = [0.0] * self.n_arcs + np.abs(supply).tolist()
+        self.state = np.concatenate([
+            np.full(self.n_arcs, STATE_LOWER, dtype=np.int8),
+            np.full(n_nodes, STATE_TREE, dtype=np.int8),
+        ])
+
+        self.pi = np.append(np.where(out, 0.0, -self.art_cost), 0.0)
+        self.parent = [self.root] * n_nodes + [-1]
+        self.pred = list(range(self.n_arcs, self.n_arcs + n_nodes)) + [-1]
+        self.pred_dir = np.where(out, DIR_UP, DIR_DOWN).tolist() + [0]
+        self.mark = [0] * (n_nodes + 1)
+        self.stamp = 0
+        self.children = [set() for _ in range(n_nodes)] + [set(range(n_nodes))]
+
+        total = self.n_arcs + n_nodes
+        self.block_size = block_size or max(16 * int(math.sqrt(total)), 1024)
+        self.next_arc = 0
+        self.iterations = 0
+        self.status = "Not Solved"
+
+    def solve(self, max_iterations=None):
+        """Pivot from the current basis to optimality; returns the status."""
+        self.iterations = 0
+        while max_iterations is None or self.iterations < max_iterations:
+            entering = self._find_entering()
+            if entering < 0:
+                break
+            self.iterations += 1
+            if not self._pivot(entering):
+                self.status = "Unbounded"
+                return self.status
+        else:
+            self.status = "Not Solved"
+            return self.status
+
+        artificial = np.asarray(self.flow[self.n_arcs:])
+        self.status = "Infeasible" if (artificial > self.flow_eps).any() else "Optimal"
+        return self.status
+
+    def set_costs(self, arcs, costs):
+        """Change arc costs in place, keeping the current (still feasible) basis.
+
+        A new cost beyond the range the artificial arcs were priced for
+        raises their big-M cost to match, so the basis stays usable.
+        Returns False only for non-finite costs; the caller should then
+        start from scratch.
+        """
+        costs = np.asarray(costs, dtype=float)
+        if len(costs) and not np.isfinite(costs).all():
+            return False
+        self.cost[arcs] = costs
+        if len(costs) and np.abs(costs).max() > self.max_cost:
+            self.max_cost = float(np.abs(costs).max())
+            art_cost = (self.max_cost + 1.0) * (self.n_nodes + 1)
+            artificial = self.cost[self.n_arcs:]
+            artificial[artificial == self.art_cost] = art_cost
+            self.art_cost = art_cost
+            self.eps = 1e-9 * max(1.0, self.max_cost)
+        self._recompute_potentials()
+        return True
+
+    def set_supply(self, supply):
+        """Change node supplies, re-deriving tree flows from the current basis.
+
+        A tree arc whose new flow would fall outside its bounds is swapped
+        for its node's artificial arc (priced at the big-M cost), so the
+        next solve() pivots the artificial flow back out instead of
+        starting over.
+        """
+        parent, pred, pred_dir, cap, children = (
+            self.parent, self.pred, self.pred_dir, self.cap, self.children,
+        )
+        flow = np.asarray(self.flow)
+        fixed = self.state != STATE_TREE
+        size = self.n_nodes + 1
+        excess = np.append(np.asarray(supply, dtype=float), 0.0)
+        excess -= np.bincount(self.tail[fixed], weights=flow[fixed], minlength=size)
+        excess += np.bincount(self.head[fixed], weights=flow[fixed], minlength=size)
+        excess = excess.tolist()
+
+        for u in reversed(self._tree_order()[1:]):
+            e = pred[u]
+            f = excess[u] if pred_dir[u] == DIR_UP else -excess[u]
+            if -self.flow_eps <= f <= cap[e] + self.flow_eps:
+                self.flow[e] = min(max(f, 0.0), cap[e])
+                excess[parent[u]] += excess[u]
+                continue
+
+            artificial = self.n_arcs + u
+            if e != artificial:
+                self.state[e] = STATE_LOWER
+                self.flow[e] = 0.0
+                children[parent[u]].discard(u)
+                children[self.root].add(u)
+                parent[u] = self.root
+                pred[u] = artificial
+                self.state[artificial] = STATE_TREE
+            out = excess[u] >= 0
+            self.tail[artificial], self.head[artificial] = (u, self.root) if out else (self.root, u)
+            self.cost[artificial] = self.art_cost
+            self.flow[artificial] = abs(excess[u])
+            pred_dir[u] = DIR_UP if out else DIR_DOWN
+
+        self._recompute_potentials()
+
+    @property
+    def flows(self):
+        return np.asarray(self.flow[:self.n_arcs])
+
+    @property
+    def potentials(self):
+        return self.pi[:self.n_nodes] - self.pi[self.root]
+
+    def reduced_costs(self, arcs=slice(None)):
+        return self.cost[arcs] - self.pi[self.tail[arcs]] + self.pi[self.head[arcs]]
+
+    def _tree_order(self):
+        order = [self.root]
+        for u in order:
+            order.extend(self.children[u])
+        return order
+
+    def _recompute_potentials(self):
+        parent, pred, pred_dir, cost = self.parent, self.pred, self.pred_dir, self.cost
+        pi = [0.0] * (self.n_nodes + 1)
+        for u in self._tree_order()[1:]:
+            e = pred[u]
+            if pred_dir[u] == DIR_UP:
+                pi[u] = pi[parent[u]] + cost[e]
+            else:
+                pi[u] = pi[parent[u]] - cost[e]
+        self.pi = np.asarray(pi)
+
+    def _find_entering(self):
+        total = len(self.cost)
+        start = self.next_arc
+        checked = 0
+        while checked < total:
+            stop = min(start + self.block_size, total)
+            block = slice(start, stop)
+            violation = self.state[block] * self.reduced_costs(block)
+            k = int(violation.argmin())
+            checked += stop - start
+            self.next_arc = stop if stop < total else 0
+            if violation[k] < -self.eps:
+                return start + k
+            start = self.next_arc
+        return -1
+
+    def _pivot(self, entering):
+        parent, pred, pred_dir = self.parent, self.pred, self.pred_dir
+        flow, cap = self.flow, self.cap
+        tail, head = int(self.tail[entering]), int(self.head[entering])
+
+        if self.state[entering] == STATE_LOWER:
+            first, second = tail, head
+        else:
+            first, second = head, tail
+
+        # join node: first ancestor of `second` that is also an ancestor of `first`
+        self.stamp += 1
+        stamp, mark = self.stamp, self.mark
+        u = first
+        while u >= 0:
+            mark[u] = stamp
+            u = parent[u]
+        join = second
+        while mark[join] != stamp:
+            join = parent[join]
+
+        # flow runs first -> second over the entering arc and back up the tree
+        delta = cap[entering]
+        result = 0
+        u_out = -1
+        u = first
+        while u != join:
+            e = pred[u]
+            d = cap[e] - flow[e] if pred_dir[u] == DIR_DOWN else flow[e]
+            if d < delta:
+                delta, u_out, result = d, u, 1
+            u = parent[u]
+        u = second
+        while u != join:
+            e = pred[u]
+            d = cap[e] - flow[e] if pred_dir[u] == DIR_UP else flow[e]
+            if d <= delta:
+                delta, u_out, result = d, u, 2
+            u = parent[u]
+
+        if delta == math.inf:
+            return False
+
+        if delta > 0:
+            flow[entering] += int(self.state[entering]) * delta
+            u = first
+            while u != join:
+                flow[pred[u]] -= pred_dir[u] * delta
+                u = parent[u]
+            u = second
+            while u != join:
+                flow[pred[u]] += pred_dir[u] * delta
+                u = parent[u]
+
+        if result == 0:
+            self.state[entering] = -self.state[entering]
+            return True
+
+        leaving = pred[u_out]
+        at_upper = pred_dir[u_out] == (DIR_DOWN if result == 1 else DIR_UP)
+        flow[leaving] = cap[leaving] if at_upper else 0.0
+        self.state[leaving] = STATE_UPPER if at_upper else STATE_LOWER
+        self.state[entering] = STATE_TREE
+
+        u_in, v_in = (first, second) if result == 1 else (second, first)
+        self._reroot(u_in, v_in, u_out, entering)
+        return True
+
+    def _reroot(self, u_in, v_in, u_out, entering):
+        parent, pred, pred_dir, children = self.parent, self.pred, self.pred_dir, self.children
+
+        path = [u_in]
+        while path[-1] != u_out:
+            path.append(parent[path[-1]])
+        children[parent[u_out]].discard(u_out)
+        for k in range(len(path) - 1, 0, -1):
+            w, child = path[k], path[k - 1]
+            children[w].discard(child)
+            parent[w] = child
+            pred[w] = pred[child]
+            pred_dir[w] = -pred_dir[child]
+            children[child].add(w)
+
+        parent[u_in] = v_in
+        pred[u_in] = entering
+        pred_dir[u_in] = DIR_UP if int(self.tail[entering]) == u_in else DIR_DOWN
+        children[v_in].add(u_in)
+
+        # shift the moved subtree so the entering arc has zero reduced cost
+        pi = self.pi
+        if pred_dir[u_in] == DIR_UP:
+            sigma = self.cost[entering] + pi[v_in] - pi[u_in]
+        else:
+            sigma = pi[v_in] - self.cost[entering] - pi[u_in]
+
+        nodes = [u_in]
+        for w in nodes:
+            nodes.extend(children[w])
+        pi[nodes] += sigma
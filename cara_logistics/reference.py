@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .scenarios import COST, DEMAND, RDC, REGION, SUPPLY, _require, read_table
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+NAME = "Name"
+KIND = "Kind"
+LATITUDE = "Latitude"
+LONGITUDE = "Longitude"
+KINDS = ("region", "rdc")
+
+
+class ReferenceData:
+    """Static locations and the default scenario, built once and shared read-only.
+
+    `locations` has one row per site (Name, Kind "region" or "rdc",
+    Latitude, Longitude, Tons = default supply or demand); `lanes` is a
+    long-format Region/RDC/cost table with the default costs.
+    """
+
+    def __init__(self, locations, lanes):
+        _require(locations, [NAME, KIND, LATITUDE, LONGITUDE, "Tons"], "Locations")
+        _require(lanes, [REGION, RDC, COST], "Lanes")
+        locations = locations.reset_index(drop=True)
+        if locations[NAME].duplicated().any():
+            dupes = locations.loc[locations[NAME].duplicated(), NAME]
+            raise ValueError(f"Duplicate location name(s): {', '.join(dupes)}")
+        unknown = sorted(set(locations[KIND]) - set(KINDS))
+        if unknown:
+            raise ValueError(f"Unknown location kind(s) {unknown}; expected one of {KINDS}")
+
+        self.locations = locations
+        self.index = {name: i for i, name in enumerate(locations[NAME])}
+        self.coords = locations[[LATITUDE, LONGITUDE]].to_numpy(dtype=float)
+
+        is_region = (locations[KIND] == "region").to_numpy()
+        self.regions = locations.loc[is_region, NAME].tolist()
+        self.rdcs = locations.loc[~is_region, NAME].tolist()
+        self.default_supply = pd.DataFrame({REGION: self.regions, SUPPLY: locations.loc[is_region, "Tons"].to_numpy()})
+        self.default_demand = pd.DataFrame({RDC: self.rdcs, DEMAND: locations.loc[~is_region, "Tons"].to_numpy()})
+        costs = lanes.pivot_table(index=REGION, columns=RDC, values=COST, aggfunc="first")
+        self.default_costs = costs.reindex(index=self.regions, columns=self.rdcs).rename_axis(index=None, columns=None)
+
+    def coordinates(self, names):
+        """(n, 2) lat/lon array for `names`; rows for unknown names are NaN."""
+        idx = np.fromiter((self.index.get(name, -1) for name in names), dtype=np.int64, count=len(names))
+        coords = self.coords[idx]
+        coords[idx < 0] = np.nan
+        return coords
+
+
+def load_reference(path=None):
+    """Read locations.csv and lanes.csv (or .parquet) from `path`, default the bundled data."""
+    path = path or DATA_DIR
+    tables = []
+    for stem in ("locations", "lanes"):
+        for ext in (".csv", ".parquet"):
+            if os.path.exists(os.path.join(path, stem + ext)):
+                tables.append(read_table(os.path.join(path, stem + ext)))
+                break
+        else:
+            raise ValueError(f"No {stem}.csv or {stem}.parquet in {path}")
+    return ReferenceData(*tables)
@@ -0,0 +1,335 @@
+import hashlib
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .distances import BLOCK_CELLS, LATITUDE, LONGITUDE, pair_haversine_miles
+from .scenarios import read_table
+
+NODE = "Node"
+FROM = "From"
+TO = "To"
+MILES = "Miles"
+MINUTES = "Minutes"
+SPEED = "Speed (mph)"
+ONEWAY = "Oneway"
+WEIGHTS = ("miles", "minutes")
+DEFAULT_MPH = 45.0  # edges with neither a time nor a speed
+ACCESS_MPH = 20.0  # off-network leg from a point to its nearest graph node
+METERS_PER_MILE = 1609.344
+PARALLEL_MIN_SOURCES = 64  # fewer origins than this run in-process; a pool costs more than it saves
+
+# scipy.sparse.csgraph and scipy.spatial are loaded on first use.
+# Dijkstra workers receive the graph once, through the pool initializer,
+# and write their rows straight into the memory-mapped output table
+_graph = None
+
+
+def _init_worker(graph):
+    global _graph
+    _graph = graph
+
+
+def _dijkstra_rows(path, start, sources, targets, directed, graph=None):
+    from scipy.sparse.csgraph import dijkstra
+
+    graph = _graph if graph is None else graph
+    table = np.load(path, mmap_mode="r+")
+    # dijkstra returns full (rows, n_nodes) arrays; bound them like the haversine blocks
+    step = max(1, BLOCK_CELLS // max(1, graph.shape[0]))
+    for a in range(0, len(sources), step):
+        rows = dijkstra(graph, directed=directed, indices=sources[a:a + step])
+        table[start + a:start + a + len(rows)] = rows[:, targets]
+    table.flush()
+    return len(sources)
+
+
+class RoadGraph:
+    """Offline road network: nodes with coordinates, edges with miles and minutes.
+
+    Points are snapped to their nearest graph node and the straight-line
+    snap legs are added to the shortest path between the nodes (at
+    ACCESS_MPH for travel times). Edges are two-way unless `directed`;
+    edges without times are driven at DEFAULT_MPH. Parallel edges keep
+    the shortest one for each weight.
+    """
+
+    def __init__(self, node_ids, coords, tail, head, miles, minutes=None, directed=False):
+        self.node_ids = np.asarray(node_ids)
+        self.coords = np.asarray(coords, dtype=float)
+        self.tail = np.asarray(tail, dtype=np.int64)
+        self.head = np.asarray(head, dtype=np.int64)
+        self.miles = np.asarray(miles, dtype=float)
+        self.minutes = self.miles * (60.0 / DEFAULT_MPH) if minutes is None else np.asarray(minutes, dtype=float)
+        self.directed = directed
+        self._graphs = {}
+        self._tree = None
+        self._fingerprint = None
+
+    @classmethod
+    def from_files(cls, nodes_path, edges_path, directed=False):
+        """Nodes: Node, Latitude, Longitude. Edges: From, To, Miles (CSV or Parquet).
+
+        Edges may add Minutes or Speed (mph) for travel times, and a
+        boolean Oneway column, which makes the graph directed with the
+        other edges added in both directions.
+        """
+        nodes = read_table(nodes_path)
+        edges = read_table(edges_path)
+        for table, columns, name in ((nodes, [NODE, LATITUDE, LONGITUDE], nodes_path), (edges, [FROM, TO, MILES], edges_path)):
+            missing = [c for c in columns if c not in table.columns]
+            if missing:
+                raise ValueError(f"{name} is missing column(s): {', '.join(missing)}")
+        index = pd.Index(nodes[NODE])
+        if not index.is_unique:
+            raise ValueError(f"{nodes_path} has duplicate node ids")
+        tail, head = index.get_indexer(edges[FROM]), index.get_indexer(edges[TO])
+        unknown = (tail < 0) | (head < 0)
+        if unknown.any():
+            raise ValueError(f"{edges_path}: {int(unknown.sum())} edge(s) reference unknown nodes")
+        miles = edges[MILES].to_numpy(dtype=float)
+        if MINUTES in edges.columns:
+            minutes = edges[MINUTES].to_numpy(dtype=float)
+        elif SPEED in edges.columns:
+            minutes = miles / edges[SPEED].to_numpy(dtype=float) * 60.0
+        else:
+            minutes = None
+        for values, label in ((miles, "lengths"), (minutes, "times")):
+            if values is not None and (np.isnan(values).any() or (values < 0).any()):
+                raise ValueError(f"{edges_path}: edge {label} must be non-negative numbers")
+        if ONEWAY in edges.columns:
+            two_way = ~edges[ONEWAY].fillna(False).astype(bool).to_numpy()
+            tail, head = np.r_[tail, head[two_way]], np.r_[head, tail[two_way]]
+            miles = np.r_[miles, miles[two_way]]
+            minutes = None if minutes is None else np.r_[minutes, minutes[two_way]]
+            directed = True
+        return cls(index.to_numpy(), nodes[[LATITUDE, LONGITUDE]].to_numpy(dtype=float), tail, head, miles, minutes, directed)
+
+    @classmethod
+    def from_dir(cls, path, directed=False):
+        """nodes.csv/.parquet and edges.csv/.parquet in `path`."""
+        files = []
+        for stem in ("nodes", "edges"):
+            found = [os.path.join(path, stem + ext) for ext in (".csv", ".parquet")
+                     if os.path.exists(os.path.join(path, stem + ext))]
+            if not found:
+                raise ValueError(f"No {stem}.csv or {stem}.parquet in {path}")
+            files.append(found[0])
+        return cls.from_files(*files, directed=directed)
+
+    @classmethod
+    def from_graphml(cls, path):
+        """Road graph saved as GraphML by OSMnx (or any tool using its attribute names).
+
+        Nodes need y (latitude) and x (longitude); edges need length in
+        meters and may have travel_time in seconds or speed_kph. The
+        graph's edgedefault decides whether edges are one-way.
+        """
+        keys, node_ids, coords, edges = {}, [], [], []
+        directed = True
+        for _, element in ET.iterparse(path):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "key":
+                keys[element.get("id")] = element.get("attr.name")
+            elif tag == "node":
+                data = _graphml_data(element, keys)
+                try:
+                    coords.append((float(data["y"]), float(data["x"])))
+                except KeyError:
+                    raise ValueError(f"{path}: node {element.get('id')} has no x/y coordinates") from None
+                node_ids.append(element.get("id"))
+                element.clear()
+            elif tag == "edge":
+                data = _graphml_data(element, keys)
+                if "length" not in data:
+                    raise ValueError(f"{path}: edge {element.get('source')}->{element.get('target')} has no length")
+                meters = float(data["length"])
+                if "travel_time" in data:
+                    minutes = float(data["travel_time"]) / 60.0
+                elif "speed_kph" in data:
+                    minutes = meters / 1000.0 / float(data["speed_kph"]) * 60.0
+                else:
+                    minutes = np.nan
+                edges.append((element.get("source"), element.get("target"), meters / METERS_PER_MILE, minutes))
+                element.clear()
+            elif tag == "graph":
+                directed = element.get("edgedefault", "directed") == "directed"
+        if not node_ids:
+            raise ValueError(f"{path} has no nodes")
+        index = pd.Index(node_ids)
+        source, target, miles, minutes = (np.asarray(column) for column in zip(*edges)) if edges else ([],) * 4
+        tail, head = index.get_indexer(source), index.get_indexer(target)
+        if (tail < 0).any() or (head < 0).any():
+            raise ValueError(f"{path}: edges reference unknown nodes")
+        miles = np.asarray(miles, dtype=float)
+        minutes = np.asarray(minutes, dtype=float)
+        minutes = np.where(np.isnan(minutes), miles * (60.0 / DEFAULT_MPH), minutes)
+        return cls(index.to_numpy(), np.asarray(coords, dtype=float).reshape(-1, 2), tail, head, miles, minutes, directed)
+
+    @property
+    def n_nodes(self):
+        return len(self.coords)
+
+    def fingerprint(self):
+        # hashed once: the arrays are treated as read-only after construction
+        if self._fingerprint is None:
+            h = hashlib.sha256()
+            for array in (self.coords, self.tail, self.head, self.miles, self.minutes):
+                h.update(np.ascontiguousarray(array).tobytes())
+            h.update(b"directed" if self.directed else b"undirected")
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def graph(self, weight="miles"):
+        """CSR adjacency for `weight`; the shortest of any parallel edges wins."""
+        if weight not in WEIGHTS:
+            raise ValueError(f"Unknown weight {weight!r}; expected one of {WEIGHTS}")
+        if weight not in self._graphs:
+            import scipy.sparse as sp
+
+            values = self.miles if weight == "miles" else self.minutes
+            # csr_matrix sums duplicate entries, so keep only the cheapest per node pair
+            order = np.lexsort((values, self.head, self.tail))
+            tail, head = self.tail[order], self.head[order]
+            first = np.r_[True, (tail[1:] != tail[:-1]) | (head[1:] != head[:-1])]
+            self._graphs[weight] = sp.csr_matrix(
+                (values[order][first], (tail[first], head[first])), shape=(self.n_nodes, self.n_nodes),
+            )
+        return self._graphs[weight]
+
+    def snap(self, points):
+        """(nearest node index, straight-line miles to it) for each lat/lon point."""
+        from scipy.spatial import cKDTree
+
+        if self._tree is None:
+            self._tree = cKDTree(_unit_vectors(self.coords))
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        _, nodes = self._tree.query(_unit_vectors(points))
+        return nodes, pair_haversine_miles(points, self.coords[nodes])
+
+    def shortest_paths(self, sources, targets, weight="miles", workers=None, out=None):
+        """(len(sources), len(targets)) shortest-path table between graph node indices.
+
+        Rows are split across `workers` processes (default: one per CPU
+        from PARALLEL_MIN_SOURCES sources up), each running Dijkstra from
+        its sources and writing into a memory-mapped .npy: `out` if given,
+        which is returned open read-only, else a scratch file read back
+        into memory. Unreachable pairs are inf.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        graph = self.graph(weight)
+        if workers is None:
+            workers = os.cpu_count() if len(sources) >= PARALLEL_MIN_SOURCES else 1
+        workers = max(1, min(workers, len(sources)))
+        scratch = None
+        if out is None:
+            fd, scratch = tempfile.mkstemp(suffix=".npy", prefix="cara-paths-")
+            os.close(fd)
+        path = out or scratch
+        np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(len(sources), len(targets))).flush()
+        try:
+            if workers == 1:
+                _dijkstra_rows(path, 0, sources, targets, self.directed, graph=graph)
+            else:
+                bounds = np.linspace(0, len(sources), workers * 4 + 1, dtype=np.int64)
+                chunks = [(a, b) for a, b in zip(bounds[:-1].tolist(), bounds[1:].tolist()) if b > a]
+                with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(graph,)) as pool:
+                    list(pool.map(
+                        _dijkstra_rows, [path] * len(chunks), [a for a, _ in chunks],
+                        [sources[a:b] for a, b in chunks], [targets] * len(chunks), [self.directed] * len(chunks),
+                    ))
+            return np.load(path, mmap_mode="r") if scratch is None else np.load(path)
+        finally:
+            if scratch is not None:
+                os.remove(scratch)
+
+    def distances(self, origins, destinations, weight="miles", workers=None, tables=None):
+        """(n, m) road miles (or minutes) between lat/lon points; inf where no path exists.
+
+        With `tables` (a DistanceTables), the node-to-node table comes from
+        or goes to its memory-mapped store.
+        """
+        origin_nodes, origin_snap = self.snap(origins)
+        dest_nodes, dest_snap = self.snap(destinations)
+        sources, rows = np.unique(origin_nodes, return_inverse=True)
+        targets, cols = np.unique(dest_nodes, return_inverse=True)
+        if tables is not None:
+            paths = tables.table(self, sources, targets, weight, workers)
+        else:
+            paths = self.shortest_paths(sources, targets, weight, workers)
+        if weight == "minutes":
+            origin_snap, dest_snap = origin_snap * (60.0 / ACCESS_MPH), dest_snap * (60.0 / ACCESS_MPH)
+        return paths[rows][:, cols] + origin_snap[:, None] + dest_snap[None, :]
+
+
+def _graphml_data(element, keys):
+    return {keys.get(d.get("key"), d.get("key")): d.text for d in element if d.tag.rsplit("}", 1)[-1] == "data"}
+
+
+def _unit_vectors(coords):
+    lat, lon = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def load_road_graph(path):
+    """RoadGraph from a .graphml file or a folder with nodes / edges tables."""
+    if os.path.isdir(path):
+        return RoadGraph.from_dir(path)
+    if path.lower().endswith(".graphml"):
+        return RoadGraph.from_graphml(path)
+    raise ValueError(f"{path} is neither a folder with nodes/edges tables nor a .graphml file")
+
+
+class DistanceTables:
+    """Directory of memory-mapped node x node shortest-path tables.
+
+    A table is keyed on the graph fingerprint, the weight and the sorted
+    source and target node sets, so any later build whose points snap to
+    the same nodes opens it instead of running Dijkstra again. Tables are
+    built into a scratch file and renamed into place, and opened with
+    mmap so only the rows a build reads are paged in.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    def table(self, graph, sources, targets, weight="miles", workers=None):
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        h = hashlib.sha256(graph.fingerprint().encode())
+        h.update(weight.encode())
+        for nodes in (sources, targets):
+            h.update(str(len(nodes)).encode())
+            h.update(nodes.tobytes())
+        path = os.path.join(self.path, f"{h.hexdigest()}.npy")
+        try:
+            table = np.load(path, mmap_mode="r")
+            if table.shape == (len(sources), len(targets)):
+                self.hits += 1
+                return table
+        except (OSError, ValueError):
+            pass
+        self.misses += 1
+        # unique per build: threads of one process may build the same table at once
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(fd)
+        try:
+            graph.shortest_paths(sources, targets, weight, workers, out=tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return np.load(path, mmap_mode="r")
+
+    def stats(self):
+        files = [f for f in os.listdir(self.path) if f.endswith(".npy")]
+        size = sum(os.path.getsize(os.path.join(self.path, f)) for f in files)
+        return {"hits": self.hits, "misses": self.misses, "tables": len(files), "bytes": size, "path": self.path}
@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+
+SCENARIO = "Scenario"
+REGION = "Region"
+RDC = "RDC"
+SUPPLY = "Supply (tons)"
+DEMAND = "Demand (tons)"
+COST = "Cost (USD per ton)"
+CAPACITY = "Capacity (tons)"
+MIN_LOAD = "Minimum load (tons)"
+TONS = "Tons"
+
+DEFAULT_SCENARIO = "default"
+
+
+def read_table(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return pd.read_csv(path)
+    if ext in (".parquet", ".pq"):
+        return pd.read_parquet(path)
+    raise ValueError(f"Unsupported file type {ext!r} for {path}; expected .csv or .parquet")
+
+
+def write_table(df, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        df.to_csv(path, index=False)
+    elif ext in (".parquet", ".pq"):
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Unsupported file type {ext!r} for {path}; expected .csv or .parquet")
+
+
+def _require(df, columns, name):
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"{name} table is missing column(s): {', '.join(missing)}")
+
+
+def iter_scenarios(supply, demand, costs):
+    """Split long-format tables into (scenario, supply, demand, lanes) tuples.
+
+    supply:  Scenario, Region, Supply (tons)
+    demand:  Scenario, RDC, Demand (tons)
+    costs:   Scenario, Region, RDC, Cost (USD per ton)[, Capacity (tons)][, Minimum load (tons)]
+
+    The Scenario column is optional; without it each table is one scenario.
+    Lanes stay long-format (only the listed pairs are serviceable), ready
+    for build_from_lanes.
+    """
+    _require(supply, [REGION, SUPPLY], "Supply")
+    _require(demand, [RDC, DEMAND], "Demand")
+    _require(costs, [REGION, RDC, COST], "Cost")
+    tables = []
+    for df in (supply, demand, costs):
+        if SCENARIO not in df.columns:
+            df = df.assign(**{SCENARIO: DEFAULT_SCENARIO})
+        tables.append(df)
+    supply, demand, costs = tables
+
+    demand_groups = dict(tuple(demand.groupby(SCENARIO, sort=False)))
+    cost_groups = dict(tuple(costs.groupby(SCENARIO, sort=False)))
+    for scenario, s in supply.groupby(SCENARIO, sort=False):
+        if scenario not in demand_groups or scenario not in cost_groups:
+            raise ValueError(f"Scenario {scenario!r} has no demand or cost rows")
+        d = demand_groups[scenario]
+        c = cost_groups[scenario].drop(columns=SCENARIO)
+        yield (
+            scenario,
+            pd.Series(s[SUPPLY].to_numpy(dtype=float), index=s[REGION].to_numpy()),
+            pd.Series(d[DEMAND].to_numpy(dtype=float), index=d[RDC].to_numpy()),
+            c,
+        )
@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+
+from .model import to_pulp
+from .network_simplex import NetworkSimplex
+from .solvers import network_solution, pulp_solution, solve, transport_network
+
+
+def same_structure(a, b):
+    return (
+        a.supply_labels == b.supply_labels
+        and a.demand_labels == b.demand_labels
+        and np.array_equal(a.lane_supply, b.lane_supply)
+        and np.array_equal(a.lane_demand, b.lane_demand)
+        and np.array_equal(a.capacity, b.capacity)
+        and np.array_equal(a.min_load, b.min_load)
+    )
+
+
+class SolverSession:
+    """Long-lived solver state for one user, so single-cell edits re-solve incrementally.
+
+    The network simplex engine keeps its spanning-tree basis between solves:
+    cost edits keep the old basis primal feasible, and supply/demand edits
+    re-derive the tree flows, patching any out-of-bounds arc with an
+    artificial one that the next pivots drive back out. The CBC
+    backend keeps the PuLP problem and patches only the changed objective
+    coefficients and right-hand sides, but CBC itself restarts each time.
+
+    Every solution carries `stats` with the wall time, the start mode
+    ("cold", "warm" or "updated") and how many coefficients changed.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.model = None
+        self.solver = None
+        self._engine = None
+        self._problem = None
+        self._variables = None
+
+    def solve(self, model, solver="network_simplex"):
+        start = time.perf_counter()
+        prev = self.model
+        if prev is None or solver != self.solver or not same_structure(prev, model):
+            cost_idx = rhs_idx = None
+        else:
+            cost_idx = np.flatnonzero(prev.cost != model.cost)
+            rhs_idx = np.flatnonzero(prev.rhs != model.rhs)
+
+        if solver == "network_simplex":
+            solution, mode = self._solve_network_simplex(model, cost_idx, rhs_idx)
+        elif solver == "cbc":
+            solution, mode = self._solve_cbc(model, cost_idx, rhs_idx)
+        else:
+            solution, mode = solve(model, solver), "cold"
+
+        self.model = model
+        self.solver = solver
+        solution.stats.update(
+            mode=mode,
+            elapsed=time.perf_counter() - start,
+            changed_costs=None if cost_idx is None else len(cost_idx),
+            changed_rhs=None if rhs_idx is None else len(rhs_idx),
+        )
+        return solution
+
+    def _solve_network_simplex(self, model, cost_idx, rhs_idx):
+        network = transport_network(model)
+        supply = network[-1]
+        engine = self._engine
+        # lanes come first in the transport network, so lane k is arc k
+        warm = cost_idx is not None and engine.set_costs(cost_idx, model.cost[cost_idx])
+        if not warm:
+            engine = self._engine = NetworkSimplex(*network)
+        elif len(rhs_idx):
+            engine.set_supply(supply)
+        engine.solve()
+        return network_solution(model, engine), "warm" if warm else "cold"
+
+    def _solve_cbc(self, model, cost_idx, rhs_idx):
+        # minimum-load rows use the origin's supply as big-M, so rebuild on supply changes
+        if cost_idx is None or (model.has_min_loads and len(rhs_idx)):
+            self._problem, self._variables = to_pulp(model)
+            mode = "cold"
+        else:
+            objective, x = self._problem.objective, self._variables
+            for k in cost_idx.tolist():
+                objective[x[k]] = float(model.cost[k])
+            constraints = list(self._problem.constraints.values())
+            for r in rhs_idx.tolist():
+                constraints[r].constant = -float(model.rhs[r])
+            mode = "updated"
+        return pulp_solution(model, self._problem, self._variables), mode
@@ -0,0 +1,282 @@
+import itertools
+import os
+import re
+import tempfile
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .model import build_transport_model, to_pulp
+from .network_simplex import NetworkSimplex
+
+
+class TransportSolution:
+    """Solver-independent result: lane flows plus one dual per model row."""
+
+    def __init__(self, model, flows, objective, status, duals, solver, iterations=None, stats=None):
+        self.model = model
+        self.flows = np.asarray(flows, dtype=float)
+        self.objective = objective
+        self.status = status
+        self.duals = np.asarray(duals, dtype=float)
+        self.solver = solver
+        self.iterations = iterations
+        self.stats = stats or {}
+
+    @cached_property
+    def shipments(self):
+        """Dense supply x demand matrix of tons."""
+        model = self.model
+        matrix = np.zeros((model.n_supply, model.n_demand))
+        matrix[model.lane_supply, model.lane_demand] = self.flows
+        return matrix
+
+    @cached_property
+    def nonzero(self):
+        """Indices of the lanes that carry flow."""
+        return np.flatnonzero(self.flows > 0)
+
+    @cached_property
+    def flow_table(self):
+        """Nonzero lanes as a frame, with the node indices kept for chart builders."""
+        model, nz = self.model, self.nonzero
+        origin = model.lane_supply[nz]
+        destination = model.lane_demand[nz]
+        tons = self.flows[nz]
+        cost = model.cost[nz]
+        return pd.DataFrame({
+            "From": np.asarray(model.supply_labels, dtype=object)[origin],
+            "To": np.asarray(model.demand_labels, dtype=object)[destination],
+            "Tons": tons,
+            "Cost per Ton": cost,
+            "Total Cost": tons * cost,
+            "from_idx": origin,
+            "to_idx": destination,
+        })
+
+    @property
+    def supply_duals(self):
+        return self.duals[:self.model.n_supply]
+
+    @property
+    def demand_duals(self):
+        return self.duals[self.model.n_supply:]
+
+    def shadow_prices(self, tol=0.0001):
+        return {
+            name: round(float(pi), 2)
+            for name, pi in zip(self.model.row_names, self.duals)
+            if abs(pi) > tol
+        }
+
+
+def solve_cbc(model, msg=False, **options):
+    problem, x = to_pulp(model)
+    return pulp_solution(model, problem, x, msg=msg, **options)
+
+
+CBC_LOG_PATTERNS = {
+    "iterations": [r"Total iterations:\s+(\d+)", r"objective \S+ - (\d+) iterations"],
+    "nodes": [r"Enumerated nodes:\s+(\d+)"],
+}
+
+
+def cbc_log_stats(text):
+    """Iteration and branch-and-bound node counts from a CBC log (None if absent)."""
+    stats = {}
+    for key, patterns in CBC_LOG_PATTERNS.items():
+        stats[key] = None
+        for pattern in patterns:
+            match = re.search(pattern, text)
+            if match:
+                stats[key] = int(match.group(1))
+                break
+    return stats
+
+
+CBC_PROGRESS_PATTERNS = {
+    "incumbent": [r"Integer solution of (\S+)", r"(\S+) best solution", r"best objective (\S+)"],
+    "bound": [r"best possible ([-+\d.e]+)"],
+    "nodes": [r"After (\d+) nodes", r"and (\d+) nodes"],
+    "lp_objective": [r"^\s*\d+\s+Obj\s+(\S+)", r"Optimal - objective value (\S+)"],
+}
+
+
+def cbc_progress(text):
+    """Latest incumbent, best bound, relative gap and node count from a (partial) CBC log."""
+    progress = {}
+    for key, patterns in CBC_PROGRESS_PATTERNS.items():
+        # the pattern matching furthest into the log holds the newest value
+        found = [m for pattern in patterns for m in re.finditer(pattern, text, re.MULTILINE)]
+        if found:
+            value = max(found, key=lambda m: m.start()).group(1)
+            progress[key] = int(value) if key == "nodes" else float(value)
+    if "incumbent" in progress and "bound" in progress:
+        incumbent = progress["incumbent"]
+        progress["gap"] = abs(incumbent - progress["bound"]) / max(1.0, abs(incumbent))
+    return progress
+
+
+CBC_RESULT_PATTERNS = {
+    "result": r"^Result - (.+?)\s*$",
+    "incumbent": r"^Objective value:\s+(\S+)",
+    "bound": r"^Lower bound:\s+(\S+)",
+    "root_bound": r"Continuous objective value is (\S+)",
+}
+
+
+def cbc_result(text):
+    """Stop reason, final incumbent, best bound, root LP bound and relative gap from a finished CBC log.
+
+    CBC omits the lower bound when it proves optimality; the bound is then
+    the incumbent and the gap 0.
+    """
+    result = {}
+    for key, pattern in CBC_RESULT_PATTERNS.items():
+        match = re.search(pattern, text, re.MULTILINE)
+        if match:
+            result[key] = match.group(1) if key == "result" else float(match.group(1))
+    if "incumbent" in result:
+        result.setdefault("bound", result["incumbent"])
+        result["gap"] = abs(result["incumbent"] - result["bound"]) / max(1.0, abs(result["incumbent"]))
+    return result
+
+
+def pulp_solution(model, problem, x, msg=False, **options):
+    """Solve an already-built PuLP problem (see to_pulp) with CBC.
+
+    CBC's log goes to a scratch file so its iteration counts can be
+    reported in `stats`; pass logPath to keep it. A MIP (minimum loads)
+    has no row duals of its own, so its shadow prices come from re-solving
+    the LP with every binary fixed at its optimal value.
+    """
+    from pulp import PULP_CBC_CMD
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = options.setdefault("logPath", os.path.join(tmp, "cbc.log"))
+        problem.solve(PULP_CBC_CMD(msg=msg, **options))
+        try:
+            with open(log_path) as f:
+                log = f.read()
+        except OSError:
+            log = ""
+        solution = extract_pulp_solution(model, problem, x)
+        solution.stats.update(cbc_log_stats(log), solver_seconds=problem.solutionTime)
+        if problem.isMIP() and solution.status == "Optimal":
+            solution.duals = fixed_lp_duals(model, problem, PULP_CBC_CMD(msg=msg, **options))
+    solution.iterations = solution.stats["iterations"]
+    return solution
+
+
+def fixed_lp_duals(model, problem, cbc):
+    """Supply/demand duals of `problem` with its integer variables fixed at their values."""
+    from pulp import LpContinuous, LpInteger
+
+    integers = [v for v in problem.variables() if v.cat == LpInteger]
+    saved = [(v.lowBound, v.upBound) for v in integers]
+    for v in integers:
+        v.lowBound = v.upBound = round(v.varValue or 0.0)
+        v.cat = LpContinuous
+    try:
+        problem.solve(cbc)
+        return _row_duals(model, problem)
+    finally:
+        for v, (low, up) in zip(integers, saved):
+            v.lowBound, v.upBound = low, up
+            v.cat = LpInteger
+
+
+def _row_duals(model, problem):
+    # supply and demand rows come first; minimum-load rows follow them
+    rows = itertools.islice(problem.constraints.values(), model.n_supply + model.n_demand)
+    return np.fromiter((c.pi or 0.0 for c in rows), dtype=float)
+
+
+def extract_pulp_solution(model, problem, x):
+    from pulp import LpStatus, value
+
+    flows = np.fromiter((v.varValue or 0.0 for v in x), dtype=float, count=len(x))
+    return TransportSolution(
+        model, flows, value(problem.objective), LpStatus[problem.status], _row_duals(model, problem), "cbc",
+        stats={"variables": problem.numVariables(), "constraints": len(problem.constraints)},
+    )
+
+
+def transport_network(model):
+    """Min-cost-flow arrays for a transportation model.
+
+    Node order is supply nodes, demand nodes, then a dummy sink that absorbs
+    unused supply over zero-cost slack arcs (one per supply node, appended
+    after the lanes). Returns (n_nodes, tail, head, cost, capacity, supply).
+    Minimum loads can't be expressed as a network, so such models raise
+    ValueError.
+    """
+    if model.has_min_loads:
+        raise ValueError("Minimum lane loads make the model a MIP; use the cbc solver")
+    n_supply, n_demand = model.n_supply, model.n_demand
+    sink = n_supply + n_demand
+    slack = np.arange(n_supply)
+    tail = np.concatenate([model.lane_supply, slack])
+    head = np.concatenate([n_supply + model.lane_demand, np.full(n_supply, sink)])
+    cost = np.concatenate([model.cost, np.zeros(n_supply)])
+    capacity = np.concatenate([model.capacity, np.full(n_supply, np.inf)])
+    supply = np.concatenate([model.supply, -model.demand, [model.demand.sum() - model.supply.sum()]])
+    return sink + 1, tail, head, cost, capacity, supply
+
+
+def transport_duals(model, potentials):
+    # supply rows are <= (dual = pi), demand rows are >= on inflow (dual = -pi);
+    # fixing the sink potential at zero makes the slack arcs dual feasible
+    pi = potentials - potentials[-1]
+    return np.concatenate([pi[:model.n_supply], -pi[model.n_supply:-1]])
+
+
+def solve_network_simplex(model, **options):
+    engine = NetworkSimplex(*transport_network(model), **options)
+    engine.solve()
+    return network_solution(model, engine)
+
+
+def network_solution(model, engine):
+    flows = engine.flows[:model.n_lanes]
+    return TransportSolution(
+        model, flows, float(flows @ model.cost), engine.status,
+        transport_duals(model, engine.potentials), "network_simplex", engine.iterations,
+        stats={
+            "variables": model.n_lanes,
+            "constraints": model.n_supply + model.n_demand,
+            "iterations": engine.iterations,
+            "nodes": None,
+        },
+    )
+
+
+def solve_decomposition(model, **options):
+    from .decomposition import solve_decomposition
+
+    return solve_decomposition(model, **options)
+
+
+SOLVERS = {
+    "cbc": solve_cbc,
+    "network_simplex": solve_network_simplex,
+    "decomposition": solve_decomposition,
+}
+
+
+def solve(model, solver="cbc", **options):
+    try:
+        backend = SOLVERS[solver]
+    except KeyError:
+        raise ValueError(f"Unknown solver {solver!r}; expected one of {sorted(SOLVERS)}") from None
+    return backend(model, **options)
+
+
+def solve_transport(supply, demand, costs, solver="cbc", **options):
+    """Solve one scenario without Streamlit.
+
+    `supply` and `demand` map node labels to tons (dict or Series) and
+    `costs` is a region x RDC DataFrame of USD per ton.
+    """
+    return solve(build_transport_model(supply, demand, costs), solver, **options)
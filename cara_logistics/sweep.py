@@ -0,0 +1,106 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .session import SolverSession
+
+SWEEP_KINDS = ("supply", "demand", "cost")
+
+
+class SweepAxis:
+    """One swept parameter: a list of percentage changes applied to part of a table.
+
+    kind is "supply", "demand" or "cost". `labels` restricts the change to
+    those nodes (for costs: lanes leaving or entering them); None applies it
+    to the whole table.
+    """
+
+    def __init__(self, name, kind, changes_pct, labels=None):
+        if kind not in SWEEP_KINDS:
+            raise ValueError(f"Unknown sweep kind {kind!r}; expected one of {SWEEP_KINDS}")
+        self.name = name
+        self.kind = kind
+        self.changes_pct = [float(v) for v in changes_pct]
+        self.labels = None if labels is None else list(labels)
+
+    def mask(self, model):
+        if self.kind == "supply":
+            return self._select(model.supply_labels)
+        if self.kind == "demand":
+            return self._select(model.demand_labels)
+        if self.labels is None:
+            return np.ones(model.n_lanes, dtype=bool)
+        origin = self._select(model.supply_labels)[model.lane_supply]
+        destination = self._select(model.demand_labels)[model.lane_demand]
+        return origin | destination
+
+    def _select(self, labels):
+        if self.labels is None:
+            return np.ones(len(labels), dtype=bool)
+        return np.isin(np.asarray(labels, dtype=object), self.labels)
+
+
+def sweep_points(axes):
+    """Cartesian grid of percentage changes, last axis varying fastest."""
+    return list(itertools.product(*(axis.changes_pct for axis in axes)))
+
+
+# per-process state: the base model is shipped once, then every point only
+# swaps supply/demand/cost arrays into a warm-started session
+_worker = {}
+
+
+def _init_worker(model, axes, solver):
+    _worker.update(
+        model=model,
+        solver=solver,
+        targets=[(axis.kind, axis.mask(model)) for axis in axes],
+        session=SolverSession(),
+    )
+
+
+def _solve_points(points):
+    model, targets = _worker["model"], _worker["targets"]
+    rows = []
+    for point in points:
+        start = time.perf_counter()
+        arrays = {"supply": model.supply.copy(), "demand": model.demand.copy(), "cost": model.cost.copy()}
+        for (kind, mask), change in zip(targets, point):
+            arrays[kind][mask] *= 1.0 + change / 100.0
+        solution = _worker["session"].solve(model.with_values(**arrays), _worker["solver"])
+        objective = solution.objective if solution.status == "Optimal" else np.nan
+        rows.append((point, solution.status, objective, time.perf_counter() - start))
+    return rows
+
+
+def run_sweep(model, axes, solver="network_simplex", workers=None, chunksize=None):
+    """Solve every grid point, yielding result rows as they complete.
+
+    Each row is a dict keyed by axis name plus Status, Objective (NaN unless
+    optimal) and Seconds. Points are handed out in contiguous chunks so
+    consecutive solves in a worker differ in one parameter and warm-start well.
+    """
+    points = sweep_points(axes)
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, min(32, len(points) // (workers * 4)))
+    chunks = [points[i:i + chunksize] for i in range(0, len(points), chunksize)]
+
+    def as_rows(results):
+        for point, status, objective, seconds in results:
+            row = {axis.name: change for axis, change in zip(axes, point)}
+            row.update(Status=status, Objective=objective, Seconds=seconds)
+            yield row
+
+    if workers == 1:
+        _init_worker(model, axes, solver)
+        for chunk in chunks:
+            yield from as_rows(_solve_points(chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model, axes, solver)) as pool:
+        futures = [pool.submit(_solve_points, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from as_rows(future.result())
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+COST_DISTRIBUTIONS = ("uniform", "lognormal", "distance")
+
+# continental US bounding box used for synthetic node locations
+LAT_RANGE = (25.0, 48.0)
+LON_RANGE = (-123.0, -70.0)
+
+
+class SyntheticNetwork:
+    def __init__(self, supply, demand, costs, supply_coords, demand_coords):
+        self.supply = supply
+        self.demand = demand
+        self.costs = costs
+        self.supply_coords = supply_coords
+        self.demand_coords = demand_coords
+
+
+def random_network(n_supply, n_demand, seed=0, slack=1.1, cost_range=(100, 1500), costs="uniform"):
+    """Random transportation network with node coordinates.
+
+    Total supply is `slack` times total demand (1.0 gives a balanced
+    instance). `costs` picks the cost distribution: "uniform" integers in
+    `cost_range`, heavy-tailed "lognormal", or "distance", which prices
+    each lane from the straight-line distance between its endpoints.
+    """
+    if costs not in COST_DISTRIBUTIONS:
+        raise ValueError(f"Unknown cost distribution {costs!r}; expected one of {COST_DISTRIBUTIONS}")
+    rng = np.random.default_rng(seed)
+    regions = [f"Region {i}" for i in range(n_supply)]
+    rdcs = [f"RDC {j}" for j in range(n_demand)]
+
+    demand = rng.integers(50, 200, n_demand).astype(float)
+    weights = rng.random(n_supply) + 0.5
+    supply = np.ceil(weights / weights.sum() * demand.sum() * slack)
+
+    # separate stream so coordinates don't shift the cost draws for a given seed
+    geo = np.random.default_rng([seed, 1])
+    supply_coords = np.column_stack([geo.uniform(*LAT_RANGE, n_supply), geo.uniform(*LON_RANGE, n_supply)])
+    demand_coords = np.column_stack([geo.uniform(*LAT_RANGE, n_demand), geo.uniform(*LON_RANGE, n_demand)])
+
+    low, high = cost_range
+    if costs == "uniform":
+        cost = rng.integers(low, high, (n_supply, n_demand)).astype(float)
+    elif costs == "lognormal":
+        cost = np.clip(rng.lognormal(np.log(np.sqrt(low * high)), 0.6, (n_supply, n_demand)), low, None).round()
+    else:
+        # ~69 miles per degree; rescale so the longest lane costs `high`
+        d_lat = supply_coords[:, None, 0] - demand_coords[None, :, 0]
+        d_lon = (supply_coords[:, None, 1] - demand_coords[None, :, 1]) * np.cos(np.radians(36.5))
+        miles = 69.0 * np.hypot(d_lat, d_lon)
+        cost = (low + (high - low) * miles / miles.max()).round()
+
+    return SyntheticNetwork(
+        pd.Series(supply, index=regions),
+        pd.Series(demand, index=rdcs),
+        pd.DataFrame(cost, index=regions, columns=rdcs),
+        supply_coords,
+        demand_coords,
+    )
+
+
+def random_instance(n_supply, n_demand, seed=0, slack=1.1, cost_range=(100, 1500), costs="uniform"):
+    """(supply, demand, costs) of random_network, for callers that don't need coordinates."""
+    network = random_network(n_supply, n_demand, seed, slack, cost_range, costs)
+    return network.supply, network.demand, network.costs
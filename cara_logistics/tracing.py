@@ -0,0 +1,116 @@
+import json
+import secrets
+import time
+from contextlib import contextmanager
+
+
+class Span:
+    def __init__(self, name, span_id, parent_id, attributes):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = None
+        self.end_ns = None
+        self.duration = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Collects named, nestable timing spans for one run.
+
+    Spans are kept in completion order. to_otel() renders them in the
+    OpenTelemetry OTLP/JSON layout so the file written by export() can be
+    loaded by standard trace tooling.
+    """
+
+    def __init__(self, name, **attributes):
+        self.name = name
+        self.trace_id = secrets.token_hex(16)
+        self.attributes = attributes
+        self.spans = []
+        self._stack = []
+
+    @contextmanager
+    def span(self, name, **attributes):
+        parent = self._stack[-1].span_id if self._stack else None
+        span = Span(name, secrets.token_hex(8), parent, attributes)
+        self._stack.append(span)
+        span.start_ns = time.time_ns()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            span.end_ns = span.start_ns + int(span.duration * 1e9)
+            self._stack.pop()
+            self.spans.append(span)
+
+    def record(self, name, start_ns, duration, **attributes):
+        """Add a span that was timed elsewhere (e.g. a solve in a background process)."""
+        span = Span(name, secrets.token_hex(8), None, attributes)
+        span.start_ns = start_ns
+        span.duration = duration
+        span.end_ns = start_ns + int(duration * 1e9)
+        self.spans.append(span)
+        return span
+
+    def summary(self):
+        depth = {None: -1}
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            depth[span.span_id] = depth.get(span.parent_id, -1) + 1
+        return [
+            {
+                "span": "  " * depth[span.span_id] + span.name,
+                "ms": span.duration * 1000,
+                "details": ", ".join(f"{k}={v}" for k, v in span.attributes.items() if v is not None),
+            }
+            for span in sorted(self.spans, key=lambda s: s.start_ns)
+        ]
+
+    def to_otel(self):
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _attributes({"service.name": "cara-logistics", **self.attributes})},
+                "scopeSpans": [{
+                    "scope": {"name": "cara_logistics", "version": "1"},
+                    "spans": [
+                        {
+                            "traceId": self.trace_id,
+                            "spanId": span.span_id,
+                            **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                            "name": span.name,
+                            "kind": 1,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": _attributes(span.attributes),
+                        }
+                        for span in self.spans
+                    ],
+                }],
+            }],
+        }
+
+    def export(self, path):
+        """Append this trace as one OTLP/JSON line to `path`."""
+        with open(path, "a") as f:
+            f.write(json.dumps(self.to_otel()) + "\n")
+
+
+def _attributes(values):
+    attributes = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": typed})
+    return attributes
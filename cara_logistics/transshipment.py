@@ -0,0 +1,300 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from .importer import iter_batches
+from .model import pulp_from_arrays
+from .network_simplex import NetworkSimplex
+from .scenarios import CAPACITY, COST, DEMAND, SUPPLY
+
+NODE = "Node"
+KIND = "Kind"
+FROM = "From"
+TO = "To"
+THROUGHPUT = "Throughput (tons)"
+HANDLING = "Handling (USD per ton)"
+LATITUDE = "Latitude"
+LONGITUDE = "Longitude"
+
+
+class TransshipmentModel:
+    """Min-cost flow over an arbitrary network, e.g. groves -> packing houses -> cross-docks -> RDCs.
+
+    Nodes have `supply` and `demand` tons (both zero for pure transshipment
+    points), an optional `kind` (echelon name, used to group the Sankey)
+    and optional lat/lon `coords`. Arcs run tail -> head with a USD-per-ton
+    `cost` and optional `capacity`. A node's `throughput` bounds, and its
+    `handling` cost is charged on, the tons it sends out; such nodes are
+    split into an in-side (the original index, where supply enters and
+    demand leaves) and an out-side joined by one pass-through arc. Supply
+    beyond total demand may stay where it is.
+
+    The split graph is the single source for both engines: network() adds
+    a sink for unused supply for the native network simplex, and matrix /
+    to_pulp() write its node-arc incidence rows in bulk for CBC.
+    """
+
+    def __init__(self, labels, supply, demand, tail, head, cost, capacity=None, throughput=None, handling=None,
+                 kinds=None, coords=None):
+        self.labels = list(labels)
+        n = len(self.labels)
+        self.supply = np.array(np.broadcast_to(supply, (n,)), dtype=float)
+        self.demand = np.array(np.broadcast_to(demand, (n,)), dtype=float)
+        self.tail = np.asarray(tail, dtype=np.int64)
+        self.head = np.asarray(head, dtype=np.int64)
+        self.cost = np.array(cost, dtype=float)
+        self.capacity = np.full(len(self.cost), np.inf) if capacity is None else np.array(
+            np.broadcast_to(capacity, self.cost.shape), dtype=float)
+        self.throughput = np.full(n, np.inf) if throughput is None else np.array(
+            np.broadcast_to(throughput, (n,)), dtype=float)
+        self.handling = np.zeros(n) if handling is None else np.array(np.broadcast_to(handling, (n,)), dtype=float)
+        self.kinds = None if kinds is None else list(kinds)
+        self.coords = None if coords is None else np.asarray(coords, dtype=float).reshape(n, 2)
+        if len(self.tail) and (min(self.tail.min(), self.head.min()) < 0 or max(self.tail.max(), self.head.max()) >= n):
+            raise ValueError("Arcs reference nodes outside the node list")
+        if (self.supply < 0).any() or (self.demand < 0).any():
+            raise ValueError("Supply and demand must not be negative")
+        if (self.capacity < 0).any() or (self.throughput < 0).any():
+            raise ValueError("Capacities must not be negative")
+        if not np.isfinite(self.cost).all() or not np.isfinite(self.handling).all():
+            raise ValueError("Arc and handling costs must be finite numbers")
+        self.split = np.flatnonzero(np.isfinite(self.throughput) | (self.handling != 0))
+        self._matrix = None
+
+    @classmethod
+    def from_tables(cls, nodes, arcs):
+        """Nodes: Node, optional Kind, Supply / Demand (tons), Throughput (tons), Handling (USD per ton),
+        Latitude / Longitude. Arcs: From, To, Cost (USD per ton), optional Capacity (tons).
+
+        Blank supply, demand and handling mean 0, blank throughput and
+        capacity mean unlimited.
+        """
+        for table, columns, name in ((nodes, [NODE], "Nodes"), (arcs, [FROM, TO, COST], "Arcs")):
+            missing = [c for c in columns if c not in table.columns]
+            if missing:
+                raise ValueError(f"{name} table is missing column(s): {', '.join(missing)}")
+        index = pd.Index(nodes[NODE])
+        if not index.is_unique:
+            dupes = index[index.duplicated()].unique()
+            raise ValueError(f"Duplicate node name(s): {', '.join(map(str, dupes[:5]))}")
+        tail, head = index.get_indexer(arcs[FROM]), index.get_indexer(arcs[TO])
+        unknown = pd.concat([arcs[FROM][tail < 0], arcs[TO][head < 0]]).unique()
+        if len(unknown):
+            raise ValueError(f"Arcs reference unknown node(s): {', '.join(map(str, unknown[:5]))}")
+
+        def column(table, name, default):
+            if name not in table.columns:
+                return np.full(len(table), default)
+            values = pd.to_numeric(table[name], errors="coerce")
+            if (values.isna() & table[name].notna()).any():
+                raise ValueError(f"{name} must be numeric")
+            return values.fillna(default).to_numpy(dtype=float)
+
+        coords = None
+        if LATITUDE in nodes.columns and LONGITUDE in nodes.columns:
+            coords = nodes[[LATITUDE, LONGITUDE]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        cost = column(arcs, COST, np.nan)
+        if np.isnan(cost).any():
+            raise ValueError(f"{int(np.isnan(cost).sum())} arc(s) have no cost")
+        return cls(
+            index.to_numpy(), column(nodes, SUPPLY, 0.0), column(nodes, DEMAND, 0.0), tail, head, cost,
+            column(arcs, CAPACITY, np.inf), column(nodes, THROUGHPUT, np.inf), column(nodes, HANDLING, 0.0),
+            nodes[KIND].astype(str).tolist() if KIND in nodes.columns else None, coords,
+        )
+
+    @classmethod
+    def from_files(cls, nodes_source, arcs_source, batch_rows=65536):
+        """from_tables() on CSV, Parquet or Arrow IPC/Feather files (paths or uploads).
+
+        Files are streamed with the importer's typed batch reader, so names
+        arrive as strings and numbers as floats (blank cells as NaN).
+        """
+        import pyarrow as pa
+
+        def read(source, labels, numbers, optional, optional_labels=()):
+            batches = list(iter_batches(source, labels, numbers, optional, batch_rows, optional_labels))
+            if not batches:
+                return pd.DataFrame(columns=labels + numbers)
+            return pa.Table.from_batches(batches).to_pandas()
+
+        nodes = read(nodes_source, [NODE], [], [SUPPLY, DEMAND, THROUGHPUT, HANDLING, LATITUDE, LONGITUDE], [KIND])
+        arcs = read(arcs_source, [FROM, TO], [COST], [CAPACITY])
+        return cls.from_tables(nodes, arcs)
+
+    @property
+    def n_nodes(self):
+        return len(self.labels)
+
+    @property
+    def n_arcs(self):
+        return len(self.cost)
+
+    @property
+    def balance(self):
+        return self.supply - self.demand
+
+    def expanded(self):
+        """Split graph (n_nodes, tail, head, cost, capacity, balance).
+
+        Nodes: the original nodes, then one out-side per split node. Arcs:
+        the declared arcs (leaving from out-sides), then one pass-through
+        arc per split node.
+        """
+        n, split = self.n_nodes, self.split
+        out_side = np.arange(n)
+        out_side[split] = n + np.arange(len(split))
+        return (
+            n + len(split),
+            np.concatenate([out_side[self.tail], split]),
+            np.concatenate([self.head, out_side[split]]),
+            np.concatenate([self.cost, self.handling[split]]),
+            np.concatenate([self.capacity, self.throughput[split]]),
+            np.concatenate([self.balance, np.zeros(len(split))]),
+        )
+
+    def network(self):
+        """Min-cost-flow arrays for NetworkSimplex: the split graph plus a sink for unused supply.
+
+        Slack arcs run from every supply node to the sink at zero cost,
+        after the pass-through arcs.
+        """
+        n, tail, head, cost, capacity, balance = self.expanded()
+        sources = np.flatnonzero(balance > 0)
+        return (
+            n + 1,
+            np.concatenate([tail, sources]),
+            np.concatenate([head, np.full(len(sources), n)]),
+            np.concatenate([cost, np.zeros(len(sources))]),
+            np.concatenate([capacity, np.full(len(sources), np.inf)]),
+            np.append(balance, -balance.sum()),
+        )
+
+    @property
+    def matrix(self):
+        """CSR node-arc incidence of the split graph: +1 where an arc leaves a node, -1 where it enters."""
+        if self._matrix is None:
+            import scipy.sparse as sp
+
+            n, tail, head, _, _, _ = self.expanded()
+            arcs = np.arange(len(tail))
+            self._matrix = sp.csr_matrix(
+                (np.r_[np.ones(len(tail)), -np.ones(len(tail))], (np.r_[tail, head], np.r_[arcs, arcs])),
+                shape=(n, len(tail)),
+            )
+        return self._matrix
+
+    def to_pulp(self, name="Minimize_Network_Cost"):
+        """(problem, arc variables): outflow - inflow <= balance at supply and demand nodes, = 0 elsewhere."""
+        from pulp import LpConstraintEQ, LpConstraintLE
+
+        n, tail, head, cost, capacity, balance = self.expanded()
+        senses = np.where(balance != 0, LpConstraintLE, LpConstraintEQ).tolist()
+        row_names = [f"Node_{i}" for i in range(self.n_nodes)] + [f"Out_{i}" for i in self.split.tolist()]
+        columns = [f"arc_{k}" for k in range(self.n_arcs)] + [f"pass_{i}" for i in self.split.tolist()]
+        return pulp_from_arrays(name, cost, capacity, self.matrix, senses, balance, row_names, columns)
+
+
+class TransshipmentSolution:
+    def __init__(self, model, flows, status, node_duals, solver, stats=None):
+        self.model = model
+        self.flows = np.asarray(flows, dtype=float)  # declared arcs, then pass-through arcs
+        self.status = status
+        self.node_duals = np.asarray(node_duals, dtype=float)
+        self.solver = solver
+        self.stats = stats or {}
+
+    @property
+    def arc_flows(self):
+        return self.flows[:self.model.n_arcs]
+
+    @property
+    def transport_cost(self):
+        return float(self.arc_flows @ self.model.cost)
+
+    @property
+    def handling_cost(self):
+        model = self.model
+        return float(self.flows[model.n_arcs:] @ model.handling[model.split])
+
+    @property
+    def objective(self):
+        return self.transport_cost + self.handling_cost
+
+    @property
+    def prices(self):
+        """USD per ton of one more ton of demand at each node (the node's marginal delivered cost)."""
+        return -self.node_duals
+
+    @property
+    def flow_table(self):
+        """Nonzero arcs in the TransportSolution.flow_table layout; from_idx / to_idx are node indices."""
+        model = self.model
+        nz = np.flatnonzero(self.arc_flows > 0)
+        labels = np.asarray(model.labels, dtype=object)
+        tons = self.arc_flows[nz]
+        cost = model.cost[nz]
+        return pd.DataFrame({
+            "From": labels[model.tail[nz]],
+            "To": labels[model.head[nz]],
+            "Tons": tons,
+            "Cost per Ton": cost,
+            "Total Cost": tons * cost,
+            "from_idx": model.tail[nz],
+            "to_idx": model.head[nz],
+        })
+
+    def node_table(self):
+        model = self.model
+        inflow = np.bincount(model.head, self.arc_flows, minlength=model.n_nodes)
+        outflow = np.bincount(model.tail, self.arc_flows, minlength=model.n_nodes)
+        table = pd.DataFrame({NODE: model.labels})
+        if model.kinds is not None:
+            table[KIND] = model.kinds
+        table[SUPPLY] = model.supply
+        table[DEMAND] = model.demand
+        table["Inflow (tons)"] = inflow
+        table["Outflow (tons)"] = outflow
+        table[THROUGHPUT] = model.throughput
+        table["Price (USD per ton)"] = self.prices
+        return table
+
+
+def _solve_network_simplex(model, **options):
+    engine = NetworkSimplex(*model.network(), **options)
+    status = engine.solve()
+    n_flows = model.n_arcs + len(model.split)
+    pi = engine.potentials - engine.potentials[-1]
+    return TransshipmentSolution(
+        model, engine.flows[:n_flows], status, pi[:model.n_nodes], "network_simplex",
+        {"iterations": engine.iterations},
+    )
+
+
+def _solve_cbc(model, msg=False, **options):
+    from pulp import PULP_CBC_CMD, LpStatus
+
+    problem, x = model.to_pulp()
+    problem.solve(PULP_CBC_CMD(msg=msg, **options))
+    flows = np.fromiter((v.varValue or 0.0 for v in x), dtype=float, count=len(x))
+    duals = np.fromiter((c.pi or 0.0 for c in problem.constraints.values()), dtype=float)
+    return TransshipmentSolution(model, flows, LpStatus[problem.status], duals[:model.n_nodes], "cbc")
+
+
+TRANSSHIPMENT_SOLVERS = {
+    "cbc": _solve_cbc,
+    "network_simplex": _solve_network_simplex,
+}
+
+
+def solve_transshipment(model, solver="network_simplex", **options):
+    try:
+        backend = TRANSSHIPMENT_SOLVERS[solver]
+    except KeyError:
+        raise ValueError(f"Unknown solver {solver!r}; expected one of {sorted(TRANSSHIPMENT_SOLVERS)}") from None
+    start = time.perf_counter()
+    solution = backend(model, **options)
+    solution.stats.update(
+        elapsed=time.perf_counter() - start, nodes=model.n_nodes, arcs=model.n_arcs, split_nodes=len(model.split),
+    )
+    return solution
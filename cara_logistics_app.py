@@ -1,10 +1,27 @@
+import json
+import os
+import uuid
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpStatus, value
-import altair as alt
-import pydeck as pdk
+
+from cara_logistics import (
+    SolutionCache, SolverSession, Tracer, build_transport_model, input_problems,
+    scenario_key,
+)
+from cara_logistics.charts import (
+    bundle_routes, flow_bar_chart, network_sankey_data, route_deck, route_frame, sankey_data,
+)
+from cara_logistics.distances import CostMatrixBuilder, RateModel, haversine_miles
+from cara_logistics.facility import FacilityModel, solve_facility
+from cara_logistics.importer import import_network
+from cara_logistics.jobs import JobRunner
+from cara_logistics.multiperiod import MultiPeriodModel, replan, seasonal_profile, solve_multiperiod, solve_rolling
+from cara_logistics.reference import DATA_DIR, load_reference
+from cara_logistics.roads import load_road_graph
+from cara_logistics.sweep import SweepAxis, run_sweep
+from cara_logistics.transshipment import TransshipmentModel, solve_transshipment
 
 st.set_page_config(page_title="Cara Logistics Optimizer", layout="wide")
 st.title("🚚 Cara Orange Growers - Transportation Optimizer")
@@ -14,169 +31,692 @@ st.markdown("Edit supply, demand, and costs, then click **Run Optimization** to
 # ------------------------------
 # Editable Tables
 # ------------------------------
-regions = ["Indian River, FL", "Rio Grande Valley, TX", "Central Valley, CA"]
-rdcs = ["Atlanta, GA", "Chicago, IL", "Dallas, TX", "Los Angeles, CA"]
-
-region_coords = {
-    "Indian River, FL": [27.6, -80.4],
-    "Rio Grande Valley, TX": [26.3, -98.1],
-    "Central Valley, CA": [36.6, -119.7],
-    "Atlanta, GA": [33.7, -84.4],
-    "Chicago, IL": [41.9, -87.6],
-    "Dallas, TX": [32.8, -96.8],
-    "Los Angeles, CA": [34.0, -118.2]
-}
+@st.cache_resource
+def reference_data():
+    # locations, coordinates and default tables, parsed once per process;
+    # point CARA_REFERENCE_DIR at a folder with locations.csv / lanes.csv to override
+    return load_reference(os.environ.get("CARA_REFERENCE_DIR"))
+
+reference = reference_data()
+
+@st.cache_resource
+def road_graph():
+    # CARA_ROAD_GRAPH: OSMnx .graphml file or folder with nodes / edges files for road distances
+    path = os.environ.get("CARA_ROAD_GRAPH")
+    return load_road_graph(path) if path else None
+
+@st.cache_resource(max_entries=16)
+def cost_builder(per_ton_mile, fixed_per_ton, minimum_per_ton, circuity):
+    # one builder per rate set, reused across reruns; distance matrices and
+    # road tables persist under CARA_COST_CACHE_DIR across restarts
+    rates = RateModel(per_ton_mile, fixed_per_ton, minimum_per_ton, circuity)
+    return CostMatrixBuilder(rates, road_graph(), cache_dir=os.environ.get("CARA_COST_CACHE_DIR"))
 
-def default_supply():
-    return pd.DataFrame({"Region": regions, "Supply (tons)": [150, 170, 200]})
-
-def default_demand():
-    return pd.DataFrame({"RDC": rdcs, "Demand (tons)": [140, 130, 120, 130]})
-
-def default_costs():
-    return pd.DataFrame(
-        [
-            [500, 700, 800, 1200],
-            [400, 600, 300, 1000],
-            [900, 850, 650, 400]
-        ],
-        index=regions,
-        columns=rdcs
+upload_types = ["csv", "parquet", "pq", "arrow", "feather", "ipc"]
+data_source = st.radio("Data source", ["Edit tables", "Import files"], horizontal=True)
+imported = None
+
+if data_source == "Edit tables":
+    st.subheader("Supply Capacities")
+    supply_df = st.data_editor(reference.default_supply, num_rows="fixed", use_container_width=True)
+
+    st.subheader("RDC Demand Requirements")
+    demand_df = st.data_editor(reference.default_demand, num_rows="fixed", use_container_width=True)
+
+    st.subheader("Transportation Costs (USD per ton)")
+    default_costs = reference.default_costs
+    if st.toggle("Price lanes by distance", help="Fill the cost table from site coordinates and a $/ton-mile rate"):
+        rate_cols = st.columns(3)
+        rates = RateModel(
+            rate_cols[0].number_input("USD per ton-mile", min_value=0.0, value=0.37, step=0.01),
+            rate_cols[1].number_input("Fixed USD per ton", min_value=0.0, value=250.0, step=10.0),
+            circuity=rate_cols[2].number_input(
+                "Circuity", min_value=1.0, value=1.0, step=0.05,
+                help="Road miles per straight-line mile; leave at 1.0 with a road graph",
+            ),
+        )
+        builder = cost_builder(**rates.params())
+        default_costs = builder.table(
+            reference.regions, reference.coordinates(reference.regions),
+            reference.rdcs, reference.coordinates(reference.rdcs),
+        ).replace(np.inf, np.nan).round(2)  # no road path: left blank, like a missing cost
+        st.caption(
+            f"{'Road graph' if builder.graph is not None else 'Great-circle'} miles; "
+            "edit any cell to override."
+        )
+    costs = st.data_editor(default_costs, use_container_width=True)
+else:
+    st.subheader("Import Network Files")
+    st.caption(
+        "CSV, Parquet or Arrow. Supply: Region, Supply (tons); demand: RDC, Demand (tons); "
+        "lanes: Region, RDC, Cost (USD per ton), optional Capacity (tons) and Minimum load (tons); "
+        "only listed lanes are used. "
+        "Supply and demand may add Latitude / Longitude for the map."
     )
+    upload_cols = st.columns(3)
+    uploads = [
+        col.file_uploader(label, type=upload_types)
+        for col, label in zip(upload_cols, ["Supply file", "Demand file", "Lane cost file"])
+    ]
+    if all(uploads):
+        # validate once per set of files, not on every rerun
+        upload_key = tuple(upload.file_id for upload in uploads)
+        if st.session_state.get("import_key") != upload_key:
+            with st.spinner("Validating files..."):
+                st.session_state.imported, st.session_state.import_problems = import_network(*uploads)
+            st.session_state.import_key = upload_key
+        for problem in st.session_state.import_problems:
+            st.error(problem)
+        imported = st.session_state.imported
+        if imported is not None:
+            model = imported.model
+            st.success(f"Imported {model.n_supply:,} regions, {model.n_demand:,} RDCs and {model.n_lanes:,} lanes.")
+    else:
+        st.info("Upload supply, demand and lane cost files to continue.")
+
+solver_engines = {
+    "CBC (PuLP)": "cbc",
+    "Network simplex (native)": "network_simplex",
+    "Decomposition (large networks)": "decomposition",
+}
+solver_choice = st.selectbox("Solver engine", list(solver_engines))
+map_aggregate_above = 500  # lanes; larger plans are drawn as bundled corridors
+max_matrix_cells = 10_000  # larger plans are listed lane by lane instead of as a region x RDC grid
+sankey_links = st.number_input("Max Sankey links", min_value=10, max_value=5000, value=100, step=10)
+
+if "solver_session" not in st.session_state:
+    st.session_state.solver_session = SolverSession()
 
-st.subheader("Supply Capacities")
-supply_df = st.data_editor(default_supply(), num_rows="fixed", use_container_width=True)
 
-st.subheader("RDC Demand Requirements")
-demand_df = st.data_editor(default_demand(), num_rows="fixed", use_container_width=True)
+@st.cache_resource
+def solution_cache():
+    # shared by every session in this process; set CARA_SOLUTION_CACHE_DIR to persist to disk
+    return SolutionCache(maxsize=256, path=os.environ.get("CARA_SOLUTION_CACHE_DIR"))
 
-st.subheader("Transportation Costs (USD per ton)")
-costs = st.data_editor(default_costs(), use_container_width=True)
+# set CARA_TRACE_FILE to append every run's stage timings as OTLP/JSON lines
+trace_file = os.environ.get("CARA_TRACE_FILE")
 
 # ------------------------------
 # Optimization Trigger
 # ------------------------------
-if st.button("Run Optimization"):
-    supply = dict(zip(supply_df["Region"], supply_df["Supply (tons)"]))
-    demand = dict(zip(demand_df["RDC"], demand_df["Demand (tons)"]))
+# models with at least this many lanes (CBC: inline_cbc_lanes) and every MIP
+# go to the shared solve service (background processes, so the page stays
+# responsive and the solve can be cancelled); smaller solves run inline in
+# this session's SolverSession, where warm starts and CBC coefficient updates apply
+background_lanes = int(os.environ.get("CARA_BACKGROUND_LANES", 20_000))
+inline_cbc_lanes = int(os.environ.get("CARA_INLINE_CBC_LANES", 2_000))
+
+
+@st.cache_resource
+def solve_service():
+    # one bounded worker pool for every session in this process; set
+    # CARA_SOLVE_WORKERS to cap concurrent solver processes (default: CPU count)
+    workers = os.environ.get("CARA_SOLVE_WORKERS")
+    return JobRunner(max_workers=int(workers) if workers else None)
+
+job_runner = solve_service()
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+session_id = st.session_state.session_id
 
-    model = LpProblem("Minimize Transportation Cost", LpMinimize)
-    routes = [(s, d) for s in supply for d in demand]
-    x = LpVariable.dicts("route", routes, lowBound=0, cat='Continuous')
-    model += lpSum([x[(s, d)] * costs.loc[s, d] for (s, d) in routes])
 
-    for s in supply:
-        model += lpSum([x[(s, d)] for d in demand]) <= supply[s], f"Supply_{s}"
-    for d in demand:
-        model += lpSum([x[(s, d)] for s in supply]) >= demand[d], f"Demand_{d}"
+def build_results(transport, solution, tracer, solver, cache_key, from_cache):
+    """Tables, figures and captions for a solved plan, built once and kept in session state."""
+    with tracer.span("extraction"):
+        flow_df = solution.flow_table
+        if transport.n_supply * transport.n_demand <= max_matrix_cells:
+            results = pd.DataFrame(solution.shipments, index=transport.supply_labels, columns=transport.demand_labels)
+        else:
+            results = flow_df.drop(columns=["from_idx", "to_idx"])
+
+    start_modes = {
+        "cold": "cold start",
+        "warm": "warm start from the previous basis",
+        "updated": "previous model updated in place",
+        "background": "background job",
+    }
+    stats = solution.stats
+    changes = ""
+    if stats["changed_costs"] is not None:
+        changes = f", {stats['changed_costs']} cost / {stats['changed_rhs']} supply-demand changes"
+    if from_cache:
+        solve_caption = "Served from the solution cache (identical inputs were solved before)"
+    else:
+        solve_caption = f"Solved in {stats['elapsed'] * 1000:,.1f} ms ({start_modes[stats['mode']]}{changes})"
+
+    with tracer.span("chart.sankey", links=len(flow_df)):
+        sankey = sankey_figure(flow_df, sankey_links)
+    with tracer.span("chart.altair"):
+        bar_chart = flow_bar_chart(flow_df)
+
+    map_captions = []
+    with tracer.span("chart.pydeck") as span:
+        supply_coords = reference.coordinates(transport.supply_labels)
+        demand_coords = reference.coordinates(transport.demand_labels)
+        if imported is not None and imported.supply_coords is not None:
+            supply_coords = imported.supply_coords
+        if imported is not None and imported.demand_coords is not None:
+            demand_coords = imported.demand_coords
+        routes = route_frame(flow_df, supply_coords, demand_coords)
+        located = routes[["start_lat", "end_lat"]].notna().all(axis=1)
+        if not located.all():
+            map_captions.append(f"{(~located).sum()} lane(s) with unknown locations are not drawn.")
+            routes = routes[located]
+        aggregate = len(routes) > map_aggregate_above
+        if aggregate:
+            routes = bundle_routes(routes, cell_deg=2.0)
+            map_captions.append(f"{len(flow_df):,} lanes bundled into {len(routes):,} corridors on a 2° grid.")
+        deck = route_deck(routes, arcs=aggregate) if not routes.empty else None
+        span.set(routes=len(routes), bundled=aggregate)
+
+    bound_caption = None
+    if stats.get("bound") is not None:
+        bound_caption = (
+            f"Lower bound ${stats['bound']:,.0f} (gap {stats['gap']:.2%}) after "
+            f"{stats['iterations']} pricing round(s); {stats['master_lanes']:,} of "
+            f"{transport.n_lanes:,} lanes entered the master problem."
+        )
 
-    model.solve()
+    st.session_state.last_trace = tracer
+    st.session_state.last_solver_stats = {"solver": solution.solver, "status": solution.status, **stats}
+    if trace_file:
+        tracer.export(trace_file)
+    return {
+        "transport": transport, "solver": solver, "key": cache_key, "solution": solution,
+        "flow_df": flow_df, "results": results, "solve_caption": solve_caption,
+        "sankey": sankey, "sankey_links": sankey_links, "bar_chart": bar_chart,
+        "deck": deck, "map_captions": map_captions, "bound_caption": bound_caption,
+        "shadow_prices": solution.shadow_prices(),
+    }
 
-    results = pd.DataFrame(0.0, index=supply.keys(), columns=demand.keys())
-    for (s, d) in routes:
-        results.loc[s, d] = x[(s, d)].varValue
+
+def sankey_figure(flow_df, links):
+    # plotting and solver libraries load on first use, not at startup
+    import plotly.graph_objects as go
+
+    return go.Figure(data=[sankey_data(flow_df, top_n=links)])
+
+
+def plan_is_stale(plan):
+    """Whether Run Optimization would now solve something other than `plan`."""
+    solver = solver_engines[solver_choice]
+    if imported is not None:
+        # an import is solved as-is, so only new files or another solver change the answer
+        transport = imported.model
+        return plan["transport"] is not transport or plan["solver"] != ("cbc" if transport.has_min_loads else solver)
+    if data_source != "Edit tables":
+        return True
+    try:
+        transport = build_transport_model(
+            dict(zip(supply_df["Region"], supply_df["Supply (tons)"])),
+            dict(zip(demand_df["RDC"], demand_df["Demand (tons)"])),
+            costs,
+        )
+    except (ValueError, TypeError):
+        return True
+    return scenario_key(transport, "cbc" if transport.has_min_loads else solver) != plan["key"]
+
+
+def show_results(plan):
+    """Draw a stored plan; reruns (editing a cell, moving the map) reuse it without re-solving."""
+    transport, solution = plan["transport"], plan["solution"]
+    if plan_is_stale(plan):
+        st.warning(
+            "⚠️ Stale: the inputs or solver changed since this plan was solved. "
+            "Click **Run Optimization** to refresh it."
+        )
 
     st.subheader("Optimal Shipment Plan (Tons)")
-    st.dataframe(results.style.format("{:.1f}"))
+    if transport.n_supply * transport.n_demand <= max_matrix_cells:
+        st.dataframe(plan["results"].style.format("{:.1f}"))
+    else:
+        st.caption(f"{len(plan['results']):,} lanes carry flow.")
+        st.dataframe(plan["results"], hide_index=True)
 
     st.subheader("Total Weekly Transportation Cost")
-    st.metric(label="USD", value=f"${value(model.objective):,.0f}")
-
-    sankey_data = dict(
-        type='sankey',
-        node=dict(
-            pad=15,
-            thickness=20,
-            line=dict(color="black", width=0.5),
-            label=list(supply.keys()) + list(demand.keys())
-        ),
-        link=dict(
-            source=[list(supply.keys()).index(s) for (s, d) in routes],
-            target=[len(supply) + list(demand.keys()).index(d) for (s, d) in routes],
-            value=[x[(s, d)].varValue for (s, d) in routes],
-            label=[f"{s} → {d}" for (s, d) in routes],
-        )
-    )
-    fig = go.Figure(data=[sankey_data])
-    st.plotly_chart(fig, use_container_width=True)
+    st.metric(label="USD", value=f"${solution.objective:,.0f}")
+    st.caption(plan["solve_caption"])
+
+    flow_df = plan["flow_df"]
+    if plan["sankey_links"] != sankey_links:
+        plan["sankey"], plan["sankey_links"] = sankey_figure(flow_df, sankey_links), sankey_links
+    st.plotly_chart(plan["sankey"], use_container_width=True)
+    if len(flow_df) > sankey_links:
+        st.caption(f"Showing the {sankey_links} largest of {len(flow_df)} flows; the rest are grouped as 'Other'.")
 
     st.subheader("Flow Breakdown by Route")
-    flow_df = pd.DataFrame([
-        {
-            "From": s,
-            "To": d,
-            "Tons": x[(s, d)].varValue,
-            "Cost per Ton": costs.loc[s, d],
-            "Total Cost": x[(s, d)].varValue * costs.loc[s, d]
-        }
-        for (s, d) in routes if x[(s, d)].varValue > 0
-    ])
-    bar_chart = alt.Chart(flow_df).mark_bar().encode(
-        x=alt.X('Tons:Q', title='Shipment Volume (Tons)'),
-        y=alt.Y('From:N', title='From Region'),
-        color='To:N',
-        tooltip=['From', 'To', 'Tons', 'Cost per Ton', 'Total Cost']
-    ).properties(width=800, height=300)
-    st.altair_chart(bar_chart, use_container_width=True)
+    st.altair_chart(plan["bar_chart"], use_container_width=True)
 
     st.subheader("Map View of Transportation Routes")
-    map_lines = []
-    for (s, d) in routes:
-        tons = x[(s, d)].varValue
-        if tons > 0:
-            s_lat, s_lon = region_coords[s]
-            d_lat, d_lon = region_coords[d]
-            map_lines.append({
-                'start_lat': s_lat,
-                'start_lon': s_lon,
-                'end_lat': d_lat,
-                'end_lon': d_lon,
-                'tons': tons,
-                'tooltip': f"{s} → {d}: {tons:.1f} tons"
+    for caption in plan["map_captions"]:
+        st.caption(caption)
+    if plan["deck"] is not None:
+        st.pydeck_chart(plan["deck"])
+
+    st.subheader("Model Status and Shadow Prices")
+    st.write(f"Model Status: **{solution.status}**")
+    if plan["bound_caption"]:
+        st.caption(plan["bound_caption"])
+
+    if plan["shadow_prices"]:
+        st.write("**Binding Constraints & Shadow Prices:**")
+        st.json(plan["shadow_prices"])
+    else:
+        st.write("No strongly binding constraints detected.")
+
+
+job = st.session_state.get("solve_job")
+job_running = job is not None and not job.done
+if st.button("Run Optimization", disabled=(data_source == "Import files" and imported is None) or job_running):
+    solver = solver_engines[solver_choice]
+    tracer = Tracer("run_optimization", solver=solver)
+
+    if imported is None:
+        with tracer.span("input_validation"):
+            supply = dict(zip(supply_df["Region"], supply_df["Supply (tons)"]))
+            demand = dict(zip(demand_df["RDC"], demand_df["Demand (tons)"]))
+            problems = input_problems(supply, demand, costs)
+        if problems:
+            for problem in problems:
+                st.error(problem)
+            st.stop()
+
+    with tracer.span("model_build", source="import" if imported is not None else "tables") as span:
+        transport = imported.model if imported is not None else build_transport_model(supply, demand, costs)
+        span.set(lanes=transport.n_lanes)
+    if transport.has_min_loads and solver != "cbc":
+        st.info("Minimum lane loads need a MIP solver, so this plan is solved with CBC.")
+        solver = "cbc"
+    cache_key = scenario_key(transport, solver)
+    solution = solution_cache().get(cache_key)
+    inline = not transport.has_min_loads and transport.n_lanes < (
+        inline_cbc_lanes if solver == "cbc" else background_lanes)
+    if solution is not None or inline:
+        with tracer.span("solve", solver=solver) as span:
+            from_cache = solution is not None
+            if not from_cache:
+                solution = st.session_state.solver_session.solve(transport, solver)
+                solution_cache().put(cache_key, solution)
+            span.set(cache_hit=from_cache, status=solution.status, **{
+                k: solution.stats.get(k) for k in ("mode", "variables", "constraints", "iterations", "nodes")
             })
+        st.session_state.last_plan = build_results(transport, solution, tracer, solver, cache_key, from_cache)
+    else:
+        st.session_state.solve_job = job = job_runner.submit(transport, solver, owner=session_id, key=cache_key)
+        st.session_state.solve_request = (transport, tracer, cache_key)
+        st.rerun()  # redraw with Run Optimization disabled until the job finishes
 
-    map_df = pd.DataFrame(map_lines)
-    # Scale tons to a nicer line width for visualization
-    min_width, max_width = 2, 10
-    t_min, t_max = map_df['tons'].min(), map_df['tons'].max()
-    if t_max > t_min:
-        map_df['line_width'] = map_df['tons'].apply(lambda t: min_width + (max_width - min_width) * (t - t_min) / (t_max - t_min))
+if job is not None and (job.done or session_id not in job.owners):
+    # picked up on the rerun after the progress fragment saw the job finish
+    # (or this session cancel its interest in a job others still wait on)
+    del st.session_state.solve_job
+    transport, tracer, cache_key = st.session_state.pop("solve_request")
+    if session_id not in job.owners or job.status == "cancelled":
+        st.warning(f"Solve job {job.id} was cancelled after {job.wait + job.elapsed:,.1f} s.")
+    elif job.status == "done":
+        solution = job.result
+        solution.stats.update(mode="background", elapsed=job.elapsed, changed_costs=None, changed_rhs=None, job=job.id)
+        solution_cache().put(cache_key, solution)
+        tracer.record("queue_wait", int(job.submitted * 1e9), job.wait, job=job.id, shared=len(job.owners) > 1)
+        tracer.record(
+            "solve", int(job.started * 1e9), job.elapsed, solver=job.solver, cache_hit=False, job=job.id,
+            status=solution.status, **{k: solution.stats.get(k) for k in ("variables", "constraints", "iterations", "nodes")},
+        )
+        st.session_state.last_plan = build_results(transport, solution, tracer, job.solver, cache_key, False)
+    else:
+        st.error(f"Solve job {job.id} failed: {job.error}")
+elif job is not None:
+    @st.fragment(run_every=0.5)
+    def solve_progress():
+        job_runner.poll(job)
+        if job.done:
+            st.rerun()
+        status_col, cancel_col = st.columns([4, 1])
+        if cancel_col.button("Cancel solve"):
+            job_runner.cancel(job, owner=session_id)
+            st.rerun()
+        if job.status == "queued":
+            status_col.info(
+                f"Queued for the solver (job {job.id}): position {job_runner.position(job)}, "
+                f"waiting {job.wait:,.1f} s; all {job_runner.max_workers} worker(s) are busy."
+            )
+            return
+        progress = job.progress
+        details = [f"{job.elapsed:,.1f} s"]
+        if progress.get("incumbent") is not None:
+            details.append(f"best ${progress['incumbent']:,.0f}")
+        elif progress.get("objective") is not None:
+            details.append(f"master ${progress['objective']:,.0f}")
+        if progress.get("gap") is not None and np.isfinite(progress["gap"]):
+            details.append(f"gap {progress['gap']:.2%}")
+        if progress.get("nodes") is not None:
+            details.append(f"{progress['nodes']:,} nodes")
+        if progress.get("round") is not None:
+            details.append(f"round {progress['round']}")
+        if len(job.owners) > 1:
+            details.append(f"shared with {len(job.owners) - 1} other session(s)")
+        status_col.info(f"Solving {job.model.n_lanes:,} lanes with {job.solver} (job {job.id}): " + " · ".join(details))
+
+    solve_progress()
+
+if st.session_state.get("last_plan") is not None:
+    show_results(st.session_state.last_plan)
+
+
+def table_model():
+    """(model of the edited tables, problems); the model is None when the tables can't be modelled."""
+    supply = supply_df.set_index("Region")["Supply (tons)"]
+    demand = demand_df.set_index("RDC")["Demand (tons)"]
+    problems = input_problems(supply, demand, costs)
+    return (None if problems else build_transport_model(supply, demand, costs)), problems
+
+
+# ------------------------------
+# What-if Sweep
+# ------------------------------
+st.subheader("What-if Scenario Sweep")
+with st.expander("Sweep a region's supply against an across-the-board cost change"):
+    if imported is not None:
+        sweep_regions = imported.model.supply_labels
+    elif data_source == "Edit tables":
+        sweep_regions = list(supply_df["Region"])
     else:
-        map_df['line_width'] = min_width
-    if not map_df.empty:
-        line_layer = pdk.Layer(
-            "LineLayer",
-            data=map_df,
-            get_source_position='[start_lon, start_lat]',
-            get_target_position='[end_lon, end_lat]',
-            get_width='line_width',
-            get_color='[0, 100, 255]',
-            pickable=True,
-            auto_highlight=True
+        sweep_regions = []
+    sweep_region = st.selectbox("Supply region", sweep_regions)
+    supply_range = st.slider("Supply change (%)", -90, 50, (-50, -10), step=5)
+    cost_range = st.slider("Cost change, all lanes (%)", -50, 100, (5, 30), step=5)
+    sweep_steps = st.slider("Steps per axis", 2, 25, 10)
+
+    sweep_model = None
+    if st.button("Run Sweep", disabled=not sweep_regions):
+        sweep_model, problems = (imported.model, []) if imported is not None else table_model()
+        for problem in problems:
+            st.error(problem)
+    if sweep_model is not None:
+        import altair as alt
+
+        axes = [
+            SweepAxis("Supply change (%)", "supply", np.linspace(*supply_range, sweep_steps), labels=[sweep_region]),
+            SweepAxis("Cost change (%)", "cost", np.linspace(*cost_range, sweep_steps)),
+        ]
+        total = sweep_steps ** 2
+        progress = st.progress(0.0, text=f"Solving {total} scenarios...")
+        heatmap_slot = st.empty()
+        sweep_rows = []
+        sweep_solver = "cbc" if sweep_model.has_min_loads else solver_engines[solver_choice]
+        for row in run_sweep(sweep_model, axes, sweep_solver):
+            sweep_rows.append(row)
+            done = len(sweep_rows)
+            if done % max(1, total // 20) == 0 or done == total:
+                progress.progress(done / total, text=f"Solved {done} of {total} scenarios")
+                sweep_df = pd.DataFrame(sweep_rows).round({"Supply change (%)": 1, "Cost change (%)": 1})
+                heatmap_slot.altair_chart(alt.Chart(sweep_df).mark_rect().encode(
+                    x=alt.X("Cost change (%):O"),
+                    y=alt.Y("Supply change (%):O", sort="descending"),
+                    color=alt.Color("Objective:Q", title="Weekly cost (USD)"),
+                    tooltip=["Supply change (%)", "Cost change (%)", "Status", alt.Tooltip("Objective:Q", format=",.0f")],
+                ), use_container_width=True)
+
+        st.dataframe(
+            sweep_df.pivot(index="Supply change (%)", columns="Cost change (%)", values="Objective")
+            .sort_index(ascending=False).style.format("${:,.0f}", na_rep="infeasible")
         )
-        scatter_layer = pdk.Layer(
-            "ScatterplotLayer",
-            data=map_df,
-            get_position='[start_lon, start_lat]',
-            get_radius=20000,
-            get_color='[0, 100, 255]',
-            pickable=True,
-            get_fill_color='[0, 100, 255]'
+        infeasible = int((sweep_df["Status"] != "Optimal").sum())
+        if infeasible:
+            st.warning(f"{infeasible} scenario(s) were not optimal (e.g. supply below demand).")
+
+# ------------------------------
+# Season Plan
+# ------------------------------
+st.subheader("Season Plan")
+with st.expander("Plan the season week by week, carrying stock at the RDCs"):
+    season_cols = st.columns(3)
+    season_weeks = season_cols[0].slider("Weeks", 2, 52, 52)
+    harvest_swing = season_cols[1].slider("Harvest swing (±%)", 0, 80, 10, step=5)
+    harvest_peak = season_cols[2].slider("Harvest peak (week)", 0, 51, 12)
+    holding_cost = season_cols[0].number_input("Holding cost (USD per ton-week)", min_value=0.0, value=2.0, step=0.5)
+    storage_cover = season_cols[1].number_input(
+        "RDC storage (weeks of demand, 0 = none)", min_value=0.0, value=2.0, step=0.5,
+    )
+    rolling_window = season_cols[2].number_input(
+        "Rolling window (weeks, 0 = whole season)", min_value=0, max_value=52, value=0,
+    )
+
+    season_base, season_problems = (imported.model, []) if imported is not None else (
+        table_model() if data_source == "Edit tables" else (None, [])
+    )
+    for problem in season_problems:
+        st.info(problem)
+
+    def season_model():
+        return MultiPeriodModel(
+            season_base,
+            seasonal_profile(season_base.supply, season_weeks, harvest_swing / 100, harvest_peak),
+            np.tile(season_base.demand, (season_weeks, 1)),
+            holding_cost=holding_cost, storage=season_base.demand * storage_cover,
         )
-        tooltip_text = {"html": "<b>{tooltip}</b>", "style": {"backgroundColor": "steelblue", "color": "white"}}
-        view_state = pdk.ViewState(latitude=37, longitude=-95, zoom=3.5, pitch=0)
-        st.pydeck_chart(pdk.Deck(layers=[line_layer, scatter_layer], initial_view_state=view_state, tooltip=tooltip_text))
 
-    st.subheader("Model Status and Shadow Prices")
-    st.write(f"Model Status: **{LpStatus[model.status]}**")
+    if season_base is not None and season_base.has_min_loads:
+        st.info("Minimum lane loads are not supported in season plans.")
+    elif st.button("Plan Season", disabled=season_base is None):
+        with st.spinner(f"Solving {season_weeks} weeks..."):
+            if rolling_window:
+                st.session_state.season_plan = solve_rolling(season_model(), int(rolling_window), 1)
+            else:
+                st.session_state.season_plan = solve_multiperiod(season_model())
+
+    plan = st.session_state.get("season_plan")
+    if plan is not None:
+        replan_cols = st.columns([1, 2])
+        replan_week = replan_cols[0].number_input(
+            "Re-plan from week", min_value=1, max_value=max(1, plan.model.n_periods - 1), value=1,
+        )
+        if replan_cols[1].button("Re-plan remaining weeks with current inputs", disabled=season_base is None):
+            updated = season_model()
+            if updated.n_periods != plan.model.n_periods or updated.n_lanes != plan.model.n_lanes:
+                st.warning("Weeks or lanes changed since the plan was made; run Plan Season instead.")
+            else:
+                with st.spinner(f"Re-solving weeks {replan_week}-{updated.n_periods - 1}..."):
+                    plan = st.session_state.season_plan = replan(plan, int(replan_week), updated)
 
-    shadow_prices = {}
-    for name, c in model.constraints.items():
-        if abs(c.pi) > 0.0001:
-            shadow_prices[name] = round(c.pi, 2)
+        if plan.status != "Optimal":
+            hint = " A longer rolling window can build stock earlier." if plan.stats.get("window") else ""
+            st.error(f"Season plan is {plan.status.lower()} (e.g. a lean week without enough stock to cover it).{hint}")
+        else:
+            total_col, transport_col, holding_col, time_col = st.columns(4)
+            total_col.metric("Season cost", f"${plan.objective:,.0f}")
+            transport_col.metric("Transport", f"${plan.transport_cost:,.0f}")
+            holding_col.metric("Holding", f"${plan.holding_cost:,.0f}")
+            time_col.metric("Solve time", f"{plan.stats.get('elapsed', 0):.2f} s")
+            season_summary = plan.summary()
+            st.line_chart(season_summary, x="Week", y=["Shipped (tons)", "Demand (tons)", "Inventory (tons)"])
+            st.dataframe(season_summary.style.format(precision=0, thousands=","), hide_index=True)
+            plan_week = st.slider("Show week", 0, plan.model.n_periods - 1, 0)
+            st.dataframe(plan.week(plan_week).flow_table.drop(columns=["from_idx", "to_idx"]), hide_index=True)
 
-    if shadow_prices:
-        st.write("**Binding Constraints & Shadow Prices:**")
-        st.json(shadow_prices)
-    else:
-        st.write("No strongly binding constraints detected.")
+# ------------------------------
+# Facility Location
+# ------------------------------
+st.subheader("Facility Location")
+with st.expander("Choose which RDCs to open, with fixed costs and capacities"):
+    st.caption(
+        "Each RDC's demand becomes a market around it. Open RDCs receive fruit over the current lanes and deliver "
+        "to any market at the delivery rate; closed RDCs' markets are served from the nearest open ones."
+    )
+    site_base, site_problems = (imported.model, []) if imported is not None else (
+        table_model() if data_source == "Edit tables" else (None, [])
+    )
+    for problem in site_problems:
+        st.info(problem)
+    if site_base is not None and site_base.has_min_loads:
+        st.info("Minimum lane loads are not supported in facility location.")
+        site_base = None
+    if site_base is not None:
+        site_df = st.data_editor(
+            pd.DataFrame({
+                "RDC": site_base.demand_labels,
+                "Status": "Candidate",
+                "Fixed cost (USD per week)": 15_000.0,
+                "Capacity (tons)": (site_base.demand * 1.5).round(),
+            }),
+            column_config={"Status": st.column_config.SelectboxColumn(options=["Candidate", "Open", "Closed"], required=True)},
+            disabled=["RDC"], hide_index=True, use_container_width=True,
+        )
+        site_cols = st.columns(3)
+        delivery_rate = site_cols[0].number_input("Delivery USD per ton-mile", min_value=0.0, value=0.45, step=0.05)
+        site_time_limit = site_cols[1].number_input("Time limit (s)", min_value=1, max_value=600, value=30)
+        site_gap = site_cols[2].number_input("Stop within gap (%)", min_value=0.0, max_value=20.0, value=0.5, step=0.1)
+
+        if st.button("Choose RDCs"):
+            if imported is not None and imported.demand_coords is not None:
+                site_coords = imported.demand_coords
+            else:
+                site_coords = reference.coordinates(site_base.demand_labels)
+            delivery = RateModel(delivery_rate).cost(haversine_miles(site_coords, site_coords))
+            delivery[np.isnan(delivery)] = np.inf  # unknown locations only serve their own market
+            np.fill_diagonal(delivery, 0.0)
+            status = site_df["Status"].map({"Candidate": np.nan, "Open": 1.0, "Closed": 0.0}).to_numpy()
+            try:
+                facility_model = FacilityModel(
+                    site_base, site_base.demand_labels, site_base.demand, delivery,
+                    site_df["Fixed cost (USD per week)"].to_numpy(dtype=float),
+                    site_df["Capacity (tons)"].fillna(np.inf).to_numpy(dtype=float), status,
+                )
+            except ValueError as exc:
+                st.error(str(exc))
+            else:
+                with st.spinner(f"Choosing among {int(np.isnan(status).sum())} candidate RDC(s)..."):
+                    st.session_state.facility_plan = solve_facility(
+                        facility_model, time_limit=int(site_time_limit), gap=site_gap / 100,
+                    )
+
+    facility_plan = st.session_state.get("facility_plan")
+    if facility_plan is not None:
+        if facility_plan.objective is None:
+            st.error(f"No plan found ({facility_plan.status.lower()}): open capacity or supply may not cover demand.")
+        else:
+            total_col, fixed_col, transport_col, gap_col = st.columns(4)
+            total_col.metric("Weekly cost", f"${facility_plan.objective:,.0f}")
+            fixed_col.metric("RDC fixed costs", f"${facility_plan.fixed_cost:,.0f}")
+            transport_col.metric("Inbound + delivery", f"${facility_plan.inbound_cost + facility_plan.outbound_cost:,.0f}")
+            gap_col.metric("MIP gap", "–" if facility_plan.gap is None else f"{facility_plan.gap:.2%}")
+            stats = facility_plan.stats
+            if facility_plan.status == "Optimal":
+                proof = "proven optimal"
+            elif facility_plan.bound is not None:
+                proof = f"no plan can cost less than ${facility_plan.bound:,.0f}"
+            else:
+                proof = "no bound available"
+            st.caption(
+                f"{facility_plan.status} after {stats['solver_seconds']:.2f} s ({stats['stopped'] or 'CBC'}); {proof}. "
+                f"{int(facility_plan.open.sum())} of {facility_plan.model.n_sites} RDCs open; "
+                f"{stats['binaries']} open/close decision(s), {stats['variables']:,} variables."
+            )
+            st.dataframe(
+                facility_plan.site_table().style.format({
+                    "Throughput (tons)": "{:,.0f}", "Capacity (tons)": "{:,.0f}", "Utilization": "{:.0%}",
+                    "Fixed cost": "${:,.0f}",
+                }, na_rep="–"),
+                hide_index=True, use_container_width=True,
+            )
+            st.dataframe(facility_plan.assignments(), hide_index=True, use_container_width=True)
+
+# ------------------------------
+# Multi-echelon Network
+# ------------------------------
+st.subheader("Multi-echelon Network")
+with st.expander("Route fruit through packing houses and cross-docks"):
+    st.caption(
+        "CSV, Parquet or Arrow. Nodes: Node, Kind, Supply (tons), Demand (tons), optional Throughput (tons), "
+        "Handling (USD per ton), Latitude / Longitude. Arcs: From, To, Cost (USD per ton), optional Capacity (tons). "
+        "Without files, a sample network through three packing houses and a cross-dock is used."
+    )
+    network_cols = st.columns(2)
+    network_uploads = [
+        col.file_uploader(label, type=upload_types)
+        for col, label in zip(network_cols, ["Nodes file", "Arcs file"])
+    ]
+
+    if st.button("Solve Network"):
+        try:
+            if all(network_uploads):
+                network_files = network_uploads
+            else:
+                network_files = [os.path.join(DATA_DIR, f"network_{stem}.csv") for stem in ("nodes", "arcs")]
+            network_model = TransshipmentModel.from_files(*network_files)
+        except (OSError, ValueError) as exc:  # includes pyarrow parse errors
+            st.error(str(exc))
+        else:
+            network_solver = "cbc" if solver_engines[solver_choice] == "cbc" else "network_simplex"
+            with st.spinner(f"Solving {network_model.n_arcs:,} arcs..."):
+                st.session_state.network_plan = solve_transshipment(network_model, network_solver)
+
+    network_plan = st.session_state.get("network_plan")
+    if network_plan is not None:
+        if network_plan.status != "Optimal":
+            st.error(f"Network plan is {network_plan.status.lower()} (e.g. throughput or arc capacity below demand).")
+        else:
+            network = network_plan.model
+            total_col, transport_col, handling_col, time_col = st.columns(4)
+            total_col.metric("Weekly cost", f"${network_plan.objective:,.0f}")
+            transport_col.metric("Transport", f"${network_plan.transport_cost:,.0f}")
+            handling_col.metric("Handling", f"${network_plan.handling_cost:,.0f}")
+            time_col.metric("Solve time", f"{network_plan.stats['elapsed']:.2f} s")
+            network_flows = network_plan.flow_table
+            st.caption(
+                f"{network.n_nodes:,} nodes, {network.n_arcs:,} arcs ({len(network_flows):,} used), "
+                f"solved with {network_plan.solver}."
+            )
+            import plotly.graph_objects as go
+
+            st.plotly_chart(go.Figure(data=[network_sankey_data(
+                network_flows, network.labels, network.kinds, top_n=sankey_links,
+            )]), use_container_width=True)
+            if network.coords is not None:
+                network_routes = route_frame(network_flows, network.coords, network.coords)
+                network_routes = network_routes[network_routes[["start_lat", "end_lat"]].notna().all(axis=1)]
+                network_bundled = len(network_routes) > map_aggregate_above
+                if network_bundled:
+                    network_routes = bundle_routes(network_routes, cell_deg=2.0)
+                if not network_routes.empty:
+                    st.pydeck_chart(route_deck(network_routes, arcs=network_bundled))
+            st.dataframe(
+                network_plan.node_table().style.format(precision=1, thousands=",", na_rep="–"),
+                hide_index=True, use_container_width=True,
+            )
+
+with st.expander("Diagnostics"):
+    cache_stats = solution_cache().stats()
+    hits_col, misses_col, size_col = st.columns(3)
+    hits_col.metric("Cache hits", cache_stats["hits"])
+    misses_col.metric("Cache misses", cache_stats["misses"])
+    size_col.metric("Cached plans", f"{cache_stats['entries']} / {cache_stats['maxsize']}")
+    st.caption(f"Hit rate {cache_stats['hit_rate']:.0%}" + (f" · persisted to {cache_stats['path']}" if cache_stats["path"] else ""))
+
+    service_stats = job_runner.stats()
+    running_col, queued_col, wait_col, shared_col = st.columns(4)
+    running_col.metric("Solver workers busy", f"{service_stats['running']} / {service_stats['workers']}")
+    queued_col.metric("Queued solves", service_stats["queued"])
+    wait_col.metric("Queue wait p95", "–" if service_stats["wait_p95"] is None else f"{service_stats['wait_p95']:,.2f} s")
+    shared_col.metric("Shared solves", service_stats["deduplicated"])
+    st.caption(
+        f"{service_stats['submitted']} solve(s) submitted by all sessions; {service_stats['done']} done, "
+        f"{service_stats['failed']} failed, {service_stats['cancelled']} cancelled; "
+        f"peak queue {service_stats['peak_queued']}"
+        + ("" if service_stats["wait_mean"] is None else f", mean wait {service_stats['wait_mean']:,.2f} s")
+    )
+
+    tracer = st.session_state.get("last_trace")
+    if tracer is not None:
+        st.write("**Last run, stage timings**")
+        st.dataframe(pd.DataFrame(tracer.summary()).style.format({"ms": "{:,.1f}"}), hide_index=True)
+        solver_stats = st.session_state.last_solver_stats
+        cols = st.columns(4)
+        for col, key in zip(cols, ("iterations", "nodes", "variables", "constraints")):
+            col.metric(key.capitalize(), "–" if solver_stats.get(key) is None else f"{solver_stats[key]:,}")
+        st.download_button(
+            "Download trace (OTLP JSON)", json.dumps(tracer.to_otel(), indent=2),
+            file_name=f"trace-{tracer.trace_id}.json", mime="application/json",
+        )
+        if trace_file:
+            st.caption(f"Traces are appended to {trace_file}")
@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+from cara_logistics.cache import SolutionCache, scenario_key
+from cara_logistics.model import build_transport_model
+from cara_logistics.solvers import solve
+from cara_logistics.synthetic import random_instance
+
+
+def model_for(seed):
+    return build_transport_model(*random_instance(5, 7, seed=seed))
+
+
+def test_lru_eviction():
+    cache = SolutionCache(maxsize=2)
+    cache.put("a", "plan a")
+    cache.put("b", "plan b")
+    assert cache.get("a") == "plan a"  # a is now the most recent
+    cache.put("c", "plan c")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "plan a" and cache.get("c") == "plan c"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 1, 2)
+    assert stats["hit_rate"] == pytest.approx(0.75)
+
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["hits"] == 0
+
+
+def test_put_replaces_an_entry():
+    cache = SolutionCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+    assert len(cache) == 1 and cache.get("a") == 2
+
+
+def test_disk_round_trip(tmp_path):
+    model = model_for(0)
+    key = scenario_key(model, "network_simplex")
+    solution = solve(model, "network_simplex")
+    SolutionCache(path=str(tmp_path)).put(key, solution)
+    assert os.listdir(tmp_path) == [f"{key}.pkl"]
+
+    # a new process (or server restart) finds the plan on disk and keeps it in memory
+    cache = SolutionCache(maxsize=4, path=str(tmp_path))
+    loaded = cache.get(key)
+    assert loaded is not solution
+    assert loaded.objective == solution.objective and loaded.status == solution.status
+    np.testing.assert_array_equal(loaded.flows, solution.flows)
+    assert len(cache) == 1 and cache.get(key) is loaded
+    assert cache.stats()["hits"] == 2
+
+
+def test_disk_miss_and_corrupt_file(tmp_path):
+    cache = SolutionCache(path=str(tmp_path))
+    assert cache.get("missing") is None
+    (tmp_path / "broken.pkl").write_bytes(b"not a pickle")
+    assert cache.get("broken") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_scenario_key_is_stable():
+    assert scenario_key(model_for(0), "cbc") == scenario_key(model_for(0), "cbc")
+    assert scenario_key(model_for(0), "cbc") != scenario_key(model_for(1), "cbc")
+
+
+@pytest.mark.parametrize("change", ["cost", "capacity", "supply", "demand", "min_load"])
+def test_scenario_key_sees_every_input(change):
+    model = model_for(0)
+    values = {
+        "cost": model.cost + np.eye(1, model.n_lanes).ravel(),
+        "capacity": np.where(np.arange(model.n_lanes) == 0, 10.0, np.inf),
+        "supply": model.supply + 1.0,
+        "demand": model.demand * 0.5,
+        "min_load": np.where(np.arange(model.n_lanes) == 0, 1.0, 0.0),
+    }
+    assert scenario_key(model.with_values(**{change: values[change]}), "cbc") != scenario_key(model, "cbc")
+
+
+def test_scenario_key_sees_labels_solver_and_options():
+    model = model_for(0)
+    key = scenario_key(model, "cbc")
+    assert scenario_key(model, "network_simplex") != key
+    assert scenario_key(model, "cbc", time_limit=10) != key
+    renamed = model.with_values()
+    renamed.demand_labels = ["X"] + list(model.demand_labels[1:])
+    assert scenario_key(renamed, "cbc") != key
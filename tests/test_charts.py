@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cara_logistics.charts import (
+    bundle_routes, network_sankey_data, route_frame, sankey_data, scale_widths,
+)
+from cara_logistics.model import build_transport_model
+from cara_logistics.solvers import solve
+from cara_logistics.synthetic import random_instance
+
+
+def flow_table(rows):
+    """Flow table in the TransportSolution.flow_table layout from (from_idx, to_idx, tons) rows."""
+    origin, destination, tons = (np.asarray(column) for column in zip(*rows))
+    return pd.DataFrame({
+        "From": np.array([f"S{i}" for i in origin], dtype=object),
+        "To": np.array([f"D{j}" for j in destination], dtype=object),
+        "Tons": tons.astype(float),
+        "from_idx": origin,
+        "to_idx": destination,
+    })
+
+
+def solved_flows(seed):
+    return solve(build_transport_model(*random_instance(12, 20, seed=seed)), "network_simplex").flow_table
+
+
+def node_totals(trace):
+    """{label: (outflow, inflow)} of a Sankey trace."""
+    labels = np.asarray(trace["node"]["label"], dtype=object)
+    link = trace["link"]
+    out = np.bincount(link["source"], link["value"], minlength=len(labels))
+    into = np.bincount(link["target"], link["value"], minlength=len(labels))
+    return {label: (o, i) for label, o, i in zip(labels.tolist(), out.tolist(), into.tolist())}
+
+
+def test_sankey_links_follow_the_flow_table():
+    flows = flow_table([(0, 1, 5.0), (2, 0, 7.0), (0, 0, 3.0)])
+    trace = sankey_data(flows)
+    labels = trace["node"]["label"]
+    assert labels == ["S0", "S2", "D0", "D1"]
+    link = trace["link"]
+    shown = sorted(zip((labels[s] for s in link["source"]), (labels[t] for t in link["target"]), link["value"]))
+    assert shown == [("S0", "D0", 3.0), ("S0", "D1", 5.0), ("S2", "D0", 7.0)]
+    assert "S2 → D0" in list(link["label"])
+
+
+@pytest.mark.parametrize("top_n", [1, 5, 20])
+@pytest.mark.parametrize("seed", range(3))
+def test_top_n_keeps_the_totals(seed, top_n):
+    flows = solved_flows(seed)
+    full = node_totals(sankey_data(flows))
+    trace = sankey_data(flows, top_n=top_n)
+    pruned = node_totals(trace)
+    value = trace["link"]["value"]
+    assert value.sum() == pytest.approx(flows["Tons"].sum())
+    assert len(value) <= top_n + len(set(flows["From"])) + 1
+
+    # the heaviest links are drawn as they are
+    labels = np.asarray(trace["node"]["label"], dtype=object)
+    drawn = value[labels[trace["link"]["target"]] != "Other destinations"]
+    heaviest = np.sort(flows["Tons"].to_numpy())[::-1][:top_n]
+    np.testing.assert_allclose(np.sort(drawn)[::-1], heaviest)
+
+    # every origin still drawn keeps its whole outflow; the rest are pooled
+    hidden = 0.0
+    for label in set(flows["From"]):
+        if label in pruned:
+            assert pruned[label][0] == pytest.approx(full[label][0])
+        else:
+            hidden += full[label][0]
+    assert pruned.get("Other origins", (0.0, 0.0))[0] == pytest.approx(hidden)
+    # and the "other" destination receives exactly the pruned volume
+    assert pruned.get("Other destinations", (0.0, 0.0))[1] == pytest.approx(flows["Tons"].sum() - heaviest.sum())
+
+
+def test_top_n_other_buckets():
+    flows = flow_table([(0, 0, 50.0), (0, 1, 5.0), (1, 1, 4.0), (2, 0, 3.0), (1, 0, 2.0), (0, 2, 1.0)])
+    totals = node_totals(sankey_data(flows, top_n=2))
+    assert set(totals) == {"S0", "Other origins", "D0", "D1", "Other destinations"}
+    # S0's pruned lane stays attached to S0; S1 and S2 only ship on pruned lanes, so they are pooled
+    assert totals["S0"][0] == pytest.approx(56.0)
+    assert totals["Other origins"][0] == pytest.approx(9.0)
+    assert totals["Other destinations"][1] == pytest.approx(10.0)
+    assert totals["D0"][1] == pytest.approx(50.0) and totals["D1"][1] == pytest.approx(5.0)
+
+
+def test_no_pruning_below_top_n():
+    flows = solved_flows(0)
+    assert len(sankey_data(flows, top_n=len(flows))["link"]["value"]) == len(flows)
+
+
+def test_groups_merge_parallel_links():
+    flows = flow_table([(0, 0, 5.0), (0, 1, 7.0), (1, 1, 3.0)])
+    trace = sankey_data(flows, destination_groups={"D0": "East", "D1": "East"})
+    assert trace["node"]["label"] == ["S0", "S1", "East"]
+    np.testing.assert_allclose(trace["link"]["value"], [12.0, 3.0])
+
+
+def test_network_sankey_top_n_keeps_each_echelon():
+    labels = ["Farm A", "Farm B", "Farm C", "House", "Store 1", "Store 2"]
+    kinds = ["farm", "farm", "farm", "house", "store", "store"]
+    flows = pd.DataFrame({"Tons": [60.0, 5.0, 4.0, 50.0, 19.0], "from_idx": [0, 1, 2, 3, 3], "to_idx": [3, 3, 3, 4, 5]})
+    trace = network_sankey_data(flows, labels, kinds, top_n=2)
+    totals = node_totals(trace)
+    assert set(totals) == {"Farm A", "Other farm", "House", "Store 1", "Other store"}
+    assert totals["Other farm"][0] == pytest.approx(9.0)
+    assert totals["House"] == pytest.approx((69.0, 69.0))
+    assert totals["Other store"][1] == pytest.approx(19.0)
+
+
+def test_route_frame():
+    flows = flow_table([(1, 0, 12.5), (0, 1, 3.0)])
+    supply = np.array([[30.0, -90.0], [40.0, -100.0]])
+    demand = np.array([[35.0, -80.0], [45.0, -120.0]])
+    routes = route_frame(flows, supply, demand)
+    np.testing.assert_array_equal(routes[["start_lat", "start_lon"]].to_numpy(), supply[[1, 0]])
+    np.testing.assert_array_equal(routes[["end_lat", "end_lon"]].to_numpy(), demand[[0, 1]])
+    assert list(routes["tooltip"]) == ["S1 → D0: 12.5 tons", "S0 → D1: 3.0 tons"]
+
+
+def test_bundle_routes():
+    routes = pd.DataFrame({
+        "start_lat": [30.1, 30.9, 30.5, 44.0],
+        "start_lon": [-90.1, -90.9, -90.5, -100.0],
+        "end_lat": [40.2, 40.4, 36.0, 40.0],
+        "end_lon": [-80.2, -80.4, -80.0, -80.0],
+        "tons": [10.0, 30.0, 5.0, 8.0],
+        "tooltip": ["a", "b", "c", "d"],
+    })
+    bundled = bundle_routes(routes, cell_deg=2.0)
+    assert len(bundled) == 3
+    assert bundled["tons"].sum() == pytest.approx(53.0)
+    pair = bundled[np.isclose(bundled["tons"], 40.0)].iloc[0]
+    # the merged lane sits at the tons-weighted centroid of its two lanes
+    assert pair["start_lat"] == pytest.approx((30.1 * 10 + 30.9 * 30) / 40)
+    assert pair["end_lon"] == pytest.approx((-80.2 * 10 - 80.4 * 30) / 40)
+    assert pair["tooltip"] == "2 lane(s): 40.0 tons"
+
+
+def test_scale_widths():
+    np.testing.assert_allclose(scale_widths([1.0, 3.0, 5.0]), [2.0, 6.0, 10.0])
+    np.testing.assert_allclose(scale_widths([4.0, 4.0]), [2.0, 2.0])
+    assert len(scale_widths([])) == 0
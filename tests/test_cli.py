@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cara_logistics.cli import main
+from cara_logistics.distances import RateModel, haversine_miles
+from cara_logistics.model import build_from_lanes
+from cara_logistics.reference import DATA_DIR
+from cara_logistics.scenarios import COST, DEMAND, RDC, REGION, SCENARIO, SUPPLY, TONS
+from cara_logistics.solvers import solve
+
+SUPPLY_ROWS = [("base", "A", 60.0), ("base", "B", 50.0), ("short", "A", 10.0), ("short", "B", 10.0)]
+DEMAND_ROWS = [("base", "X", 40.0), ("base", "Y", 50.0), ("short", "X", 40.0), ("short", "Y", 50.0)]
+COST_ROWS = [(scenario, region, rdc, cost) for scenario in ("base", "short")
+             for region, rdc, cost in [("A", "X", 4.0), ("A", "Y", 6.0), ("B", "X", 5.0), ("B", "Y", 3.0)]]
+
+
+def write(tmp_path, supply=SUPPLY_ROWS, demand=DEMAND_ROWS, costs=COST_ROWS):
+    paths = {}
+    for name, rows, columns in (
+        ("supply", supply, [SCENARIO, REGION, SUPPLY]),
+        ("demand", demand, [SCENARIO, RDC, DEMAND]),
+        ("costs", costs, [SCENARIO, REGION, RDC, COST]),
+    ):
+        paths[name] = str(tmp_path / f"{name}.csv")
+        pd.DataFrame(rows, columns=columns).to_csv(paths[name], index=False)
+    return paths
+
+
+def batch(paths, out, *extra):
+    return main(["batch", "--supply", paths["supply"], "--demand", paths["demand"], "--costs", paths["costs"],
+                 "--out", str(out), *extra])
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_batch(tmp_path, capsys, workers):
+    paths = write(tmp_path)
+    assert batch(paths, tmp_path / "out", "--workers", workers) == 0
+    assert "Solved 2 scenarios" in capsys.readouterr().out
+
+    objectives = pd.read_csv(tmp_path / "out" / "objectives.csv").set_index(SCENARIO)
+    assert objectives.loc["base", "Status"] == "Optimal"
+    assert objectives.loc["short", "Status"] == "Infeasible"
+    supply = pd.Series([60.0, 50.0], index=["A", "B"])
+    demand = pd.Series([40.0, 50.0], index=["X", "Y"])
+    lanes = pd.DataFrame(COST_ROWS[:4], columns=[SCENARIO, REGION, RDC, COST]).drop(columns=SCENARIO)
+    expected = solve(build_from_lanes(supply, demand, lanes), "network_simplex")
+    assert objectives.loc["base", "Objective"] == pytest.approx(expected.objective)
+
+    shipments = pd.read_csv(tmp_path / "out" / "shipments.csv")
+    base = shipments[shipments[SCENARIO] == "base"]
+    assert base.groupby(RDC)[TONS].sum().to_dict() == pytest.approx({"X": 40.0, "Y": 50.0})
+
+
+def test_batch_parquet_and_cbc(tmp_path):
+    paths = write(tmp_path)
+    assert batch(paths, tmp_path / "out", "--workers", "1", "--format", "parquet", "--solver", "cbc") == 0
+    objectives = pd.read_parquet(tmp_path / "out" / "objectives.parquet").set_index(SCENARIO)
+    assert objectives.loc["base", "Objective"] == pytest.approx(40 * 4 + 50 * 3)
+
+
+def test_batch_reports_bad_scenarios_per_row(tmp_path, capsys):
+    costs = COST_ROWS + [("base", "A", "Z", 1.0)]  # Z has no demand row
+    assert batch(write(tmp_path, costs=costs), tmp_path / "out", "--workers", "1") == 0
+    assert "2 scenario(s) not optimal" in capsys.readouterr().out
+    objectives = pd.read_csv(tmp_path / "out" / "objectives.csv").set_index(SCENARIO)
+    assert objectives.loc["base", "Status"] == "Error"
+    assert objectives.loc["base", "Message"]
+
+
+def test_batch_without_scenarios(tmp_path):
+    with pytest.raises(SystemExit, match="no scenarios"):
+        batch(write(tmp_path, supply=[]), tmp_path / "out", "--workers", "1")
+    assert not (tmp_path / "out").exists()
+
+
+def test_batch_with_bad_tables(tmp_path):
+    paths = write(tmp_path)
+    pd.DataFrame({REGION: ["A"]}).to_csv(paths["supply"], index=False)
+    with pytest.raises(SystemExit, match="error: "):
+        batch(paths, tmp_path / "out")
+    with pytest.raises(SystemExit, match="error: "):
+        batch(dict(paths, demand=str(tmp_path / "missing.csv")), tmp_path / "out")
+
+
+def test_costs(tmp_path, capsys):
+    out = tmp_path / "lanes.csv"
+    assert main(["costs", "--rate", "0.5", "--fixed", "20", "--out", str(out)]) == 0
+    assert "great-circle" in capsys.readouterr().out
+
+    lanes = pd.read_csv(out)
+    locations = pd.read_csv(f"{DATA_DIR}/locations.csv")
+    regions = locations[locations["Kind"] == "region"]
+    rdcs = locations[locations["Kind"] == "rdc"]
+    assert len(lanes) == len(regions) * len(rdcs)
+    miles = haversine_miles(regions[["Latitude", "Longitude"]], rdcs[["Latitude", "Longitude"]])
+    expected = pd.DataFrame(RateModel(0.5, 20.0).cost(miles), index=regions["Name"], columns=rdcs["Name"])
+    table = lanes.set_index([REGION, RDC])[COST].unstack()
+    np.testing.assert_allclose(table.loc[expected.index, expected.columns], expected)
+
+
+def test_costs_max_miles_and_cache(tmp_path, capsys):
+    args = ["costs", "--rate", "0.5", "--max-miles", "1500", "--cache", str(tmp_path / "cache")]
+    assert main(args + ["--out", str(tmp_path / "first.parquet")]) == 0
+    assert "(from cache)" not in capsys.readouterr().out
+    assert main(args + ["--out", str(tmp_path / "second.parquet")]) == 0
+    assert "(from cache)" in capsys.readouterr().out
+
+    first = pd.read_parquet(tmp_path / "first.parquet")
+    pd.testing.assert_frame_equal(first, pd.read_parquet(tmp_path / "second.parquet"))
+    assert 0 < len(first) < 12
+    assert (first[COST] <= 0.5 * 1500).all()
+
+
+def test_costs_with_bad_locations(tmp_path):
+    locations = tmp_path / "locations.csv"
+    pd.DataFrame({"Name": ["A"], "Kind": ["region"]}).to_csv(locations, index=False)
+    with pytest.raises(SystemExit, match="missing column"):
+        main(["costs", "--rate", "0.5", "--locations", str(locations), "--out", str(tmp_path / "lanes.csv")])
+    with pytest.raises(SystemExit, match="non-negative"):
+        main(["costs", "--rate", "-1", "--out", str(tmp_path / "lanes.csv")])
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from cara_logistics.decomposition import solve_decomposition
+from cara_logistics.model import build_transport_model
+from cara_logistics.solvers import solve
+from cara_logistics.synthetic import random_instance
+
+
+def model_for(seed, capacitated=False):
+    model = build_transport_model(*random_instance(40, 30, seed=seed))
+    if capacitated:
+        rng = np.random.default_rng(seed)
+        model = model.with_values(capacity=np.where(rng.random(model.n_lanes) < 0.3, 20.0, np.inf))
+    return model
+
+
+def check(model, solution):
+    full = solve(model, "network_simplex")
+    assert solution.status == full.status
+    if full.status != "Optimal":
+        return
+    assert solution.objective == pytest.approx(full.objective, rel=1e-6)
+    # the Lagrangian bound never passes the master objective, nor the true optimum
+    scale = 1e-9 * max(1.0, full.objective)
+    for entry in solution.stats["history"]:
+        assert entry["bound"] <= entry["objective"] + scale
+        assert entry["bound"] <= full.objective + scale
+    assert solution.stats["bound"] <= solution.objective + scale
+    np.testing.assert_allclose(
+        np.bincount(model.lane_demand, solution.flows, minlength=model.n_demand), model.demand, rtol=1e-9)
+
+
+@pytest.mark.parametrize("capacitated", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_reaches_the_full_optimum(seed, capacitated):
+    model = model_for(seed, capacitated)
+    solution = solve_decomposition(model, workers=1, per_node=1, batch=20, gap=0.0)
+    assert solution.stats["iterations"] > 1  # lanes were priced into the master
+    assert solution.stats["master_lanes"] < model.n_lanes
+    check(model, solution)
+
+
+def test_parallel_pricing_matches_in_process():
+    model = model_for(7)
+    serial = solve_decomposition(model, workers=1, per_node=1, batch=20, gap=0.0)
+    parallel = solve_decomposition(model, workers=2, per_node=1, batch=20, gap=0.0)
+    assert parallel.stats["workers"] == 2
+    check(model, parallel)
+    assert parallel.objective == pytest.approx(serial.objective, rel=1e-9)
+    assert [h["bound"] for h in parallel.stats["history"]] == pytest.approx(
+        [h["bound"] for h in serial.stats["history"]], rel=1e-9)
+
+
+def test_infeasible():
+    model = model_for(0)
+    short = model.with_values(supply=model.supply * 0.5)
+    assert solve_decomposition(short, workers=1, per_node=1).status == "Infeasible"
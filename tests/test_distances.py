@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pytest
+
+from cara_logistics.distances import CostMatrixBuilder, RateModel, haversine_miles, pair_haversine_miles
+from cara_logistics.scenarios import COST, RDC, REGION
+
+
+def points(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(25, 49, n), rng.uniform(-124, -67, n)])
+
+
+def test_rate_model():
+    rates = RateModel(0.5, fixed_per_ton=20.0, minimum_per_ton=60.0, circuity=1.2)
+    np.testing.assert_allclose(rates.cost(np.array([0.0, 50.0, 100.0, np.inf])), [60.0, 60.0, 80.0, np.inf])
+    assert RateModel(**rates.params()).params() == rates.params()
+
+
+@pytest.mark.parametrize("params", [
+    {"per_ton_mile": -1.0},
+    {"per_ton_mile": 1.0, "fixed_per_ton": -1.0},
+    {"per_ton_mile": 1.0, "minimum_per_ton": -1.0},
+    {"per_ton_mile": 1.0, "circuity": 0.0},
+])
+def test_rate_model_rejects_bad_rates(params):
+    with pytest.raises(ValueError):
+        RateModel(**params)
+
+
+def test_haversine():
+    # one degree of latitude is about 69.1 miles
+    assert haversine_miles([[40.0, -100.0]], [[41.0, -100.0]])[0, 0] == pytest.approx(69.09, abs=0.01)
+    origins, destinations = points(30, 0), points(20, 1)
+    matrix = haversine_miles(origins, destinations)
+    assert matrix.shape == (30, 20)
+    i, j = np.meshgrid(np.arange(30), np.arange(20), indexing="ij")
+    np.testing.assert_allclose(pair_haversine_miles(origins[i.ravel()], destinations[j.ravel()]), matrix.ravel())
+    np.testing.assert_allclose(haversine_miles(destinations, origins), matrix.T)
+
+
+def test_haversine_blocks_match_one_pass(monkeypatch):
+    origins, destinations = points(50, 2), points(40, 3)
+    whole = haversine_miles(origins, destinations)
+    monkeypatch.setattr("cara_logistics.distances.BLOCK_CELLS", 100)
+    np.testing.assert_array_equal(haversine_miles(origins, destinations), whole)
+
+
+def test_memory_cache_without_a_cache_dir():
+    origins, destinations = points(10, 0), points(8, 1)
+    builder = CostMatrixBuilder(RateModel(0.4, fixed_per_ton=30.0))
+    first = builder.cost(origins, destinations)
+    assert (builder.hits, builder.misses) == (0, 2)  # the cost and the miles behind it
+    np.testing.assert_array_equal(first, RateModel(0.4, fixed_per_ton=30.0).cost(haversine_miles(origins, destinations)))
+    assert builder.cost(origins, destinations) is first
+    builder.miles(origins, destinations)
+    assert (builder.hits, builder.misses) == (2, 2)
+    builder.cost(origins + 0.01, destinations)
+    assert builder.misses == 4
+
+
+def test_memory_cache_is_bounded():
+    destinations = points(5, 1)
+    builder = CostMatrixBuilder(RateModel(0.4), maxsize=3)
+    for seed in range(4):
+        builder.miles(points(4, seed + 10), destinations)
+    assert builder.stats()["entries"] == 3
+    builder.miles(points(4, 10), destinations)  # the oldest was evicted
+    assert builder.misses == 5
+    builder.miles(points(4, 13), destinations)
+    assert builder.hits == 1
+
+
+def test_disk_cache(tmp_path):
+    origins, destinations = points(10, 0), points(8, 1)
+    rates = RateModel(0.4, fixed_per_ton=30.0)
+    first = CostMatrixBuilder(rates, cache_dir=str(tmp_path)).cost(origins, destinations)
+    assert len(os.listdir(tmp_path)) == 2  # the miles and the cost, no temporary files left behind
+
+    again = CostMatrixBuilder(rates, cache_dir=str(tmp_path))
+    np.testing.assert_array_equal(again.cost(origins, destinations), first)
+    assert (again.hits, again.misses) == (1, 0)
+
+
+def test_rate_change_reuses_the_distances(tmp_path):
+    origins, destinations = points(10, 0), points(8, 1)
+    CostMatrixBuilder(RateModel(0.4), cache_dir=str(tmp_path)).cost(origins, destinations)
+    cheaper = CostMatrixBuilder(RateModel(0.3, fixed_per_ton=10.0), cache_dir=str(tmp_path))
+    cost = cheaper.cost(origins, destinations)
+    assert (cheaper.hits, cheaper.misses) == (1, 1)  # miles from disk, a new cost matrix
+    np.testing.assert_allclose(cost, 10.0 + 0.3 * haversine_miles(origins, destinations))
+
+
+def test_minutes_need_a_road_graph():
+    with pytest.raises(ValueError, match="road graph"):
+        CostMatrixBuilder(RateModel(0.4)).minutes(points(2, 0), points(2, 1))
+
+
+def test_table_and_lanes():
+    origins, destinations = points(4, 0), points(3, 1)
+    builder = CostMatrixBuilder(RateModel(0.4))
+    table = builder.table(["a", "b", "c", "d"], origins, ["x", "y", "z"], destinations)
+    assert list(table.index) == ["a", "b", "c", "d"] and list(table.columns) == ["x", "y", "z"]
+
+    lanes = builder.lanes(["a", "b", "c", "d"], origins, ["x", "y", "z"], destinations)
+    assert list(lanes.columns) == [REGION, RDC, COST] and len(lanes) == 12
+    assert lanes.set_index([REGION, RDC])[COST].unstack().loc[table.index, table.columns].equals(table)
+
+    limit = float(np.median(builder.miles(origins, destinations)))
+    near = builder.lanes(["a", "b", "c", "d"], origins, ["x", "y", "z"], destinations, max_miles=limit)
+    assert len(near) == int((builder.miles(origins, destinations) <= limit).sum())
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from cara_logistics import TransportModel
+from cara_logistics.distances import RateModel, haversine_miles
+from cara_logistics.facility import OPTIMAL_GAP, FacilityModel, solve_facility
+from cara_logistics.synthetic import LAT_RANGE, LON_RANGE
+
+
+def random_facility(seed, n_regions=4, n_sites=6, n_markets=12, status=None):
+    """Regions, candidate sites and markets across the US, priced by distance like bench_facility."""
+    rng = np.random.default_rng(seed)
+
+    def locate(n):
+        return np.column_stack([rng.uniform(*LAT_RANGE, n), rng.uniform(*LON_RANGE, n)])
+
+    regions, sites, markets = locate(n_regions), locate(n_sites), locate(n_markets)
+    demand = rng.uniform(20, 120, n_markets)
+    supply = rng.uniform(0.5, 1.5, n_regions)
+    supply *= 1.2 * demand.sum() / supply.sum()
+    inbound = TransportModel(
+        [f"Region {i}" for i in range(n_regions)], [f"Site {s}" for s in range(n_sites)], supply, np.zeros(n_sites),
+        np.repeat(np.arange(n_regions), n_sites), np.tile(np.arange(n_sites), n_regions),
+        RateModel(0.12, fixed_per_ton=40.0).cost(haversine_miles(regions, sites)).ravel(),
+    )
+    miles = haversine_miles(sites, markets)
+    outbound = RateModel(0.45, fixed_per_ton=10.0).cost(miles)
+    outbound[miles > np.sort(miles, axis=0)[2]] = np.inf  # each market keeps its three nearest sites
+    capacity = rng.uniform(2.0, 6.0, n_sites) * demand.sum() / n_sites
+    fixed = rng.uniform(0.5, 1.5, n_sites) * 2.0 * demand.sum() * 45.0 / np.sqrt(n_sites)
+    return FacilityModel(inbound, [f"Market {m}" for m in range(n_markets)], demand, outbound, fixed, capacity,
+                         status)
+
+
+def check_plan(model, plan):
+    """Markets are served, only from open sites, within their capacity (to CBC's printed precision)."""
+    served = np.bincount(model.out_market, plan.outbound_flows, minlength=model.n_markets)
+    assert (served >= model.market_demand * (1 - 1e-6)).all()
+    assert (plan.throughput <= np.where(plan.open, model.site_capacity, 0.0) * (1 + 1e-6)).all()
+    np.testing.assert_allclose(
+        np.bincount(model.inbound.lane_demand, plan.inbound_flows, minlength=model.n_sites), plan.throughput, rtol=1e-6)
+    total = plan.fixed_cost + plan.inbound_cost + plan.outbound_cost
+    assert plan.objective == pytest.approx(total, rel=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_strong_and_weak_formulations_agree(seed):
+    model = random_facility(seed)
+    strong = solve_facility(model, strong=True)
+    weak = solve_facility(model, strong=False)
+    assert strong.status == weak.status == "Optimal"
+    assert strong.gap <= OPTIMAL_GAP
+    assert strong.objective == pytest.approx(weak.objective, rel=1e-6)
+    check_plan(model, strong)
+    check_plan(model, weak)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_lp_relaxation_bounds_the_mip(seed):
+    model = random_facility(seed)
+    mip = solve_facility(model)
+    strong_lp = solve_facility(model, strong=True, relax=True)
+    weak_lp = solve_facility(model, strong=False, relax=True)
+    assert strong_lp.status == weak_lp.status == "Optimal"
+    assert strong_lp.stats["binaries"] == 0
+    scale = 1e-6 * mip.objective
+    # the strong rows only cut off fractional plans
+    assert weak_lp.objective <= strong_lp.objective + scale
+    assert strong_lp.objective <= mip.objective + scale
+
+
+def test_forced_sites_are_respected():
+    free = solve_facility(random_facility(0))
+    status = np.full(free.model.n_sites, np.nan)
+    closed = int(np.flatnonzero(free.open)[0])
+    opened = int(np.flatnonzero(~free.open)[0])
+    status[closed], status[opened] = 0, 1
+    model = random_facility(0, status=status)
+    plan = solve_facility(model)
+    assert plan.status == "Optimal"
+    assert not plan.open[closed] and plan.open[opened]
+    assert plan.stats["binaries"] == model.n_sites - 2
+    assert plan.objective >= free.objective - 1e-6 * free.objective
+    check_plan(model, plan)
+
+
+def test_all_sites_closed_is_infeasible():
+    model = random_facility(1, status=0)
+    plan = solve_facility(model)
+    assert plan.status == "Infeasible"
+    assert plan.objective is None
+
+
+def test_a_stop_on_the_gap_limit_is_only_feasible():
+    model = random_facility(3, n_regions=6, n_sites=25, n_markets=60)
+    plan = solve_facility(model, strong=False, gap=0.5)
+    assert plan.gap > OPTIMAL_GAP  # CBC reports this stop as optimal
+    assert plan.status == "Feasible"
+    assert plan.bound < plan.objective
+    check_plan(model, plan)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cara_logistics.importer import import_network
+from cara_logistics.scenarios import COST, DEMAND, RDC, REGION, SUPPLY
+
+SUPPLY_TABLE = pd.DataFrame({REGION: ["North", "South"], SUPPLY: [100.0, 80.0]})
+DEMAND_TABLE = pd.DataFrame({RDC: ["Austin", "Boston", "Chicago"], DEMAND: [50.0, 60.0, 40.0]})
+LANES = pd.DataFrame({
+    REGION: ["North", "North", "South", "South"],
+    RDC: ["Austin", "Boston", "Boston", "Chicago"],
+    COST: [10.0, 12.0, 8.0, 9.0],
+})
+
+
+def write(tmp_path, name, table, fmt):
+    path = tmp_path / f"{name}.{fmt}"
+    if fmt == "csv":
+        table.to_csv(path, index=False)
+    elif fmt == "parquet":
+        table.to_parquet(path, index=False)
+    else:
+        table.reset_index(drop=True).to_feather(path)
+    return str(path)
+
+
+def run(tmp_path, fmt, supply=SUPPLY_TABLE, demand=DEMAND_TABLE, lanes=LANES):
+    return import_network(
+        write(tmp_path, "supply", supply, fmt), write(tmp_path, "demand", demand, fmt),
+        write(tmp_path, "lanes", lanes, fmt), batch_rows=2,
+    )
+
+
+@pytest.fixture(params=["csv", "parquet", "arrow"])
+def fmt(request):
+    return request.param
+
+
+def test_imports_every_format(tmp_path, fmt):
+    network, problems = run(tmp_path, fmt)
+    assert problems == []
+    model = network.model
+    assert model.supply_labels == ["North", "South"]
+    assert model.demand_labels == ["Austin", "Boston", "Chicago"]
+    np.testing.assert_array_equal(model.supply, [100, 80])
+    lanes = sorted(zip(model.lane_supply.tolist(), model.lane_demand.tolist(), model.cost.tolist()))
+    assert lanes == [(0, 0, 10.0), (0, 1, 12.0), (1, 1, 8.0), (1, 2, 9.0)]
+    assert network.rows == {"supply": 2, "demand": 3, "lanes": 4}
+
+
+def test_unknown_nodes(tmp_path, fmt):
+    lanes = pd.concat([LANES, pd.DataFrame({REGION: ["West"], RDC: ["Denver"], COST: [5.0]})])
+    network, problems = run(tmp_path, fmt, lanes=lanes)
+    assert network is None
+    assert any("unknown region(s) West" in p for p in problems)
+    assert any("unknown RDC(s) Denver" in p for p in problems)
+
+
+def test_negative_cost(tmp_path, fmt):
+    network, problems = run(tmp_path, fmt, lanes=LANES.assign(**{COST: [10.0, -1.0, 8.0, 9.0]}))
+    assert network is None
+    assert len(problems) == 1 and problems[0].startswith("Lanes: 1 negative cost(s) in rows 1-")
+
+
+def test_duplicate_lanes(tmp_path, fmt):
+    network, problems = run(tmp_path, fmt, lanes=pd.concat([LANES, LANES.iloc[[1]]]))
+    assert network is None
+    assert problems == ["Lanes: 1 duplicate lane(s), e.g. North → Boston"]
+
+
+def test_reports_every_problem_at_once(tmp_path, fmt):
+    supply = SUPPLY_TABLE.assign(**{SUPPLY: [100.0, -5.0]})
+    lanes = pd.concat([
+        LANES.assign(**{COST: [10.0, 12.0, -8.0, 9.0]}),
+        LANES.iloc[[0]],
+        pd.DataFrame({REGION: ["West"], RDC: ["Austin"], COST: [5.0]}),
+    ])
+    network, problems = run(tmp_path, fmt, supply=supply, lanes=lanes)
+    assert network is None
+    assert any(p.startswith("Supply: negative") for p in problems)
+    assert any("negative cost(s)" in p for p in problems)
+    assert any("unknown region(s) West" in p for p in problems)
+    assert any("duplicate lane(s), e.g. North → Austin" in p for p in problems)
+
+
+def test_unreadable_node_file_still_checks_lanes(tmp_path):
+    lanes = pd.concat([LANES, pd.DataFrame({REGION: ["West"], RDC: ["Austin"], COST: [-5.0]})])
+    network, problems = run(tmp_path, "csv", demand=DEMAND_TABLE.rename(columns={DEMAND: "Tons"}), lanes=lanes)
+    assert network is None
+    assert any("missing column(s): Demand (tons)" in p for p in problems)
+    assert any("unknown region(s) West" in p for p in problems)
+    assert any("negative cost(s)" in p for p in problems)
@@ -0,0 +1,101 @@
+import os
+import time
+
+import pytest
+
+from cara_logistics.jobs import JobRunner
+from cara_logistics.model import build_transport_model
+from cara_logistics.synthetic import random_instance
+
+
+def small(seed):
+    return build_transport_model(*random_instance(4, 3, seed=seed))
+
+
+def slow(n=400):
+    # seconds of CBC, which runs as a child of the job process
+    return build_transport_model(*random_instance(n, n, seed=0))
+
+
+def group_members(pgid):
+    """Live (non-zombie) processes in process group `pgid`, from /proc."""
+    members = []
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        state, _, group = stat.rsplit(")", 1)[1].split()[:3]
+        if int(group) == pgid and state != "Z":
+            members.append(int(pid))
+    return members
+
+
+@pytest.fixture
+def runner():
+    runner = JobRunner(max_workers=1)
+    yield runner
+    runner.shutdown()
+
+
+def test_identical_submits_share_one_job(runner):
+    model = small(0)
+    first = runner.submit(model, "network_simplex", owner="a")
+    second = runner.submit(model, "network_simplex", owner="b")
+    assert second is first
+    assert first.owners == {"a", "b"}
+    runner.cancel(first, owner="a")  # "b" still waits, so the solve carries on
+    assert runner.wait(first, timeout=30).status == "done"
+    assert first.result.status == "Optimal"
+    stats = runner.stats()
+    assert (stats["submitted"], stats["deduplicated"], stats["done"]) == (2, 1, 1)
+    # once finished, the same problem is solved afresh
+    assert runner.submit(model, "network_simplex", owner="a") is not first
+
+
+def test_queue_is_round_robin_across_owners(runner):
+    blocker = runner.submit(slow(), "cbc", owner="a")
+    a1, a2 = runner.submit(small(1), owner="a"), runner.submit(small(2), owner="a")
+    b1 = runner.submit(small(3), owner="b")
+    c1 = runner.submit(small(4), owner="c")
+    assert blocker.status == "running"
+    assert [runner.position(job) for job in (a1, b1, c1, a2)] == [1, 2, 3, 4]
+
+    runner.cancel(blocker)
+    for job in (a1, a2, b1, c1):
+        assert runner.wait(job, timeout=30).status == "done"
+    assert a1.started <= b1.started <= c1.started <= a2.started
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg") or not os.path.isdir("/proc"), reason="needs process groups and /proc")
+def test_cancel_leaves_no_child_process(runner):
+    job = runner.submit(slow(600), "cbc", owner="a")
+    pid = runner._running[job.id][0].pid
+    deadline = time.time() + 30
+    while len(group_members(pid)) < 2 and time.time() < deadline:  # job process plus its CBC child
+        time.sleep(0.05)
+        runner.poll(job)
+    assert len(group_members(pid)) >= 2
+
+    runner.cancel(job, owner="a")
+    assert job.status == "cancelled"
+    deadline = time.time() + 0.5  # SIGKILL is immediate; CBC left running would take seconds to finish
+    while group_members(pid) and time.time() < deadline:
+        time.sleep(0.05)
+    assert group_members(pid) == []
+
+
+def test_shutdown_cancels_queued_and_running_jobs():
+    runner = JobRunner(max_workers=1)
+    running = runner.submit(slow(), "cbc", owner="a")
+    queued = runner.submit(small(0), owner="b")
+    pid = runner._running[running.id][0].pid
+    runner.shutdown()
+    assert (running.status, queued.status) == ("cancelled", "cancelled")
+    assert runner.stats()["running"] == runner.stats()["queued"] == 0
+    if os.path.isdir("/proc"):
+        deadline = time.time() + 5
+        while group_members(pid) and time.time() < deadline:
+            time.sleep(0.05)
+        assert group_members(pid) == []
@@ -0,0 +1,160 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import linprog
+
+from cara_logistics.model import build_from_lanes, build_transport_model, input_problems
+from cara_logistics.scenarios import CAPACITY, COST, MIN_LOAD, RDC, REGION
+from cara_logistics.solvers import solve
+from cara_logistics.synthetic import random_instance
+
+SUPPLY = pd.Series([60.0, 50.0], index=["A", "B"])
+DEMAND = pd.Series([40.0, 50.0], index=["X", "Y"])
+
+
+def lane_table(rows, **columns):
+    return pd.DataFrame(rows, columns=[REGION, RDC, COST]).assign(**columns)
+
+
+def random_lanes(seed, density=0.5):
+    """Random (supply, demand, lanes) where every RDC keeps at least one lane."""
+    supply, demand, costs = random_instance(8, 12, seed=seed, slack=1.3)
+    rng = np.random.default_rng(seed)
+    listed = rng.random(costs.shape) < density
+    listed[rng.integers(0, len(supply), len(demand)), np.arange(len(demand))] = True
+    lanes = costs.stack().rename(COST).rename_axis([REGION, RDC]).reset_index()
+    return supply, demand, lanes[listed.ravel()].sample(frac=1.0, random_state=seed)
+
+
+def test_listed_lanes_only():
+    lanes = lane_table([("B", "Y", 3.0), ("A", "X", 4.0), ("A", "Y", 6.0)])
+    model = build_from_lanes(SUPPLY, DEMAND, lanes)
+    assert model.n_lanes == 3
+    assert model.routes == [("A", "X"), ("A", "Y"), ("B", "Y")]  # sorted by region, then RDC
+    np.testing.assert_array_equal(model.cost, [4.0, 6.0, 3.0])
+    assert model.matrix.shape == (4, 3) and model.matrix.nnz == 6
+    assert not model.capacitated and not model.has_min_loads
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sparse_matches_dense_with_unlisted_lanes_priced_out(seed):
+    supply, demand, lanes = random_lanes(seed)
+    sparse = solve(build_from_lanes(supply, demand, lanes), "network_simplex")
+    # a dense model with a prohibitive cost on every unlisted pair has the same optimum
+    costs = lanes.pivot(index=REGION, columns=RDC, values=COST).reindex(index=supply.index, columns=demand.index)
+    dense = solve(build_transport_model(supply, demand, costs.fillna(1e7)), "network_simplex")
+    assert sparse.status == dense.status == "Optimal"
+    assert sparse.objective == pytest.approx(dense.objective, rel=1e-9)
+
+
+def test_capacity_blanks_are_uncapacitated():
+    lanes = lane_table([("A", "X", 4.0), ("B", "Y", 3.0)], **{CAPACITY: [20.0, np.nan]})
+    model = build_from_lanes(SUPPLY, DEMAND, lanes)
+    np.testing.assert_array_equal(model.capacity, [20.0, np.inf])
+    assert model.capacitated
+
+
+@pytest.mark.parametrize("rows, match", [
+    ([("A", "X", 4.0), ("A", "X", 5.0)], "Duplicate lanes"),
+    ([("A", "X", 4.0), ("B", "Y", 3.0), ("A", "X", 4.0)], "Duplicate lanes"),
+    ([("A", "X", 4.0), ("C", "X", 1.0)], "unknown regions or RDCs: C → X"),
+    ([("A", "Z", 4.0)], "unknown regions or RDCs: A → Z"),
+    ([("A", "X", np.nan)], "Missing transportation cost"),
+])
+def test_bad_lane_tables(rows, match):
+    with pytest.raises(ValueError, match=match):
+        build_from_lanes(SUPPLY, DEMAND, lane_table(rows))
+
+
+def test_dense_model_needs_every_cost():
+    costs = pd.DataFrame([[4.0, 6.0], [5.0, np.nan]], index=["A", "B"], columns=["X", "Y"])
+    assert input_problems(SUPPLY, DEMAND, costs) == ["Missing transportation cost for one or more routes"]
+    with pytest.raises(ValueError, match="Missing transportation cost"):
+        build_transport_model(SUPPLY, DEMAND, costs)
+
+
+def min_load_lanes(seed, n_min=4):
+    """Small lane table where `n_min` random lanes carry a minimum load and some a capacity."""
+    supply, demand, lanes = random_lanes(seed, density=0.6)
+    supply, demand = supply.iloc[:3], demand.iloc[:4]
+    lanes = lanes[lanes[REGION].isin(supply.index) & lanes[RDC].isin(demand.index)].reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(len(lanes), min(n_min, len(lanes)), replace=False)
+    min_load = np.zeros(len(lanes))
+    min_load[picked] = np.round(rng.uniform(0.2, 0.8, len(picked)) * demand[lanes[RDC].iloc[picked]].to_numpy())
+    capacity = np.where(rng.random(len(lanes)) < 0.3, np.round(demand.max()), np.nan)
+    return supply, demand, lanes.assign(**{MIN_LOAD: min_load, CAPACITY: capacity})
+
+
+def brute_force(model):
+    """Optimum of a min-load model by solving the LP for every open/closed choice of its min-load lanes."""
+    semi = np.flatnonzero(model.min_load > 0)
+    a_ub = np.vstack([model.matrix[:model.n_supply].toarray(), -model.matrix[model.n_supply:].toarray()])
+    b_ub = np.concatenate([model.supply, -model.demand])
+    best = None
+    for open_ in itertools.product([False, True], repeat=len(semi)):
+        low = np.zeros(model.n_lanes)
+        high = model.capacity.copy()
+        low[semi[list(open_)]] = model.min_load[semi[list(open_)]]
+        high[semi[[not o for o in open_]]] = 0.0
+        if (low > high).any():
+            continue
+        result = linprog(model.cost, A_ub=a_ub, b_ub=b_ub, bounds=list(zip(low, np.where(np.isinf(high), None, high))))
+        if result.status == 0 and (best is None or result.fun < best):
+            best = result.fun
+    return best
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_min_loads_match_brute_force(seed):
+    supply, demand, lanes = min_load_lanes(seed)
+    model = build_from_lanes(supply, demand, lanes)
+    assert model.has_min_loads
+    solution = solve(model, "cbc")
+    best = brute_force(model)
+    if best is None:
+        assert solution.status == "Infeasible"
+        return
+    assert solution.status == "Optimal"
+    assert solution.objective == pytest.approx(best, rel=1e-6)
+
+    flows, scale = solution.flows, 1e-6 * max(1.0, model.demand.sum())
+    semi = model.min_load > 0
+    # every minimum-load lane is either empty or carries at least its minimum
+    assert ((flows[semi] <= scale) | (flows[semi] >= model.min_load[semi] - scale)).all()
+    assert (flows <= model.capacity + scale).all()
+    assert (np.bincount(model.lane_supply, flows, minlength=model.n_supply) <= model.supply + scale).all()
+    assert (np.bincount(model.lane_demand, flows, minlength=model.n_demand) >= model.demand - scale).all()
+    # the minimums only remove plans, so the LP without them is a lower bound
+    relaxed = solve(model.with_values(min_load=np.zeros(model.n_lanes)), "network_simplex")
+    assert relaxed.objective <= solution.objective + scale
+
+
+def test_min_load_above_supply_keeps_the_lane_empty():
+    lanes = lane_table([("A", "X", 1.0), ("A", "Y", 6.0), ("B", "X", 5.0), ("B", "Y", 3.0)],
+                       **{MIN_LOAD: [70.0, 0.0, 0.0, 0.0]})
+    solution = solve(build_from_lanes(SUPPLY, DEMAND, lanes), "cbc")
+    assert solution.status == "Optimal"
+    assert solution.flows[0] == 0.0
+    # X is served from B, whose remaining 10 tons go to Y; A covers the rest of Y
+    assert solution.objective == pytest.approx(40 * 5 + 10 * 3 + 40 * 6)
+
+
+def test_unreachable_minimum_is_infeasible():
+    lanes = lane_table([("A", "X", 1.0), ("B", "Y", 3.0)], **{MIN_LOAD: [70.0, 0.0]})
+    assert solve(build_from_lanes(SUPPLY, DEMAND, lanes), "cbc").status == "Infeasible"
+
+
+def test_min_loads_need_a_mip_solver():
+    lanes = lane_table([("A", "X", 4.0), ("B", "Y", 3.0)], **{MIN_LOAD: [10.0, np.nan]})
+    model = build_from_lanes(SUPPLY, DEMAND, lanes)
+    np.testing.assert_array_equal(model.min_load, [10.0, 0.0])  # blanks mean no minimum
+    with pytest.raises(ValueError, match="MIP"):
+        solve(model, "network_simplex")
+
+
+def test_negative_min_loads_are_rejected():
+    with pytest.raises(ValueError, match="Minimum loads"):
+        build_from_lanes(SUPPLY, DEMAND, lane_table([("A", "X", 4.0)], **{MIN_LOAD: [-1.0]}))
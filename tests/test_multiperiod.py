@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from cara_logistics.model import build_transport_model
+from cara_logistics.multiperiod import MultiPeriodModel, replan, seasonal_profile, solve_multiperiod, solve_rolling
+from cara_logistics.synthetic import random_instance
+
+
+def season_for(seed, n_weeks=8, storage=np.inf):
+    """Random season where every week can be served on its own, so rolling plans stay feasible."""
+    base = build_transport_model(*random_instance(6, 8, seed=seed, slack=1.2))
+    rng = np.random.default_rng(seed)
+    supply = seasonal_profile(base.supply, n_weeks, 0.3) / 0.7
+    cost = base.cost * rng.uniform(0.6, 1.4, (n_weeks, base.n_lanes))
+    return MultiPeriodModel(
+        base, supply, np.tile(base.demand, (n_weeks, 1)), cost,
+        holding_cost=rng.uniform(1, 20, base.n_demand), storage=storage * base.demand,
+    )
+
+
+def check_balance(model, solution):
+    """Shipments plus opening stock cover each week's demand and closing stock; supply is never exceeded."""
+    base = model.base
+    received = np.stack([np.bincount(base.lane_demand, week, minlength=model.n_demand) for week in solution.shipments])
+    shipped = np.stack([np.bincount(base.lane_supply, week, minlength=model.n_supply) for week in solution.shipments])
+    opening = np.vstack([model.initial_inventory, solution.inventory[:-1]])
+    np.testing.assert_allclose(opening + received - solution.inventory, model.demand, atol=1e-6)
+    assert (shipped <= model.supply + 1e-6).all()
+    assert (solution.inventory <= model.storage + 1e-6).all()
+
+
+@pytest.mark.parametrize("storage", [np.inf, 1.0])
+@pytest.mark.parametrize("seed", range(3))
+def test_network_simplex_matches_cbc(seed, storage):
+    model = season_for(seed, storage=storage)
+    ns = solve_multiperiod(model, "network_simplex")
+    cbc = solve_multiperiod(model, "cbc")
+    assert ns.status == cbc.status == "Optimal"
+    assert ns.objective == pytest.approx(cbc.objective, rel=1e-6)
+    check_balance(model, ns)
+
+
+@pytest.mark.parametrize("window, step", [(1, 1), (3, 1), (4, 2)])
+def test_rolling_costs_at_least_the_full_horizon(window, step):
+    model = season_for(0)
+    full = solve_multiperiod(model)
+    rolling = solve_rolling(model, window, step)
+    assert rolling.status == "Optimal"
+    assert rolling.stats["windows"] == -(-model.n_periods // step)
+    check_balance(model, rolling)
+    assert rolling.objective >= full.objective - 1e-6 * full.objective
+
+
+def test_rolling_over_the_whole_season_is_the_full_plan():
+    model = season_for(1)
+    full = solve_multiperiod(model)
+    rolling = solve_rolling(model, model.n_periods, model.n_periods)
+    assert rolling.stats["windows"] == 1
+    assert rolling.objective == pytest.approx(full.objective, rel=1e-9)
+
+
+@pytest.mark.parametrize("from_week", [0, 1, 5])
+def test_replan_with_the_same_inputs_matches_the_full_solve(from_week):
+    model = season_for(2)
+    full = solve_multiperiod(model)
+    again = replan(full, from_week)
+    assert again.status == "Optimal"
+    assert again.stats["replanned_from"] == from_week
+    assert again.objective == pytest.approx(full.objective, rel=1e-9)
+    np.testing.assert_array_equal(again.shipments[:from_week], full.shipments[:from_week])
+    check_balance(model, again)
+
+
+def test_replan_keeps_the_past_weeks_of_an_updated_model():
+    model = season_for(2)
+    full = solve_multiperiod(model)
+    demand = model.demand.copy()
+    demand[4:] *= 0.9
+    updated = MultiPeriodModel(model.base, model.supply, demand, model.cost, model.holding_cost, model.storage)
+    again = replan(full, 4, updated)
+    assert again.status == "Optimal"
+    np.testing.assert_array_equal(again.inventory[:4], full.inventory[:4])
+    check_balance(updated, again)
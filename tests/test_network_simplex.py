@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from cara_logistics import TransportModel
+from cara_logistics.network_simplex import NetworkSimplex
+from cara_logistics.solvers import solve, transport_network
+
+TOL = 1e-6
+
+
+def random_model(seed, capacitated=False, slack=1.2):
+    """Sparse random transportation model; every demand node gets at least one lane."""
+    rng = np.random.default_rng(seed)
+    n_supply, n_demand = rng.integers(2, 8), rng.integers(2, 10)
+    listed = rng.random((n_supply, n_demand)) < 0.6
+    listed[rng.integers(0, n_supply, n_demand), np.arange(n_demand)] = True
+    lane_supply, lane_demand = np.nonzero(listed)
+    demand = rng.integers(10, 100, n_demand).astype(float)
+    supply = rng.uniform(0.5, 1.5, n_supply)
+    supply = np.round(supply * slack * demand.sum() / supply.sum())
+    capacity = None
+    if capacitated:
+        capacity = np.where(rng.random(len(lane_supply)) < 0.5, rng.integers(5, 60, len(lane_supply)), np.inf)
+    return TransportModel(
+        [f"S{i}" for i in range(n_supply)], [f"D{j}" for j in range(n_demand)], supply, demand,
+        lane_supply, lane_demand, rng.integers(1, 50, len(lane_supply)).astype(float), capacity,
+    )
+
+
+def reduced_costs(model, duals):
+    return model.cost - duals[model.lane_supply] - duals[model.n_supply + model.lane_demand]
+
+
+def dual_objective(model, duals):
+    """Objective of the LP dual at `duals`; capacity duals take the negative reduced costs."""
+    rc = reduced_costs(model, duals)
+    capped = np.isfinite(model.capacity)
+    return float(model.rhs @ duals + model.capacity[capped] @ np.minimum(rc[capped], 0.0))
+
+
+def assert_optimal_pair(model, flows, duals):
+    """Complementary slackness between any optimal flows and any optimal duals."""
+    rc = reduced_costs(model, duals)
+    scale = TOL * max(1.0, np.abs(model.cost).max())
+    assert (duals[:model.n_supply] <= scale).all()
+    assert (duals[model.n_supply:] >= -scale).all()
+    assert (rc[flows < model.capacity - TOL] >= -scale).all()
+    assert (rc[flows > TOL] <= scale).all()
+    shipped = np.bincount(model.lane_supply, flows, minlength=model.n_supply)
+    assert (np.abs(duals[:model.n_supply][shipped < model.supply - TOL]) <= scale).all()
+
+
+@pytest.mark.parametrize("capacitated", [False, True])
+@pytest.mark.parametrize("slack", [1.0, 1.3])
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_cbc(seed, slack, capacitated):
+    model = random_model(seed, capacitated, slack)
+    native = solve(model, "network_simplex")
+    cbc = solve(model, "cbc")
+    assert native.status == cbc.status
+    if cbc.status != "Optimal":
+        return
+    assert native.objective == pytest.approx(cbc.objective, rel=TOL)
+    # duals of a degenerate LP aren't unique, so compare their objectives and check
+    # each engine's duals against the other engine's flows
+    assert dual_objective(model, native.duals) == pytest.approx(cbc.objective, rel=TOL)
+    assert dual_objective(model, cbc.duals) == pytest.approx(native.objective, rel=TOL)
+    assert_optimal_pair(model, cbc.flows, native.duals)
+    assert_optimal_pair(model, native.flows, cbc.duals)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_infeasible_matches_cbc(seed):
+    short = random_model(seed, slack=0.8)
+    assert solve(short, "network_simplex").status == solve(short, "cbc").status == "Infeasible"
+
+    # enough supply, but the lanes into one demand node can't carry its demand
+    model = random_model(seed, slack=1.5)
+    into_first = model.lane_demand == 0
+    capacity = np.where(into_first, model.demand[0] / (2 * into_first.sum()), np.inf)
+    blocked = model.with_values(capacity=capacity)
+    assert solve(blocked, "network_simplex").status == solve(blocked, "cbc").status == "Infeasible"
+
+
+def test_warm_updates_match_a_fresh_engine():
+    rng = np.random.default_rng(0)
+    model = random_model(3, capacitated=True, slack=1.3)
+    n, tail, head, cost, capacity, supply = transport_network(model)
+    engine = NetworkSimplex(n, tail, head, cost, capacity, supply)
+    assert engine.solve() == "Optimal"
+    for _ in range(5):
+        cost = cost * rng.uniform(0.5, 3.0, len(cost))  # also beyond the engine's original cost range
+        supply = supply.copy()
+        supply[:model.n_supply] *= rng.uniform(0.9, 1.2, model.n_supply)
+        supply[-1] = -supply[:-1].sum()
+        assert engine.set_costs(np.arange(len(cost)), cost)
+        engine.set_supply(supply)
+        fresh = NetworkSimplex(n, tail, head, cost, capacity, supply)
+        assert engine.solve() == fresh.solve()
+        if fresh.status == "Optimal":
+            assert engine.flows @ cost == pytest.approx(fresh.flows @ cost, rel=TOL)
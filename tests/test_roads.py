@@ -0,0 +1,178 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cara_logistics.distances import CostMatrixBuilder, RateModel, pair_haversine_miles
+from cara_logistics.roads import ACCESS_MPH, DEFAULT_MPH, METERS_PER_MILE, DistanceTables, RoadGraph, load_road_graph
+
+
+def line_graph(directed=False):
+    """a - b - c along a parallel with a second, longer but faster a - b edge, and an isolated d."""
+    coords = [[40.0, -100.0], [40.0, -99.0], [40.0, -98.0], [30.0, -90.0]]
+    return RoadGraph(["a", "b", "c", "d"], coords, [0, 1, 0], [1, 2, 1], [60.0, 55.0, 70.0],
+                     [60.0, 50.0, 40.0], directed=directed)
+
+
+def random_grid(side, seed):
+    """side x side jittered lattice with 4-neighbour roads ~1.1-1.4x straight-line, like bench_cost_matrix."""
+    rng = np.random.default_rng(seed)
+    lat, lon = np.meshgrid(np.linspace(30, 45, side), np.linspace(-120, -75, side), indexing="ij")
+    coords = np.column_stack([lat.ravel(), lon.ravel()]) + rng.normal(0, 0.02, (side * side, 2))
+    ids = np.arange(side * side).reshape(side, side)
+    tail = np.r_[ids[:, :-1].ravel(), ids[:-1, :].ravel()]
+    head = np.r_[ids[:, 1:].ravel(), ids[1:, :].ravel()]
+    miles = pair_haversine_miles(coords[tail], coords[head]) * rng.uniform(1.1, 1.4, len(tail))
+    return RoadGraph(np.arange(side * side), coords, tail, head, miles)
+
+
+def points(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(30, 45, n), rng.uniform(-120, -75, n)])
+
+
+def test_shortest_paths():
+    graph = line_graph()
+    paths = graph.shortest_paths([0, 2, 3], [0, 1, 2, 3])
+    np.testing.assert_array_equal(paths[0], [0.0, 60.0, 115.0, np.inf])  # the shorter parallel edge wins
+    np.testing.assert_array_equal(paths[1], [115.0, 55.0, 0.0, np.inf])
+    np.testing.assert_array_equal(paths[2], [np.inf, np.inf, np.inf, 0.0])
+    np.testing.assert_array_equal(graph.shortest_paths([0], [2], "minutes"), [[90.0]])
+
+
+def test_directed_edges_run_one_way():
+    paths = line_graph(directed=True).shortest_paths([0, 2], [0, 2])
+    np.testing.assert_array_equal(paths, [[0.0, 115.0], [np.inf, 0.0]])
+
+
+def test_unknown_weight():
+    with pytest.raises(ValueError, match="Unknown weight"):
+        line_graph().graph("tolls")
+
+
+def test_fingerprint():
+    graph = line_graph()
+    assert graph.fingerprint() == line_graph().fingerprint()
+    assert graph.fingerprint() != line_graph(directed=True).fingerprint()
+    graph.miles[0] = 1.0  # hashed once; the arrays are read-only after construction
+    assert graph.fingerprint() == line_graph().fingerprint()
+
+
+def test_snap_and_distances():
+    graph = line_graph()
+    origins = np.array([[40.1, -100.0], [40.0, -98.05]])
+    nodes, snap = graph.snap(origins)
+    np.testing.assert_array_equal(nodes, [0, 2])
+    np.testing.assert_allclose(snap, pair_haversine_miles(origins, graph.coords[[0, 2]]))
+
+    destinations = np.array([[40.0, -99.0]])
+    miles = graph.distances(origins, destinations)
+    np.testing.assert_allclose(miles[:, 0], [60.0, 55.0] + snap)
+    minutes = graph.distances(origins, destinations, "minutes")
+    # each weight keeps its own cheapest parallel edge: the longer a - b road is the faster one
+    np.testing.assert_allclose(minutes[:, 0], [40.0, 50.0] + snap * 60.0 / ACCESS_MPH)
+
+
+def test_from_files(tmp_path):
+    pd.DataFrame({"Node": [1, 2, 3], "Latitude": [40.0, 40.0, 40.0], "Longitude": [-100.0, -99.0, -98.0]}).to_csv(
+        tmp_path / "nodes.csv", index=False)
+    pd.DataFrame({"From": [1, 2], "To": [2, 3], "Miles": [60.0, 55.0], "Speed (mph)": [60.0, 55.0],
+                  "Oneway": [True, False]}).to_csv(tmp_path / "edges.csv", index=False)
+    graph = load_road_graph(str(tmp_path))
+    assert graph.directed
+    np.testing.assert_array_equal(graph.shortest_paths([0, 2], [0, 2], "minutes"), [[0.0, 120.0], [np.inf, 0.0]])
+
+
+def test_from_files_rejects_unknown_nodes(tmp_path):
+    pd.DataFrame({"Node": [1, 2], "Latitude": [40.0, 40.0], "Longitude": [-100.0, -99.0]}).to_csv(
+        tmp_path / "nodes.csv", index=False)
+    pd.DataFrame({"From": [1], "To": [9], "Miles": [60.0]}).to_csv(tmp_path / "edges.csv", index=False)
+    with pytest.raises(ValueError, match="unknown nodes"):
+        RoadGraph.from_dir(str(tmp_path))
+
+
+GRAPHML = """<?xml version="1.0" encoding="utf-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+<key id="d0" for="node" attr.name="y"/><key id="d1" for="node" attr.name="x"/>
+<key id="d2" for="edge" attr.name="length"/><key id="d3" for="edge" attr.name="travel_time"/>
+<key id="d4" for="edge" attr.name="speed_kph"/>
+<graph edgedefault="{edgedefault}">
+<node id="n1"><data key="d0">40.0</data><data key="d1">-100.0</data></node>
+<node id="n2"><data key="d0">40.0</data><data key="d1">-99.0</data></node>
+<node id="n3">{n3}</node>
+<edge source="n1" target="n2"><data key="d2">{meters}</data><data key="d3">1800</data></edge>
+<edge source="n2" target="n3"><data key="d2">{meters}</data><data key="d4">80</data></edge>
+<edge source="n3" target="{last}"><data key="d2">{meters}</data></edge>
+</graph>
+</graphml>
+"""
+
+
+def write_graphml(path, edgedefault="directed", n3='<data key="d0">40.0</data><data key="d1">-98.0</data>', last="n1"):
+    path.write_text(GRAPHML.format(edgedefault=edgedefault, n3=n3, last=last, meters=80 * METERS_PER_MILE))
+    return str(path)
+
+
+def test_graphml(tmp_path):
+    graph = load_road_graph(write_graphml(tmp_path / "roads.graphml"))
+    assert graph.directed
+    assert list(graph.node_ids) == ["n1", "n2", "n3"]
+    np.testing.assert_allclose(graph.coords[:, 1], [-100.0, -99.0, -98.0])
+    np.testing.assert_allclose(graph.miles, 80.0)
+    # travel_time seconds, speed_kph, then the default speed
+    np.testing.assert_allclose(graph.minutes, [30.0, 80 * METERS_PER_MILE / 1000 / 80 * 60, 80 * 60 / DEFAULT_MPH])
+    assert graph.shortest_paths([1], [0])[0, 0] == pytest.approx(160.0)
+
+    undirected = RoadGraph.from_graphml(write_graphml(tmp_path / "two_way.graphml", "undirected"))
+    assert not undirected.directed
+    assert undirected.shortest_paths([1], [0])[0, 0] == pytest.approx(80.0)
+
+
+@pytest.mark.parametrize("options, match", [({"n3": ""}, "no x/y"), ({"last": "n9"}, "unknown nodes")])
+def test_graphml_errors(tmp_path, options, match):
+    with pytest.raises(ValueError, match=match):
+        RoadGraph.from_graphml(write_graphml(tmp_path / "bad.graphml", **options))
+
+
+def test_load_road_graph_needs_a_folder_or_graphml(tmp_path):
+    with pytest.raises(ValueError, match="neither"):
+        load_road_graph(str(tmp_path / "roads.osm"))
+
+
+@pytest.mark.parametrize("weight", ["miles", "minutes"])
+def test_parallel_workers_match_serial(weight):
+    graph = random_grid(12, 0)
+    sources, targets = np.arange(0, graph.n_nodes, 2), np.arange(graph.n_nodes)
+    serial = graph.shortest_paths(sources, targets, weight, workers=1)
+    np.testing.assert_array_equal(graph.shortest_paths(sources, targets, weight, workers=3), serial)
+
+
+def test_distance_tables(tmp_path):
+    graph = random_grid(10, 1)
+    origins, destinations = points(20, 2), points(15, 3)
+    rates = RateModel(0.4)
+    first = CostMatrixBuilder(rates, graph, cache_dir=str(tmp_path), workers=1)
+    cost = first.cost(origins, destinations)
+    assert first.tables.stats()["misses"] == 1
+
+    # nudged points miss the matrix cache but snap to the same nodes, so the stored table is reused
+    again = CostMatrixBuilder(rates, graph, cache_dir=str(tmp_path), workers=1)
+    nudged = again.cost(origins + 1e-6, destinations)
+    tables = again.tables.stats()
+    assert (tables["hits"], tables["misses"], tables["tables"]) == (1, 0, 1)
+    np.testing.assert_allclose(nudged, cost, atol=1e-3)
+    assert not [f for f in os.listdir(tmp_path / "roads") if not f.endswith(".npy")]
+
+    expected = graph.distances(origins, destinations)
+    np.testing.assert_allclose(cost, rates.cost(expected))
+
+
+def test_distance_table_is_keyed_on_weight(tmp_path):
+    graph = random_grid(6, 4)
+    tables = DistanceTables(str(tmp_path))
+    miles = tables.table(graph, [0, 1], [2, 3])
+    minutes = tables.table(graph, [0, 1], [2, 3], "minutes")
+    np.testing.assert_allclose(minutes, miles * 60.0 / DEFAULT_MPH)
+    tables.table(graph, [0, 1], [2, 3])
+    assert (tables.hits, tables.misses, tables.stats()["tables"]) == (1, 2, 2)
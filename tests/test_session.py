@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from cara_logistics.model import build_transport_model
+from cara_logistics.session import SolverSession
+from cara_logistics.solvers import solve
+from cara_logistics.synthetic import random_instance
+
+WARM_MODE = {"network_simplex": "warm", "cbc": "updated"}
+
+
+def edits(model, rng):
+    """A run of single-cell and whole-table edits, as a user would make them."""
+    cost = model.cost.copy()
+    cost[rng.integers(model.n_lanes)] *= 3.0
+    yield "one cost", model.with_values(cost=cost)
+    cost = cost * 1.25
+    yield "all costs", model.with_values(cost=cost)
+    supply = model.supply.copy()
+    supply[rng.integers(model.n_supply)] *= 0.5
+    yield "one supply", model.with_values(supply=supply, cost=cost)
+    demand = model.demand.copy()
+    demand[rng.integers(model.n_demand)] *= 1.5
+    yield "one demand", model.with_values(supply=supply, demand=demand, cost=cost)
+    yield "short supply", model.with_values(supply=supply * 0.5, demand=demand, cost=cost)
+    yield "everything", model.with_values(
+        supply=model.supply * rng.uniform(0.9, 1.1, model.n_supply),
+        demand=model.demand * rng.uniform(0.9, 1.1, model.n_demand),
+        cost=model.cost * rng.uniform(0.5, 2.0, model.n_lanes),
+    )
+
+
+@pytest.mark.parametrize("solver", ["network_simplex", "cbc"])
+@pytest.mark.parametrize("seed", range(3))
+def test_edits_match_cold_solves(solver, seed):
+    model = build_transport_model(*random_instance(12, 9, seed=seed))
+    session = SolverSession()
+    assert session.solve(model, solver).stats["mode"] == "cold"
+    for name, edited in edits(model, np.random.default_rng(seed)):
+        solution = session.solve(edited, solver)
+        expected = solve(edited, solver)
+        assert solution.stats["mode"] == WARM_MODE[solver], name
+        assert solution.status == expected.status, name
+        if expected.status == "Optimal":
+            assert solution.objective == pytest.approx(expected.objective, rel=1e-6), name
+            np.testing.assert_allclose(solution.flows.sum(), edited.demand.sum(), rtol=1e-6)
+
+
+def test_structure_or_solver_change_starts_cold():
+    model = build_transport_model(*random_instance(6, 5, seed=0))
+    session = SolverSession()
+    session.solve(model)
+    assert session.solve(model, "cbc").stats["mode"] == "cold"
+    capped = model.with_values(capacity=np.full(model.n_lanes, 1e6))
+    assert session.solve(capped, "cbc").stats["mode"] == "cold"
+    assert session.solve(capped, "cbc").stats["changed_costs"] == 0
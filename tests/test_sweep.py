@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from cara_logistics.model import build_transport_model
+from cara_logistics.solvers import solve
+from cara_logistics.sweep import SweepAxis, _init_worker, _worker, run_sweep, sweep_points
+from cara_logistics.synthetic import random_instance
+
+
+@pytest.fixture
+def model():
+    return build_transport_model(*random_instance(30, 20, seed=1))
+
+
+@pytest.mark.parametrize("changes", [[5, 10, 20, 30], [-30, -20, -10], [-20, -10, 0, 10, 20]])
+def test_cost_sweep_warm_starts(model, changes):
+    axes = [SweepAxis("Diesel", "cost", changes)]
+    _init_worker(model, axes, "network_simplex")
+    session = _worker["session"]
+    modes = []
+    for (change,) in sweep_points(axes):
+        solution = session.solve(model.with_values(cost=model.cost * (1 + change / 100)))
+        modes.append(solution.stats["mode"])
+    assert modes == ["cold"] + ["warm"] * (len(changes) - 1)
+
+
+def test_sweep_matches_independent_solves(model):
+    axes = [SweepAxis("Supply", "supply", [-5, 0, 10]), SweepAxis("Diesel", "cost", [0, 15, 30])]
+    rows = list(run_sweep(model, axes, workers=1, chunksize=9))
+    assert len(rows) == 9
+    for row in rows:
+        expected = solve(model.with_values(
+            supply=model.supply * (1 + row["Supply"] / 100), cost=model.cost * (1 + row["Diesel"] / 100),
+        ))
+        assert row["Status"] == expected.status
+        if expected.status == "Optimal":
+            assert row["Objective"] == pytest.approx(expected.objective, rel=1e-9)
+        else:
+            assert np.isnan(row["Objective"])
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cara_logistics.reference import DATA_DIR
+from cara_logistics.transshipment import TransshipmentModel, solve_transshipment
+
+ECHELONS = ("grove", "packing house", "cross-dock", "rdc")
+
+
+def random_network(seed, throughput_slack=1.5):
+    """Four echelons, each node linked to a few nodes of the next (and some packing houses straight to RDCs).
+
+    Packing houses have throughput limits and handling costs, cross-docks
+    handling costs only; amounts are non-integer so prices are unique.
+    """
+    rng = np.random.default_rng(seed)
+    counts = [rng.integers(3, 7), rng.integers(2, 5), rng.integers(1, 3), rng.integers(3, 8)]
+    offsets = np.cumsum([0, *counts])
+    tails, heads = [], []
+    for a, b in ((0, 1), (1, 2), (2, 3), (1, 3)):
+        linked = rng.random((counts[a], counts[b])) < 0.6
+        linked[np.arange(counts[a]), rng.integers(0, counts[b], counts[a])] = True
+        linked[rng.integers(0, counts[a], counts[b]), np.arange(counts[b])] = True
+        rows, cols = np.nonzero(linked)
+        tails.append(offsets[a] + rows)
+        heads.append(offsets[b] + cols)
+    tail, head = np.concatenate(tails), np.concatenate(heads)
+    n = offsets[-1]
+    demand = np.zeros(n)
+    demand[offsets[3]:] = rng.uniform(20, 80, counts[3])
+    supply = np.zeros(n)
+    supply[:offsets[1]] = rng.uniform(0.5, 1.5, counts[0])
+    supply[:offsets[1]] *= 1.3 * demand.sum() / supply[:offsets[1]].sum()
+    throughput = np.full(n, np.inf)
+    throughput[offsets[1]:offsets[2]] = throughput_slack * demand.sum() / counts[1] * rng.uniform(0.7, 1.3, counts[1])
+    handling = np.zeros(n)
+    handling[offsets[1]:offsets[3]] = rng.uniform(2, 15, counts[1] + counts[2])
+    capacity = np.where(rng.random(len(tail)) < 0.2, rng.uniform(20, 60, len(tail)), np.inf)
+    return TransshipmentModel(
+        [f"{kind} {i}" for kind, k in zip(ECHELONS, counts) for i in range(k)],
+        supply, demand, tail, head, rng.uniform(5, 50, len(tail)), capacity, throughput, handling,
+        [kind for kind, k in zip(ECHELONS, counts) for _ in range(k)],
+    )
+
+
+def check_flows(model, solution):
+    """Conservation on the split graph, bounds, and pass-through flow equal to each split node's outflow."""
+    tol = 1e-6 * model.demand.sum()
+    arc = solution.arc_flows
+    passed = solution.flows[model.n_arcs:]
+    assert (arc >= -tol).all() and (arc <= model.capacity + tol).all()
+    outflow = np.bincount(model.tail, arc, minlength=model.n_nodes)
+    inflow = np.bincount(model.head, arc, minlength=model.n_nodes)
+    np.testing.assert_allclose(passed, outflow[model.split], atol=tol)
+    assert (passed <= model.throughput[model.split] + tol).all()
+    net = model.supply - model.demand - outflow + inflow  # unused supply stays put
+    assert (net >= -tol).all()
+    assert (net[model.supply == 0] <= tol).all()
+    assert solution.handling_cost == pytest.approx(float(outflow @ model.handling), rel=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_engines_agree(seed):
+    model = random_network(seed)
+    assert len(model.split)  # throughput and handling nodes are split
+    native = solve_transshipment(model, "network_simplex")
+    cbc = solve_transshipment(model, "cbc")
+    assert native.status == cbc.status
+    if cbc.status != "Optimal":
+        return
+    for solution in (native, cbc):
+        check_flows(model, solution)
+    assert native.objective == pytest.approx(cbc.objective, rel=1e-6)
+    rdc = model.demand > 0
+    np.testing.assert_allclose(native.prices[rdc], cbc.prices[rdc], rtol=1e-6, atol=1e-6)
+
+
+def test_throughput_limit_binds():
+    model = random_network(0)
+    free = solve_transshipment(model)
+    # halve the limit of the busiest split node
+    busiest = free.flows[model.n_arcs:].argmax()
+    node = model.split[busiest]
+    model.throughput[node] = 0.5 * free.flows[model.n_arcs + busiest]
+    for solver in ("network_simplex", "cbc"):
+        solution = solve_transshipment(model, solver)
+        assert solution.status == "Optimal"
+        check_flows(model, solution)
+        assert solution.flows[model.n_arcs + busiest] <= model.throughput[node] + 1e-6
+        assert solution.objective > free.objective
+
+
+@pytest.mark.parametrize("solver", ["network_simplex", "cbc"])
+def test_infeasible_when_throughput_is_short(solver):
+    assert solve_transshipment(random_network(1, throughput_slack=0.3), solver).status == "Infeasible"
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "arrow"])
+def test_from_files_matches_from_tables(tmp_path, fmt):
+    nodes = pd.read_csv(f"{DATA_DIR}/network_nodes.csv")
+    arcs = pd.read_csv(f"{DATA_DIR}/network_arcs.csv")
+    paths = []
+    for name, table in (("nodes", nodes), ("arcs", arcs)):
+        path = tmp_path / f"{name}.{fmt}"
+        if fmt == "csv":
+            table.to_csv(path, index=False)
+        elif fmt == "parquet":
+            table.to_parquet(path, index=False)
+        else:
+            table.to_feather(path)
+        paths.append(str(path))
+    loaded = TransshipmentModel.from_files(*paths, batch_rows=4)
+    expected = TransshipmentModel.from_tables(nodes, arcs)
+    assert loaded.labels == expected.labels and loaded.kinds == expected.kinds
+    for name in ("supply", "demand", "tail", "head", "cost", "capacity", "throughput", "handling"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(expected, name), err_msg=name)
+    assert solve_transshipment(loaded).objective == pytest.approx(solve_transshipment(expected).objective)
+
+
+def test_from_files_rejects_unknown_nodes(tmp_path):
+    nodes = tmp_path / "nodes.csv"
+    arcs = tmp_path / "arcs.csv"
+    pd.DataFrame({"Node": ["A", "B"], "Supply (tons)": [10, None], "Demand (tons)": [None, 5]}).to_csv(nodes, index=False)
+    pd.DataFrame({"From": ["A", "C"], "To": ["B", "B"], "Cost (USD per ton)": [1.0, 2.0]}).to_csv(arcs, index=False)
+    with pytest.raises(ValueError, match="unknown node"):
+        TransshipmentModel.from_files(str(nodes), str(arcs))